@@ -13,6 +13,9 @@ class AppConfig(BaseSettings):
     GRAPH: str
     PRETRAINED_MODEL: str
     DECODING_ALGO: str
+    BATCH_SIZE: int = 16
+    RESULT_STORE_PATH: Optional[str] = None
+    RESULT_CACHE_SIZE: int = 10000
 
     CUDA_VISIBLE_DEVICES: Union[int, str]
 
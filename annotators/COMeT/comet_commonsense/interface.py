@@ -1,10 +1,13 @@
 import re
-from typing import Dict, Sequence, Optional
+from copy import deepcopy
+from typing import Dict, List, Sequence, Optional, Tuple
 
 import src.interactive.functions as interactive
 
 import schemas
+from common.metrics import measure_stage, observe_batch_size
 from config import settings
+from result_store import ResultStore
 
 POSTPROCESSING_REGEXP = re.compile(r"[^a-zA-Z0-9\- ]|\bnone\b", re.IGNORECASE)
 
@@ -29,6 +32,13 @@ class COMeTBaseEngine:
         self._annotator_input_model = None
         self._annotator_response_model = None
 
+        self._store = None
+        if "topk" not in self.decoding_algorithm:
+            # sampled beams differ from call to call, so only deterministic decoding results are stored
+            self._store = ResultStore(
+                self.graph, self.decoding_algorithm, settings.RESULT_STORE_PATH, settings.RESULT_CACHE_SIZE
+            )
+
     @property
     def input_event_model(self) -> Optional[schemas.BaseModel]:
         return self._input_event_model
@@ -63,6 +73,55 @@ class COMeTBaseEngine:
                 raw_result[relation_or_category] = self.beams_cleanup(preprocessed_beams)
         return raw_result
 
+    def get_raw_results(self, events: Sequence[str], category) -> Dict[str, Dict]:
+        """Get raw results for every event and relation, only the pairs missing in the result store are generated."""
+        relations = self._get_relations(category)
+        raw_results = {event: {} for event in events}
+        missing_pairs = []
+        with measure_stage("preprocessing"):
+            for event in raw_results:
+                stored = self._store.get_many(event, relations) if self._store is not None else {}
+                for relation in relations:
+                    if relation in stored:
+                        raw_results[event][relation] = self._make_sequence(event, relation, stored[relation])
+                    else:
+                        missing_pairs.append((event, relation))
+
+        sequences = []
+        if missing_pairs:
+            with measure_stage("inference"):
+                sequences = self._generate(missing_pairs)
+        if self._store is not None and sequences:
+            with measure_stage("result_store"):
+                self._store.put_many(
+                    (event, relation, sequence_all.get("beams"))
+                    for (event, relation), sequence_all in zip(missing_pairs, sequences)
+                )
+        for (event, relation), sequence_all in zip(missing_pairs, sequences):
+            raw_results[event][relation] = sequence_all
+
+        # keep the order of relations in the response
+        return {
+            event: {relation: raw_result[relation] for relation in relations}
+            for event, raw_result in raw_results.items()
+        }
+
+    def _get_relations(self, category) -> List[str]:
+        """Unique relations of the category, "all" (alone or in the list) is expanded into every relation."""
+        relations = []
+        for relation in [category] if isinstance(category, str) else category:
+            relations += self._get_all_relations() if relation == "all" else [relation]
+        return list(dict.fromkeys(relations))
+
+    def _get_all_relations(self) -> List[str]:
+        pass
+
+    def _make_sequence(self, event: str, relation: str, beams: Optional[Sequence[str]]) -> Dict:
+        pass
+
+    def _generate(self, pairs: Sequence[Tuple[str, str]]) -> List[Dict]:
+        pass
+
     def _calc_n_ctx(self) -> int:
         pass
 
@@ -86,13 +145,29 @@ class COMeTAtomic(COMeTBaseEngine):
         return self._data_loader.max_event + self._data_loader.max_effect
 
     def process_request(self, input_event: schemas.AtomicInputEventModel) -> Dict:
+        observe_batch_size(1, "/comet")
         return self._get_result(input_event["input"], input_event["category"])
 
     def _get_result(self, event: str, category: Sequence[str]) -> Dict:
-        raw_result = interactive.get_atomic_sequence(
-            event, self._model, self._sampler, self._data_loader, self._text_encoder, category
-        )
-        return self.all_beams_cleanup(raw_result)
+        raw_result = self.get_raw_results([event], category)[event]
+        with measure_stage("postprocessing"):
+            return self.all_beams_cleanup(raw_result)
+
+    def _get_all_relations(self):
+        return list(self._data_loader.categories)
+
+    def _make_sequence(self, event, relation, beams):
+        return {"event": event, "effect_type": relation, "beams": list(beams)}
+
+    def _generate(self, pairs):
+        sequences = []
+        for event, relation in pairs:
+            sequences.append(
+                interactive.get_atomic_sequence(
+                    event, self._model, self._sampler, self._data_loader, self._text_encoder, relation
+                )[relation]
+            )
+        return sequences
 
     def annotator(self, *args, **kwargs):
         raise NotImplementedError("No annotator for atomic graph is available!")
@@ -110,22 +185,42 @@ class COMeTConceptNet(COMeTBaseEngine):
         return self._data_loader.max_e1 + self._data_loader.max_e2 + self._data_loader.max_r
 
     def process_request(self, input_event: schemas.ConceptNetInputEventModel) -> Dict:
+        observe_batch_size(1, "/comet")
         return self._get_result(input_event["input"], input_event["category"])
 
     def _get_result(self, event, category):
-        raw_result = interactive.get_conceptnet_sequence(
-            event, self._model, self._sampler, self._data_loader, self._text_encoder, category
+        raw_result = self.get_raw_results([event], category)[event]
+        with measure_stage("postprocessing"):
+            return self.all_beams_cleanup(raw_result)
+
+    def _get_all_relations(self):
+        return list(interactive.data.conceptnet_data.conceptnet_relations)
+
+    def _make_sequence(self, event, relation, beams):
+        sequence_all = {"e1": event, "relation": relation}
+        if beams is not None:
+            sequence_all["beams"] = list(beams)
+        return sequence_all
+
+    def _generate(self, pairs):
+        return interactive.get_conceptnet_sequences(
+            pairs, self._model, self._sampler, self._data_loader, self._text_encoder, settings.BATCH_SIZE
         )
-        return self.all_beams_cleanup(raw_result)
 
     def annotator(self, input_event: schemas.ConceptNetAnnotatorEventModel):
-        batch = []
-        for nounphrases in input_event["nounphrases"]:
-            result = {}
-            for nounphrase in nounphrases:
-                conceptnet_result = self._get_result(nounphrase, input_event["category"])
-                result[nounphrase] = self.all_beams_cleanup(conceptnet_result, include_beams_key=False)
-            batch += [result]
+        observe_batch_size(len(input_event["nounphrases"]), "/comet_annotator")
+        # all (nounphrase, relation) pairs of the request which are not stored yet are generated together
+        unique_nounphrases = list(dict.fromkeys(sum(map(list, input_event["nounphrases"]), [])))
+        raw_results = self.get_raw_results(unique_nounphrases, input_event["category"])
+        with measure_stage("postprocessing"):
+            results = {
+                nounphrase: self.all_beams_cleanup(self.all_beams_cleanup(raw_result), include_beams_key=False)
+                for nounphrase, raw_result in raw_results.items()
+            }
+
+            batch = []
+            for nounphrases in input_event["nounphrases"]:
+                batch += [{nounphrase: deepcopy(results[nounphrase]) for nounphrase in nounphrases}]
         return batch
 
 
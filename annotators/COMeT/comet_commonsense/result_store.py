@@ -0,0 +1,66 @@
+import json
+import sqlite3
+import threading
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+from cachetools import LRUCache
+
+from common.metrics import count_cache_request
+
+
+class ResultStore:
+    """COMeT beams keyed by (graph, input, relation, decoding).
+
+    Results are kept in an in-memory LRU cache in front of an optional sqlite file,
+    the file is filled by `precompute.py` and by the service itself on cache misses.
+    `None` beams mean the input was too long and nothing was generated.
+    """
+
+    def __init__(self, graph: str, decoding: str, path: Optional[str] = None, cache_size: int = 10000):
+        self.graph = graph
+        self.decoding = decoding
+        self._cache = LRUCache(maxsize=cache_size)
+        self._lock = threading.Lock()
+        self._connection = None
+        if path:
+            self._connection = sqlite3.connect(path, check_same_thread=False)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS results (graph TEXT, input TEXT, relation TEXT, decoding TEXT, "
+                "beams TEXT, PRIMARY KEY (graph, input, relation, decoding))"
+            )
+            self._connection.commit()
+
+    def get_many(self, event: str, relations: Iterable[str]) -> Dict[str, Optional[Sequence[str]]]:
+        relations = list(relations)
+        result = {}
+        with self._lock:
+            missing = []
+            for relation in relations:
+                if (event, relation) in self._cache:
+                    result[relation] = self._cache[(event, relation)]
+                else:
+                    missing.append(relation)
+            if missing and self._connection is not None:
+                rows = self._connection.execute(
+                    "SELECT relation, beams FROM results WHERE graph=? AND input=? AND decoding=? "
+                    f"AND relation IN ({', '.join('?' * len(missing))})",
+                    [self.graph, event, self.decoding, *missing],
+                ).fetchall()
+                for relation, beams in rows:
+                    result[relation] = self._cache[(event, relation)] = json.loads(beams)
+        for relation in relations:
+            count_cache_request("comet", relation in result)
+        return result
+
+    def put_many(self, items: Iterable[Tuple[str, str, Optional[Sequence[str]]]]):
+        """Save (input, relation, beams) triplets."""
+        items = list(items)
+        with self._lock:
+            for event, relation, beams in items:
+                self._cache[(event, relation)] = beams
+            if self._connection is not None:
+                rows = [
+                    (self.graph, event, relation, self.decoding, json.dumps(beams)) for event, relation, beams in items
+                ]
+                self._connection.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)", rows)
+                self._connection.commit()
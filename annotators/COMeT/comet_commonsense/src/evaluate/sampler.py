@@ -3,6 +3,7 @@ import torch.nn.functional as F
 
 import src.data.data as data
 import src.models.utils as model_utils
+from src.models.gpt import reorder_past
 from config import settings
 
 
@@ -16,10 +17,39 @@ class Sampler:
         self.end_token = data_loader.vocab_encoder[data.end_token]
 
         self.opt = opt
+        # feed only the newest token to the model, keys and values of the previous ones are cached
+        self.use_cache = True
 
     def generate_sequence(self, batch, model):
         raise
 
+    def next_token_log_probs(self, model, XMB, MMB, past=None):
+        if not self.use_cache:
+            return F.log_softmax(model(XMB.unsqueeze(1), sequence_mask=MMB), dim=-1)[:, -1, :], None
+        inputs = XMB if past is None else XMB[:, -1:]
+        lm_logits, past = model(inputs.unsqueeze(1), sequence_mask=MMB, past=past, use_cache=True)
+        return F.log_softmax(lm_logits, dim=-1)[:, -1, :], past
+
+    @staticmethod
+    def reorder_cache(past, index):
+        return None if past is None else reorder_past(past, index)
+
+    def decode_beams(self, beam_seqs, data_loader):
+        beams = []
+        for beam in beam_seqs:
+            beams.append(
+                " ".join(
+                    "".join(
+                        [
+                            data_loader.vocab_decoder[tok.item()].replace("</w>", " ").replace("\n", "")
+                            for tok in beam
+                            if tok != self.end_token
+                        ]
+                    ).split()
+                )
+            )
+        return beams
+
 
 class GreedySampler(Sampler):
     def __init__(self, opt, data_loader, batch_mode=True):
@@ -37,9 +67,9 @@ class GreedySampler(Sampler):
 
         XMB = model_utils.prepare_position_embeddings(self.opt, data_loader.vocab_encoder, XMB.unsqueeze(-1))
 
-        lm_probs = F.log_softmax(model(XMB.unsqueeze(1), sequence_mask=MMB), dim=-1)
+        lm_probs, past = self.next_token_log_probs(model, XMB, MMB)
 
-        values, indices = lm_probs[:, -1, :].max(dim=-1)
+        values, indices = lm_probs.max(dim=-1)
         seqs = indices.clone().unsqueeze(1)
 
         loss = values
@@ -52,10 +82,10 @@ class GreedySampler(Sampler):
         # Sample from top k
 
         for _ in range(self.opt.eval.smax):
-            lm_probs = F.log_softmax(model(XMB.unsqueeze(1), sequence_mask=MMB), dim=-1)
+            lm_probs, past = self.next_token_log_probs(model, XMB, MMB, past)
 
             # Sample from top k
-            values, next_idx = lm_probs[:, -1, :].max(dim=-1)
+            values, next_idx = lm_probs.max(dim=-1)
 
             loss += values
             counts += 1
@@ -69,20 +99,7 @@ class GreedySampler(Sampler):
 
             XMB, MMB = self.append_batch(XMB, next_idx, MMB)
 
-        beams = []
-
-        for beam in seqs:
-            beams.append(
-                " ".join(
-                    "".join(
-                        [
-                            data_loader.vocab_decoder[tok.item()].replace("</w>", " ").replace("\n", "")
-                            for tok in beam
-                            if tok != self.end_token
-                        ]
-                    ).split()
-                )
-            )
+        beams = self.decode_beams(seqs, data_loader)
 
         sampling_result = {
             "sequence": beams[0],
@@ -116,9 +133,9 @@ class TopKSampler(Sampler):
 
         XMB = model_utils.prepare_position_embeddings(self.opt, data_loader.vocab_encoder, XMB.unsqueeze(-1))
 
-        lm_probs = F.log_softmax(model(XMB.unsqueeze(1), sequence_mask=MMB), dim=-1)
+        lm_probs, past = self.next_token_log_probs(model, XMB, MMB)
 
-        values, indices = lm_probs[:, -1, :].topk(self.opt.eval.k)
+        values, indices = lm_probs.topk(self.opt.eval.k)
         seqs = indices.t().clone()
 
         losses = -values.view(-1, 1)
@@ -127,6 +144,7 @@ class TopKSampler(Sampler):
         counts = 1 - ended
         XMB = XMB.repeat(self.opt.eval.k, 1, 1)
         MMB = MMB.repeat(self.opt.eval.k, 1)
+        past = self.reorder_cache(past, torch.zeros(self.opt.eval.k, dtype=torch.long, device=XMB.device))
         next_pos = XMB[:, -1:, 1] + 1
         next_x = torch.cat((indices.view(self.opt.eval.k, -1), next_pos), -1).unsqueeze(1)
         XMB = torch.cat((XMB, next_x), 1)
@@ -135,10 +153,10 @@ class TopKSampler(Sampler):
         # Sample from top k
 
         for _ in range(end_len):
-            lm_probs = F.log_softmax(model(XMB.unsqueeze(1), sequence_mask=MMB), dim=-1)
+            lm_probs, past = self.next_token_log_probs(model, XMB, MMB, past)
 
             # Sample from top k
-            values, indices = lm_probs[:, -1, :].topk(self.opt.eval.k)
+            values, indices = lm_probs.topk(self.opt.eval.k)
             choice = torch.multinomial(values.exp(), 1)
             next_idx = indices.gather(-1, choice)
 
@@ -157,20 +175,7 @@ class TopKSampler(Sampler):
 
             XMB, MMB = self.append_batch(XMB, next_idx, MMB)
 
-        beams = []
-
-        for beam in seqs:
-            beams.append(
-                " ".join(
-                    "".join(
-                        [
-                            data_loader.vocab_decoder[tok.item()].replace("</w>", " ").replace("\n", "")
-                            for tok in beam
-                            if tok != self.end_token
-                        ]
-                    ).split()
-                )
-            )
+        beams = self.decode_beams(seqs, data_loader)
 
         sampling_result = {
             "sequence": beams[0],
@@ -210,8 +215,8 @@ class BeamSampler(TopKSampler):
         beam_losses = []
         # Beam Search
         beam_lls, beam_toks, beam_seqs = None, None, None
-        lm_probs = F.log_softmax(model(XMB.unsqueeze(1), sequence_mask=MMB), dim=-1)
-        dist = lm_probs[:, -1, :].squeeze()
+        lm_probs, past = self.next_token_log_probs(model, XMB, MMB)
+        dist = lm_probs.squeeze()
         beam_lls, beam_toks = dist.topk(self.opt.eval.bs)
         beam_losses.append(beam_lls)
 
@@ -221,6 +226,7 @@ class BeamSampler(TopKSampler):
         beam_seqs = beam_toks.clone()
         XMB = XMB.repeat(self.opt.eval.bs, 1, 1)
         MMB = MMB.repeat(self.opt.eval.bs, 1)
+        past = self.reorder_cache(past, torch.zeros(self.opt.eval.bs, dtype=torch.long, device=XMB.device))
         next_pos = XMB[:, -1:, 1] + 1
         next_x = torch.cat((beam_toks, next_pos), -1).unsqueeze(1)
         XMB = torch.cat((XMB, next_x), 1)
@@ -229,8 +235,8 @@ class BeamSampler(TopKSampler):
         for _ in range(end_len):
 
             # Compute distribution for current beam
-            lm_probs = F.log_softmax(model(XMB.unsqueeze(1), sequence_mask=MMB), dim=-1)
-            dist = lm_probs[:, -1, :].squeeze()
+            lm_probs, past = self.next_token_log_probs(model, XMB, MMB, past)
+            dist = lm_probs.squeeze()
 
             # get hypothesis tokens for distribution
             hyp_beam_lls, hyp_beam_toks = dist.topk(self.opt.eval.bs)
@@ -244,23 +250,24 @@ class BeamSampler(TopKSampler):
 
             if paper_results:
                 # Results from paper with slightly buggy beam search
-                current_beam_lls = beam_lls.unsqueeze(1).repeat(1, self.opt.eval.bs).view(self.opt.eval.bs ** 2)
+                current_beam_lls = beam_lls.unsqueeze(1).repeat(1, self.opt.eval.bs).view(self.opt.eval.bs**2)
             else:
                 # Current beam search implementation
-                current_beam_lls = beam_losses[-1].unsqueeze(1).repeat(1, self.opt.eval.bs).view(self.opt.eval.bs ** 2)
+                current_beam_lls = beam_losses[-1].unsqueeze(1).repeat(1, self.opt.eval.bs).view(self.opt.eval.bs**2)
 
             # Compute losses of hypotheses, masking those that have ended
-            hyp_beam_lls = (hyp_beam_lls.view(self.opt.eval.bs ** 2) * hypothesis_mask.view(-1)) + current_beam_lls
+            hyp_beam_lls = (hyp_beam_lls.view(self.opt.eval.bs**2) * hypothesis_mask.view(-1)) + current_beam_lls
 
             # Get normalizer for sequences
-            temp_counts = counts.unsqueeze(1).repeat(1, self.opt.eval.bs).view(self.opt.eval.bs ** 2)
+            temp_counts = counts.unsqueeze(1).repeat(1, self.opt.eval.bs).view(self.opt.eval.bs**2)
 
             # Select best beams with lowest aggregate loss
             beam_lls, top_beam_idxs = (hyp_beam_lls / temp_counts).topk(self.opt.eval.bs)
 
             # Update placements in beam based on selecetion
-            beam_losses = [i.index_select(0, top_beam_idxs // self.opt.eval.bs) for i in beam_losses]
-            ended = ended.index_select(0, top_beam_idxs // self.opt.eval.bs)
+            prev_beam_idxs = top_beam_idxs // self.opt.eval.bs
+            beam_losses = [i.index_select(0, prev_beam_idxs) for i in beam_losses]
+            ended = ended.index_select(0, prev_beam_idxs)
             counts = temp_counts.index_select(0, top_beam_idxs)
 
             # Save beam losses
@@ -276,46 +283,19 @@ class BeamSampler(TopKSampler):
             ended = ended + (beam_toks == self.end_token).float() * (1 - ended)
             counts = counts + (1 - ended)
 
-            # Update beam sequences
-            beam_seqs = (
-                beam_seqs.t()
-                .repeat(self.opt.eval.bs, 1)
-                .t()
-                .contiguous()
-                .view(self.opt.eval.bs ** 2, -1)[top_beam_idxs]
-            )
+            # Update beam sequences, hypothesis i is an extension of beam i // bs
+            beam_seqs = beam_seqs.index_select(0, prev_beam_idxs)
             beam_seqs = torch.cat((beam_seqs, beam_toks.unsqueeze(1)), dim=1)
 
-            # I have no idea what's going on but Ari's on point with it
-            XMB = (
-                XMB.transpose(0, 1)
-                .transpose(1, 2)
-                .repeat(self.opt.eval.bs, 1, 1)
-                .transpose(2, 1)
-                .transpose(1, 0)
-                .contiguous()
-                .view(self.opt.eval.bs ** 2, XMB.size(1), XMB.size(2))[top_beam_idxs]
-            )
+            XMB = XMB.index_select(0, prev_beam_idxs)
+            past = self.reorder_cache(past, prev_beam_idxs)
 
             XMB, MMB = self.append_batch(XMB, beam_toks, MMB)
 
             if (beam_toks == self.end_token).sum().item() == self.opt.eval.bs:
                 break
 
-        beams = []
-
-        for beam in beam_seqs:
-            beams.append(
-                " ".join(
-                    "".join(
-                        [
-                            data_loader.vocab_decoder[tok.item()].replace("</w>", " ").replace("\n", "")
-                            for tok in beam
-                            if tok != self.end_token
-                        ]
-                    ).split()
-                )
-            )
+        beams = self.decode_beams(beam_seqs, data_loader)
 
         sampling_result = {
             "sequence": beams[0],
@@ -327,3 +307,82 @@ class BeamSampler(TopKSampler):
         }
 
         return sampling_result
+
+    def generate_sequences(self, batch, model, data_loader, start_idx, end_len):
+        """Beam search for a batch of inputs of the same length, returns a list of beams for every input.
+
+        Every input gets the same beams as from `generate_sequence`, inputs whose beams have all ended
+        keep them in place while the others are decoded.
+        """
+        bs = self.opt.eval.bs
+        XMB = batch["sequences"][:, :start_idx]
+        MMB = batch["attention_mask"][:, :start_idx]
+        n_inputs = XMB.size(0)
+        device = XMB.device
+
+        XMB = model_utils.prepare_position_embeddings(self.opt, data_loader.vocab_encoder, XMB.unsqueeze(-1))
+
+        # rows of the decoded batch are beams: row = input index * bs + beam index
+        offsets = torch.arange(n_inputs, device=device).unsqueeze(1) * bs
+        keep_idxs = (torch.arange(bs, device=device) * bs).expand(n_inputs, bs)
+        kill_mask = self.kill_mask.to(device=device)
+
+        lm_probs, past = self.next_token_log_probs(model, XMB, MMB)
+        beam_lls, beam_toks = lm_probs.topk(bs)
+        beam_losses = [beam_lls]
+
+        ended = (beam_toks == self.end_token).float()
+        counts = 2 - ended
+        beam_seqs = beam_toks.view(-1, 1)
+        rows = torch.arange(n_inputs, device=device).repeat_interleave(bs)
+        XMB = XMB.index_select(0, rows)
+        MMB = MMB.index_select(0, rows)
+        past = self.reorder_cache(past, rows)
+        XMB, MMB = self.append_batch(XMB, beam_toks.view(-1), MMB)
+        done = (beam_toks == self.end_token).all(dim=1)
+
+        for _ in range(end_len):
+            if done.all():
+                break
+
+            lm_probs, past = self.next_token_log_probs(model, XMB, MMB, past)
+            hyp_beam_lls, hyp_beam_toks = lm_probs.topk(bs)
+            hyp_beam_lls = hyp_beam_lls.view(n_inputs, bs**2)
+            hyp_beam_toks = hyp_beam_toks.view(n_inputs, bs**2)
+
+            # Compute masks and expand beam
+            expanded_ended = ended.unsqueeze(2).repeat(1, 1, bs)
+            hypothesis_mask = expanded_ended * kill_mask + (1 - expanded_ended)
+            current_beam_lls = beam_losses[-1].unsqueeze(2).repeat(1, 1, bs).view(n_inputs, bs**2)
+            hyp_beam_lls = hyp_beam_lls * hypothesis_mask.view(n_inputs, -1) + current_beam_lls
+            temp_counts = counts.unsqueeze(2).repeat(1, 1, bs).view(n_inputs, bs**2)
+
+            # Select best beams with lowest aggregate loss, finished inputs keep their beams
+            scores = hyp_beam_lls / temp_counts
+            _, top_beam_idxs = scores.topk(bs)
+            top_beam_idxs = torch.where(done.unsqueeze(1), keep_idxs, top_beam_idxs)
+            beam_lls = scores.gather(1, top_beam_idxs)
+
+            # Update placements in beam based on selection
+            prev_beam_idxs = top_beam_idxs // bs
+            beam_losses = [i.gather(1, prev_beam_idxs) for i in beam_losses]
+            ended = ended.gather(1, prev_beam_idxs)
+            counts = temp_counts.gather(1, top_beam_idxs)
+            beam_losses.append(beam_lls * counts)
+
+            # Update beam tokens
+            beam_toks = hyp_beam_toks.gather(1, top_beam_idxs) * (1 - ended).long() + (self.end_token * ended).long()
+
+            # Update ended and counts
+            ended = ended + (beam_toks == self.end_token).float() * (1 - ended)
+            counts = counts + (1 - ended)
+
+            rows = (prev_beam_idxs + offsets).view(-1)
+            beam_seqs = torch.cat((beam_seqs.index_select(0, rows), beam_toks.view(-1, 1)), dim=1)
+            XMB = XMB.index_select(0, rows)
+            past = self.reorder_cache(past, rows)
+            XMB, MMB = self.append_batch(XMB, beam_toks.view(-1), MMB)
+            done = done | (beam_toks == self.end_token).all(dim=1)
+
+        beams = self.decode_beams(beam_seqs, data_loader)
+        return [beams[i * bs : (i + 1) * bs] for i in range(n_inputs)]
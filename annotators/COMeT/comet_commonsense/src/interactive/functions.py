@@ -156,10 +156,7 @@ def get_conceptnet_sequence(e1, model, sampler, data_loader, text_encoder, relat
         sequence_all["relation"] = relation
 
         with torch.no_grad():
-            if data_loader.max_r != 1:
-                relation_sequence = data.conceptnet_data.split_into_words[relation]
-            else:
-                relation_sequence = "<{}>".format(relation)
+            relation_sequence = get_relation_sequence(relation, data_loader)
 
             batch, abort = set_conceptnet_inputs(
                 e1, relation_sequence, text_encoder, data_loader.max_e1, data_loader.max_r, force
@@ -176,6 +173,51 @@ def get_conceptnet_sequence(e1, model, sampler, data_loader, text_encoder, relat
         return {relation: sequence_all}
 
 
+def get_relation_sequence(relation, data_loader):
+    if data_loader.max_r != 1:
+        return data.conceptnet_data.split_into_words[relation]
+    return "<{}>".format(relation)
+
+
+def get_conceptnet_sequences(pairs, model, sampler, data_loader, text_encoder, batch_size=16):
+    """Generate beams for (e1, relation) pairs, `batch_size` pairs share one beam search.
+
+    Returns a list of `{"e1": e1, "relation": relation, "beams": beams}` in the order of `pairs`,
+    pairs with too long e1 get no `beams` key as in `get_conceptnet_sequence`.
+    """
+    sequences = [{"e1": e1, "relation": relation} for e1, relation in pairs]
+    if not isinstance(sampler, BeamSampler):
+        for sequence_all in sequences:
+            result = get_conceptnet_sequence(
+                sequence_all["e1"], model, sampler, data_loader, text_encoder, sequence_all["relation"]
+            )
+            sequence_all.update(result[sequence_all["relation"]])
+        return sequences
+
+    batch_ids, batches = [], []
+    for i, (e1, relation) in enumerate(pairs):
+        relation_sequence = get_relation_sequence(relation, data_loader)
+        batch, abort = set_conceptnet_inputs(
+            e1, relation_sequence, text_encoder, data_loader.max_e1, data_loader.max_r, False
+        )
+        if not abort:
+            batch_ids.append(i)
+            batches.append(batch)
+
+    with torch.no_grad():
+        for start in range(0, len(batches), batch_size):
+            batch = {
+                key: torch.cat([sample[key] for sample in batches[start : start + batch_size]])
+                for key in ["sequences", "attention_mask"]
+            }
+            batch_beams = sampler.generate_sequences(
+                batch, model, data_loader, data_loader.max_e1 + data_loader.max_r, data_loader.max_e2
+            )
+            for i, beams in zip(batch_ids[start : start + batch_size], batch_beams):
+                sequences[i]["beams"] = beams
+    return sequences
+
+
 def set_conceptnet_inputs(input_event, relation, text_encoder, max_e1, max_r, force):
     abort = False
 
@@ -85,7 +85,8 @@ class Attention(nn.Module):
         if self.scale:
             w = w / math.sqrt(v.size(-1))
 
-        b_subset = self.b[:, :, : w.size(-2), : w.size(-1)]
+        # with cached keys and values queries are the last w.size(-2) positions of w.size(-1) ones
+        b_subset = self.b[:, :, w.size(-1) - w.size(-2) : w.size(-1), : w.size(-1)]
 
         if sequence_mask is not None:
             b_subset = b_subset * sequence_mask.view(sequence_mask.size(0), 1, -1)
@@ -109,16 +110,22 @@ class Attention(nn.Module):
         else:
             return x.permute(0, 2, 1, 3)
 
-    def forward(self, x, sequence_mask):
+    def forward(self, x, sequence_mask, layer_past=None, use_cache=False):
         x = self.c_attn(x)
         query, key, value = x.split(self.split_size, dim=2)
         query = self.split_heads(query)
         key = self.split_heads(key, k=True)
         value = self.split_heads(value)
+        if layer_past is not None:
+            past_key, past_value = layer_past
+            key = torch.cat((past_key, key), dim=-1)
+            value = torch.cat((past_value, value), dim=-2)
         a = self._attn(query, key, value, sequence_mask)
         a = self.merge_heads(a)
         a = self.c_proj(a)
         a = self.resid_dropout(a)
+        if use_cache:
+            return a, (key, value)
         return a
 
 
@@ -146,11 +153,15 @@ class Block(nn.Module):
         self.mlp = MLP(4 * nx, cfg)
         self.ln_2 = LayerNorm(nx)
 
-    def forward(self, x, sequence_mask):
-        a = self.attn(x, sequence_mask)
+    def forward(self, x, sequence_mask, layer_past=None, use_cache=False):
+        a = self.attn(x, sequence_mask, layer_past, use_cache)
+        if use_cache:
+            a, present = a
         n = self.ln_1(x + a)
         m = self.mlp(n)
         h = self.ln_2(n + m)
+        if use_cache:
+            return h, present
         return h
 
 
@@ -167,14 +178,22 @@ class TransformerModel(nn.Module):
 
         nn.init.normal_(self.embed.weight, std=0.02)
 
-    def forward(self, x, sequence_mask):
+    def forward(self, x, sequence_mask, past=None, use_cache=False):
         x = x.view(-1, x.size(-2), x.size(-1))
         e = self.embed(x)
         # Add the position information to the input embeddings
         h = e.sum(dim=2)
-        for block in self.h:
-            h = block(h, sequence_mask)
-        return h
+        if not use_cache:
+            for block in self.h:
+                h = block(h, sequence_mask)
+            return h
+        # incremental decoding: `x` holds only new tokens, keys and values of previous ones are in `past`
+        past = [None] * len(self.h) if past is None else past
+        presents = []
+        for block, layer_past in zip(self.h, past):
+            h, present = block(h, sequence_mask, layer_past, use_cache)
+            presents.append(present)
+        return h, presents
 
 
 class LMModel(nn.Module):
@@ -191,16 +210,25 @@ class LMModel(nn.Module):
             pos_emb_mask[:, :, -n_ctx:] = -1e12
             self.register_buffer("pos_emb_mask", pos_emb_mask)
 
-    def forward(self, x, sequence_mask=None):
-        h = self.transformer(x, sequence_mask)
+    def forward(self, x, sequence_mask=None, past=None, use_cache=False):
+        h = self.transformer(x, sequence_mask, past, use_cache)
+        if use_cache:
+            h, presents = h
         lm_logits = self.lm_head(h)
         if self.return_probs:
             lm_logits = F.softmax(lm_logits + self.pos_emb_mask, dim=-1)
         elif self.return_acts:
             lm_logits = lm_logits + self.pos_emb_mask
+        if use_cache:
+            return lm_logits, presents
         return lm_logits
 
 
+def reorder_past(past, index):
+    """Select cached keys and values of the beams which are kept, `index` is applied to batch dimension."""
+    return [(key.index_select(0, index), value.index_select(0, index)) for key, value in past]
+
+
 class LMHead(nn.Module):
     """Language Model Head for the transformer"""
 
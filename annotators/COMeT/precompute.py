@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+"""Fill the COMeT result store with beams for known inputs, so that the service does not generate them at runtime.
+
+Run inside the container with RESULT_STORE_PATH set, e.g. for meta-script topics on the atomic graph:
+```
+python precompute.py --topics topics_counter_10.json comet_predefined.json --template "person {}"
+```
+and for the conceptnet graph:
+```
+python precompute.py --topics topics_counter_10.json --template "{}." --relations SymbolOf HasProperty Causes
+```
+"""
+import argparse
+import json
+import logging
+import time
+
+from comet_commonsense.interface import COMeTFactory
+from comet_commonsense.config import settings
+
+logging.basicConfig(format="%(asctime)s - %(name)s - %(levelname)s - %(message)s", level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--topics", nargs="+", required=True, help="json files with a list of topics or a dict by topics")
+parser.add_argument("--template", default="{}", help="template to make the input from the topic")
+parser.add_argument("--relations", nargs="+", default=["all"], help="relations to generate")
+parser.add_argument("--chunk-size", type=int, default=64, help="number of topics processed at once")
+
+
+def main():
+    args = parser.parse_args()
+    assert settings.RESULT_STORE_PATH, "RESULT_STORE_PATH is not set"
+    comet_engine = COMeTFactory(settings.GRAPH)(settings.PRETRAINED_MODEL, settings.DECODING_ALGO)
+    assert comet_engine._store is not None, f"{settings.DECODING_ALGO} results are not stored"
+    relations = args.relations[0] if args.relations == ["all"] else args.relations
+
+    inputs = []
+    for topics_path in args.topics:
+        inputs += [args.template.format(topic) for topic in json.load(open(topics_path))]
+    inputs = list(dict.fromkeys(inputs))
+
+    st_time = time.time()
+    for start in range(0, len(inputs), args.chunk_size):
+        comet_engine.get_raw_results(inputs[start : start + args.chunk_size], relations)
+        logger.info(f"{min(start + args.chunk_size, len(inputs))}/{len(inputs)} inputs in {time.time() - st_time:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,7 @@ from sentry_sdk.integrations.logging import ignore_logger
 
 from comet_commonsense.interface import COMeTFactory
 from comet_commonsense.config import settings
+from common.metrics import setup_metrics
 import test_server
 
 ignore_logger("root")
@@ -18,6 +19,7 @@ ignore_logger("root")
 sentry_sdk.init(dsn=settings.SENTRY_DSN)
 
 app = FastAPI()
+setup_metrics(app)
 
 logging.basicConfig(format="%(asctime)s - %(name)s - %(levelname)s - %(message)s", level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -57,14 +59,15 @@ def annotator_handler(data):
         raise exc
 
 
+# handlers are not async, so FastAPI runs generation in a threadpool instead of blocking the event loop
 @app.post("/comet", response_model=comet_engine.response_model)
-async def comet_base_handler(input_event: comet_engine.input_event_model):
+def comet_base_handler(input_event: comet_engine.input_event_model):
     result = handler(input_event.dict())
     return result
 
 
 @app.post("/comet_annotator", response_model=comet_engine.annotator_response_model)
-async def comet_annotator_handler(input_event: comet_engine.annotator_input_model):
+def comet_annotator_handler(input_event: comet_engine.annotator_input_model):
     result = annotator_handler(input_event.dict())
     return result
 
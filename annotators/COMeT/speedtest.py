@@ -0,0 +1,32 @@
+#!/usr/bin/env python
+
+import json
+import time
+
+import numpy as np
+
+from comet_commonsense.interface import COMeTFactory
+from comet_commonsense.config import settings
+
+
+def main_test():
+    loops = 5
+    comet_engine = COMeTFactory(settings.GRAPH)(settings.PRETRAINED_MODEL, settings.DECODING_ALGO)
+    # every loop has to generate the beams
+    comet_engine._store = None
+    request = json.load(open(f"tests/{settings.GRAPH}_in.json"))
+    results = {}
+    for use_cache in [False, True]:
+        comet_engine._sampler.use_cache = use_cache
+        times = []
+        for i in range(loops):
+            start = time.time()
+            results[use_cache] = comet_engine.process_request(request)
+            times.append(time.time() - start)
+        print(f"{settings.GRAPH} {settings.DECODING_ALGO} use_cache={use_cache}: mean time {np.mean(times):.3f}s")
+    if "beam" in settings.DECODING_ALGO or "greedy" in settings.DECODING_ALGO:
+        assert results[False] == results[True], f"{results[False]} != {results[True]}"
+
+
+if __name__ == "__main__":
+    main_test()
@@ -2,10 +2,12 @@ import requests
 import os
 
 import common.test_utils as test_utils
+from schemas import ATOMIC_VALID_EFFECTS, CONCEPTNET_VALID_RELATIONS
 
 SERVICE_NAME = os.getenv("SERVICE_NAME")
 SERVICE_PORT = int(os.getenv("SERVICE_PORT"))
 URL = f"http://0.0.0.0:{SERVICE_PORT}/comet"
+ANNOTATOR_URL = f"http://0.0.0.0:{SERVICE_PORT}/comet_annotator"
 
 
 def handler(requested_data):
@@ -13,6 +15,11 @@ def handler(requested_data):
     return hypothesis
 
 
+def annotator_handler(requested_data):
+    hypothesis = requests.post(ANNOTATOR_URL, json={**requested_data}).json()
+    return hypothesis
+
+
 def run_test(handler):
     in_data, out_data = test_utils.get_dataset()
     for test_name in in_data:
@@ -29,5 +36,34 @@ def run_test(handler):
             print("Success")
 
 
+def run_annotator_test(handler, annotator_handler):
+    # batched annotator has to return the same beams as separate requests for every nounphrase
+    request = {"nounphrases": [["basketball", "dog"], ["dog"]], "category": ["SymbolOf", "HasProperty", "Causes"]}
+    hypothesis = annotator_handler(request)
+    for nounphrases, result in zip(request["nounphrases"], hypothesis):
+        ground_truth = {}
+        for nounphrase in nounphrases:
+            comet_result = handler({"input": nounphrase, "category": request["category"]})
+            ground_truth[nounphrase] = {relation: comet_result[relation]["beams"] for relation in comet_result}
+        is_equal_flag, msg = test_utils.compare_structs(ground_truth, result)
+        assert is_equal_flag, msg
+    print("Success")
+
+
+def run_all_relations_test(handler):
+    # "all" in the list of categories is expanded into every relation of the graph
+    if "atomic" in SERVICE_NAME:
+        request, relations = {"input": "PersonX went to a mall"}, ATOMIC_VALID_EFFECTS - {"all"}
+    else:
+        request, relations = {"input": "basketball"}, CONCEPTNET_VALID_RELATIONS - {"all"}
+    hypothesis = handler({**request, "category": ["all"]})
+    assert set(hypothesis) == relations, set(hypothesis) ^ relations
+    assert handler({**request, "category": ["xReact" if "atomic" in SERVICE_NAME else "Causes", "all"]}) == hypothesis
+    print("Success")
+
+
 if __name__ == "__main__":
     run_test(handler)
+    run_all_relations_test(handler)
+    if "conceptnet" in SERVICE_NAME:
+        run_annotator_test(handler, annotator_handler)
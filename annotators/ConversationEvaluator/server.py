@@ -6,41 +6,89 @@ from flask import Flask, request, jsonify
 import sentry_sdk
 
 from sentry_sdk.integrations.flask import FlaskIntegration
+from bert_dp.preprocessing import InputFeatures
 from deeppavlov import build_model
 
 logger = logging.getLogger(__name__)
 sentry_sdk.init(dsn=os.getenv("SENTRY_DSN"), integrations=[FlaskIntegration()])
 
 
-def transform(data):
-    dialogs = []
+SEPARATOR = " [SEP]"
+
+
+def get_history(data):
     utterances = []
     for past_uttr, past_response in zip(data["pastUtterances"], data["pastResponses"]):
         utterances.append(past_uttr)
         utterances.append(past_response)
     utterances.append(data["currentUtterance"])
-    for hyp in data["hypotheses"]:
-        dialogs.append(" [SEP]".join(utterances + [hyp]))
-    return dialogs
+    return SEPARATOR.join(utterances)
+
+
+def transform(data):
+    history = get_history(data)
+    return [f"{history}{SEPARATOR}{hyp}" for hyp in data["hypotheses"]]
 
 
 try:
     model = build_model("conveval.json", download=False)
     test_res = model(["a"])
+    preprocessor, classifier = model[0], model[1]
+    tokenizer, max_seq_length = preprocessor.tokenizer, preprocessor.max_seq_length
+    separator_tokens = tokenizer.tokenize(SEPARATOR)
     logger.info("model loaded, test query processed")
 except Exception as e:
     sentry_sdk.capture_exception(e)
     logger.exception(e)
     raise e
 
+
+def get_features(tokens):
+    """BERT features of the text tokens, the same as `bert_preprocessor` makes for a single text."""
+    tokens = ["[CLS]"] + tokens[: max_seq_length - 2] + ["[SEP]"]
+    input_ids = tokenizer.convert_tokens_to_ids(tokens)
+    padding = [0] * (max_seq_length - len(input_ids))
+    return InputFeatures(
+        unique_id=0,
+        tokens=tokens,
+        input_ids=input_ids + padding,
+        input_mask=[1] * len(input_ids) + padding,
+        input_type_ids=[0] * max_seq_length,
+    )
+
+
+def score(data):
+    """Scores of the hypotheses, the same as `model(transform(data))` gives.
+
+    The basic tokenizer splits on whitespace and punctuation, so the history followed by " [SEP]" is tokenized
+    to the same tokens alone or joined with a hypothesis. The history is tokenized and truncated once,
+    the hypotheses are tokenized only while there is room left in `max_seq_length`, and the candidates with
+    the same truncated tokens (all of them if the history fills the window) are scored once in one batch.
+    """
+    history_tokens = tokenizer.tokenize(get_history(data)) + separator_tokens
+    max_n_tokens = max_seq_length - 2
+    if len(history_tokens) >= max_n_tokens:
+        candidates = [tuple(history_tokens[:max_n_tokens])] * len(data["hypotheses"])
+    else:
+        candidates = [
+            tuple(history_tokens + tokenizer.tokenize(hyp)[: max_n_tokens - len(history_tokens)])
+            for hyp in data["hypotheses"]
+        ]
+    unique_candidates = list(dict.fromkeys(candidates))
+    if not unique_candidates:
+        return []
+    unique_scores = classifier([get_features(list(tokens)) for tokens in unique_candidates])
+    scores_by_candidate = dict(zip(unique_candidates, unique_scores))
+    return [scores_by_candidate[tokens] for tokens in candidates]
+
+
 app = Flask(__name__)
 
 
 @app.route("/batch_model", methods=["POST"])
 def batch_respond():
     t = time.time()
-    data = transform(request.json)
-    conv_eval_results = model(data)
+    conv_eval_results = score(request.json)
     key_annotations = [
         "isResponseComprehensible",
         "isResponseErroneous",
@@ -0,0 +1,48 @@
+"""Latency of scoring a turn with 24 hypotheses: full dialogs through the pipeline vs the history tokenized once.
+
+Run in the container: `python speedtest.py`.
+"""
+import time
+
+import numpy as np
+
+from server import model, score, transform
+
+HYPOTHESES = [
+    "that a great name for a cat",
+    "i don't want to talk about politics",
+    "why did you call your cat this name?",
+    "do you have any other pets?",
+    "cats are so cute! what color is your cat?",
+    "i love dogs more than cats.",
+    "let's talk about movies.",
+    "did you know that cats sleep for 70% of their lives?",
+] * 3
+SHORT_HISTORY = {
+    "currentUtterance": "okay. i love cats. my cat is named putin.",
+    "pastResponses": [" no. let's chat about animals. "],
+    "pastUtterances": ["let's chat about jesus"],
+}
+LONG_HISTORY = {
+    "currentUtterance": "okay. i love cats. my cat is named putin.",
+    "pastResponses": ["i like to talk about many things, for example, about movies, books and animals."] * 5,
+    "pastUtterances": ["hi! what do you like to talk about? i am a bit bored today and want to chat."] * 5,
+}
+N_RUNS = 10
+
+
+def measure(function, data):
+    start = time.perf_counter()
+    for _ in range(N_RUNS):
+        result = function(data)
+    return (time.perf_counter() - start) / N_RUNS, np.array(result)
+
+
+if __name__ == "__main__":
+    print(f"{'history':>8} {'hypotheses':>10} {'per dialog, ms':>15} {'history once, ms':>17}")
+    for name, history in [("short", SHORT_HISTORY), ("long", LONG_HISTORY)]:
+        data = dict(history, hypotheses=HYPOTHESES)
+        dialogs_time, dialogs_scores = measure(lambda data: model(transform(data)), data)
+        history_time, history_scores = measure(score, data)
+        assert np.allclose(dialogs_scores, history_scores, atol=1e-5), (dialogs_scores, history_scores)
+        print(f"{name:>8} {len(HYPOTHESES):>10} {dialogs_time * 1000:15.1f} {history_time * 1000:17.1f}")
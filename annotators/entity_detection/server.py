@@ -2,6 +2,9 @@ import logging
 import os
 import re
 import time
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from itertools import accumulate
 
 import sentry_sdk
 from flask import Flask, jsonify, request
@@ -33,6 +36,70 @@ EVERYTHING_EXCEPT_LETTERS_DIGITALS_AND_SPACE = re.compile(r"[^a-zA-Z0-9 \-&*+]")
 DOUBLE_SPACES = re.compile(r"\s+")
 
 
+# the taggers are different models (torch and tf BERTs), so they can not share the encoder pass
+# but run concurrently: both frameworks release the GIL during inference
+lcquad_executor = ThreadPoolExecutor(max_workers=1)
+
+
+def clean_entity(entity):
+    entity = EVERYTHING_EXCEPT_LETTERS_DIGITALS_AND_SPACE.sub(" ", entity)
+    return DOUBLE_SPACES.sub(" ", entity).strip()
+
+
+class SpanIndex:
+    """Checks if a span lies inside one of the spans with a binary search over the spans sorted by start."""
+
+    def __init__(self, spans):
+        spans = sorted(spans)
+        self.starts = [start for start, _ in spans]
+        # the farthest end of the spans starting before or at the position
+        self.max_ends = list(accumulate((end for _, end in spans), max))
+
+    def contains(self, span):
+        n_spans = bisect_right(self.starts, span[0])
+        return n_spans > 0 and self.max_ends[n_spans - 1] >= span[1]
+
+
+def merge_entities(entities, tags, entities_offsets, entities_lc, entities_offsets_lc):
+    """Entities of the alexa tagger and the lcquad entities which are not the same or inside of them."""
+    utt_entities = {}
+    for entity, tag, offsets in zip(entities, tags, entities_offsets):
+        if entity not in nltk_stopwords and len(entity) > 2:
+            entity = clean_entity(entity)
+            utt_entities.setdefault("entities", []).append(entity)
+            utt_entities.setdefault("labelled_entities", []).append(
+                {"text": entity, "label": tag.lower(), "offsets": offsets}
+            )
+    detected_entities = set(utt_entities.get("entities", []))
+    detected_spans = SpanIndex([entity["offsets"] for entity in utt_entities.get("labelled_entities", [])])
+    for entity, offsets in zip(entities_lc, entities_offsets_lc):
+        if entity not in nltk_stopwords and len(entity) > 2:
+            entity = clean_entity(entity)
+            if entity not in detected_entities and not detected_spans.contains(offsets):
+                utt_entities.setdefault("entities", []).append(entity)
+                utt_entities.setdefault("labelled_entities", []).append(
+                    {"text": entity, "label": "misc", "offsets": offsets}
+                )
+    return utt_entities
+
+
+def detect_entities(utterances_list, concurrent=True):
+    if concurrent:
+        lcquad_future = lcquad_executor.submit(entity_detection_lcquad, utterances_list)
+        entities_batch, tags_batch, _, entities_offsets_batch, _ = entity_detection_alexa(utterances_list)
+        entities_batch_lc, _, _, entities_offsets_batch_lc, _ = lcquad_future.result()
+    else:
+        entities_batch, tags_batch, _, entities_offsets_batch, _ = entity_detection_alexa(utterances_list)
+        entities_batch_lc, _, _, entities_offsets_batch_lc, _ = entity_detection_lcquad(utterances_list)
+    logger.info(f"entities_batch_lcquad {entities_batch_lc}")
+    return [
+        merge_entities(*utt_outputs)
+        for utt_outputs in zip(
+            entities_batch, tags_batch, entities_offsets_batch, entities_batch_lc, entities_offsets_batch_lc
+        )
+    ]
+
+
 def get_result(request):
     st_time = time.time()
     last_utterances = request.json.get("sentences", [])
@@ -48,72 +115,9 @@ def get_result(request):
             utterances_nums.append(n)
 
     utt_entities_batch = [{} for _ in last_utterances]
-    utt_entities = {}
     if utterances_list:
-        entities_batch, tags_batch, positions_batch, entities_offsets_batch, probas_batch = entity_detection_alexa(
-            utterances_list
-        )
-        (
-            entities_batch_lc,
-            tags_batch_lc,
-            positions_batch_lc,
-            entities_offsets_batch_lc,
-            probas_batch_lc,
-        ) = entity_detection_lcquad(utterances_list)
-        logger.info(f"entities_batch_lcquad {entities_batch_lc}")
-        already_detected_set = set()
-        cur_num = 0
-        for entities_list, tags_list, entities_offsets_list, num in zip(
-            entities_batch, tags_batch, entities_offsets_batch, utterances_nums
-        ):
-            if num != cur_num:
-                utt_entities_batch[cur_num] = utt_entities
-                utt_entities = {}
-                cur_num = num
-            for entity, tag, offsets in zip(entities_list, tags_list, entities_offsets_list):
-                if entity not in nltk_stopwords and len(entity) > 2:
-                    entity = EVERYTHING_EXCEPT_LETTERS_DIGITALS_AND_SPACE.sub(" ", entity)
-                    entity = DOUBLE_SPACES.sub(" ", entity).strip()
-                    if "entities" in utt_entities:
-                        utt_entities["entities"].append(entity)
-                        utt_entities["labelled_entities"].append(
-                            {"text": entity, "label": tag.lower(), "offsets": offsets}
-                        )
-                        already_detected_set.add((entity, offsets))
-                    else:
-                        utt_entities["entities"] = [entity]
-                        utt_entities["labelled_entities"] = [{"text": entity, "label": tag.lower(), "offsets": offsets}]
-                        already_detected_set.add((entity, offsets))
-        cur_num = 0
-        for entities_list, entities_offsets_list, num in zip(
-            entities_batch_lc, entities_offsets_batch_lc, utterances_nums
-        ):
-            if num != cur_num:
-                utt_entities_batch[cur_num] = utt_entities
-                utt_entities = {}
-                cur_num = num
-            for entity, offsets in zip(entities_list, entities_offsets_list):
-                if entity not in nltk_stopwords and len(entity) > 2:
-                    entity = EVERYTHING_EXCEPT_LETTERS_DIGITALS_AND_SPACE.sub(" ", entity)
-                    entity = DOUBLE_SPACES.sub(" ", entity).strip()
-                    found_already_detected = False
-                    for already_detected_entity, already_detected_offsets in already_detected_set:
-                        if entity == already_detected_entity or (
-                            offsets[0] >= already_detected_offsets[0] and offsets[1] <= already_detected_offsets[1]
-                        ):
-                            found_already_detected = True
-                    if "entities" in utt_entities:
-                        if not found_already_detected:
-                            utt_entities["entities"].append(entity)
-                            utt_entities["labelled_entities"].append(
-                                {"text": entity, "label": "misc", "offsets": offsets}
-                            )
-                    else:
-                        if not found_already_detected:
-                            utt_entities["entities"] = [entity]
-                            utt_entities["labelled_entities"] = [{"text": entity, "label": "misc", "offsets": offsets}]
-        if utt_entities:
-            utt_entities_batch[cur_num] = utt_entities
+        for num, utt_entities in zip(utterances_nums, detect_entities(utterances_list)):
+            utt_entities_batch[num] = utt_entities
 
     if not last_utterances:
         utt_entities_batch.append({})
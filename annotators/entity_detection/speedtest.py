@@ -0,0 +1,36 @@
+"""Latency of the serial two-pass tagging and of the concurrent one on a fixed set of utterances.
+
+Run in the container: `python speedtest.py`.
+"""
+import time
+
+from server import detect_entities
+
+UTTERANCES = [
+    "what is the capital of russia?",
+    "let's talk about politics.",
+    "i watched the avengers with my brother yesterday.",
+    "do you like taylor swift and ed sheeran?",
+    "i have been to paris and london last summer.",
+    "my favorite book is harry potter and the goblet of fire.",
+    "who is the ceo of tesla?",
+    "i like to play minecraft and fortnite.",
+]
+N_RUNS = 20
+
+
+def measure(utterances, concurrent):
+    start = time.perf_counter()
+    for _ in range(N_RUNS):
+        result = detect_entities(utterances, concurrent=concurrent)
+    return (time.perf_counter() - start) / N_RUNS, result
+
+
+if __name__ == "__main__":
+    print(f"{'batch size':>10} {'two-pass, ms':>14} {'concurrent, ms':>16}")
+    for batch_size in [1, 4, len(UTTERANCES)]:
+        utterances = UTTERANCES[:batch_size]
+        serial_time, serial_result = measure(utterances, concurrent=False)
+        concurrent_time, concurrent_result = measure(utterances, concurrent=True)
+        assert serial_result == concurrent_result
+        print(f"{batch_size:>10} {serial_time * 1000:14.1f} {concurrent_time * 1000:16.1f}")
@@ -0,0 +1,50 @@
+import os
+import tempfile
+import time
+
+from type_index import read_fixture, save_index, select_types
+from type_requester import TypeRequester
+
+FIXTURE_PATH = "tests/entity_types_fixture.json"
+
+
+def test_type_index():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        index_path = os.path.join(tmp_dir, "entity_types.db")
+        save_index(index_path, read_fixture(FIXTURE_PATH))
+        type_requester = TypeRequester(index_path=index_path)
+        entity_ids = [[["Q42", "Q90", "Q0"], ["Q5369"], []]]
+        assert type_requester(entity_ids) == [[["human", "city", None], ["lake"], []]]
+
+        entity_ids = [[["Q42", "Q60", "Q142", "Q190050", "Q7156"]] * 20]
+        start = time.perf_counter()
+        for _ in range(100):
+            type_requester(entity_ids)
+        lookup_time = (time.perf_counter() - start) / 100
+        print(f"lookup of 100 entities: {lookup_time * 1000:.3f}ms")
+        assert lookup_time < 0.01, lookup_time
+    print("Success")
+
+
+def test_select_types():
+    # HDT returns the types of an entity sorted as strings
+    triplets = [
+        ("http://we/Q42", "http://wpd/P31", "http://we/Q5"),
+        ("http://we/Q76", "http://wpd/P31", "http://we/Q5"),
+        ("http://we/Q76", "http://wpd/P31", "http://we/Q82955"),
+        ("http://we/Q90", "http://wpd/P31", "http://we/Q1549591"),
+        ("http://we/Q90", "http://wpd/P31", "http://we/Q515"),
+        ("http://we/Q90", "http://wpd/P31", "http://we/Q90_type"),
+    ]
+    assert list(select_types(triplets)) == [
+        ("http://we/Q42", "http://we/Q5"),
+        ("http://we/Q76", "http://we/Q5"),
+        ("http://we/Q90", "http://we/Q515"),
+    ]
+    assert list(select_types(reversed(triplets))) == list(reversed(list(select_types(triplets))))
+    print("Success")
+
+
+if __name__ == "__main__":
+    test_type_index()
+    test_select_types()
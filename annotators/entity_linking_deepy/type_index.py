@@ -0,0 +1,137 @@
+"""Local index of Wikidata entity types, replaces the requests to wikidata.org in `type_requester`.
+
+The index is a sqlite table with one `instance of` (P31) type of an entity and the English label of the type.
+HDT keeps the triples sorted by their terms, not in the order of the claims, so the first P31 claim returned by
+wikidata.org API is unknown. The type with the smallest numeric id is taken instead, the order does not depend on the
+dump and the oldest ids are usually the most general types, e.g. human (Q5) rather than politician (Q82955).
+It is built at the start of the container from the HDT dump used by `wiki_parser`:
+```
+python type_index.py ~/.deeppavlov/downloads/wikidata_eng/entity_types.db --if-missing \
+    --hdt ~/.deeppavlov/downloads/wikidata/wikidata_lite.hdt \
+    --entities-list ~/.deeppavlov/downloads/wikidata_eng/entities_list.pickle
+```
+or from a json fixture `{"Q42": ["Q5", "human"], ...}`:
+```
+python type_index.py entity_types.db --fixture fixture.json
+```
+"""
+import argparse
+import itertools
+import json
+import os
+import pickle
+import sqlite3
+from logging import getLogger
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+log = getLogger(__name__)
+
+ENTITY_PREFIX = "http://we/"
+TYPE_RELATION = "http://wpd/P31"
+LABEL_RELATION = "http://wl"
+LANG = "@en"
+# sqlite limits the number of variables in one query by 999
+MAX_QUERY_VARIABLES = 900
+
+
+class TypeIndex:
+    def __init__(self, path: str):
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+
+    def get_type_labels(self, entity_ids: Iterable[str]) -> Dict[str, Optional[str]]:
+        """Labels of the types of the entities, all of them are found with one query per 900 entities."""
+        entity_ids = list(dict.fromkeys(entity_ids))
+        type_labels = {}
+        for start in range(0, len(entity_ids), MAX_QUERY_VARIABLES):
+            entity_ids_chunk = entity_ids[start : start + MAX_QUERY_VARIABLES]
+            rows = self.connection.execute(
+                f"SELECT id, type_label FROM types WHERE id IN ({', '.join('?' * len(entity_ids_chunk))})",
+                entity_ids_chunk,
+            ).fetchall()
+            type_labels.update(rows)
+        return type_labels
+
+
+def save_index(path: str, rows: Iterable[Tuple[str, str, str]], batch_size: int = 100000):
+    """Save (entity id, type id, type label) rows to the index, it replaces the old one only when it is complete."""
+    tmp_path = f"{path}.{os.getpid()}"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    connection = sqlite3.connect(tmp_path)
+    connection.execute("CREATE TABLE types (id TEXT PRIMARY KEY, type_id TEXT, type_label TEXT)")
+    batch = []
+    n_rows = 0
+    for row in rows:
+        batch.append(row)
+        if len(batch) == batch_size:
+            connection.executemany("INSERT OR IGNORE INTO types VALUES (?, ?, ?)", batch)
+            n_rows += len(batch)
+            batch = []
+            log.info(f"saved {n_rows} entity types")
+    connection.executemany("INSERT OR IGNORE INTO types VALUES (?, ?, ?)", batch)
+    connection.commit()
+    connection.close()
+    os.replace(tmp_path, path)
+
+
+def read_fixture(fixture_path: str) -> Iterator[Tuple[str, str, str]]:
+    with open(fixture_path) as fl:
+        for entity_id, (type_id, type_label) in json.load(fl).items():
+            yield entity_id, type_id, type_label
+
+
+def type_id_key(type_uri: str) -> Tuple[int, str]:
+    type_id = type_uri.split("/")[-1]
+    return (int(type_id[1:]), type_id) if type_id[1:].isdigit() else (float("inf"), type_id)
+
+
+def select_types(triplets: Iterable[Tuple[str, str, str]]) -> Iterator[Tuple[str, str]]:
+    """(entity, type) with the smallest type id of each entity, the triplets are grouped by entities as in HDT."""
+    for entity, entity_triplets in itertools.groupby(triplets, key=lambda triplet: triplet[0]):
+        yield entity, min((entity_type for _, _, entity_type in entity_triplets), key=type_id_key)
+
+
+def read_hdt(hdt_path: str, entities_list_path: Optional[str] = None) -> Iterator[Tuple[str, str, str]]:
+    """Types of the entities of the entity linker or of all the entities of the dump with their labels."""
+    from hdt import HDTDocument
+
+    document = HDTDocument(hdt_path)
+    if entities_list_path:
+        with open(entities_list_path, "rb") as fl:
+            entity_ids = pickle.load(fl)
+        triplets = (
+            triplet
+            for entity_id in entity_ids
+            for triplet in document.search_triples(f"{ENTITY_PREFIX}{entity_id}", TYPE_RELATION, "")[0]
+        )
+    else:
+        triplets = document.search_triples("", TYPE_RELATION, "")[0]
+
+    labels = {}
+    for entity, entity_type in select_types(triplets):
+        if entity_type not in labels:
+            labels[entity_type] = None
+            for _, _, label in document.search_triples(entity_type, LABEL_RELATION, "")[0]:
+                if label.endswith(LANG):
+                    labels[entity_type] = label[: -len(LANG)].strip('"')
+                    break
+        yield entity.split("/")[-1], entity_type.split("/")[-1], labels[entity_type]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the local index of Wikidata entity types")
+    parser.add_argument("save_path", help="index, e.g. ~/.deeppavlov/downloads/wikidata_eng/entity_types.db")
+    parser.add_argument("--hdt", help="wikidata HDT dump")
+    parser.add_argument("--entities-list", help="pickle with the list of entity ids to index, all entities if absent")
+    parser.add_argument("--fixture", help="json with types and labels by entity ids")
+    parser.add_argument("--if-missing", action="store_true", help="keep the index if it is already built")
+    args = parser.parse_args()
+    args.save_path = os.path.expanduser(args.save_path)
+    if args.if_missing and os.path.exists(args.save_path):
+        log.info(f"{args.save_path} is already built")
+        raise SystemExit
+    if args.fixture:
+        save_index(args.save_path, read_fixture(args.fixture))
+    else:
+        entities_list_path = args.entities_list and os.path.expanduser(args.entities_list)
+        save_index(args.save_path, read_hdt(os.path.expanduser(args.hdt), entities_list_path))
@@ -1,12 +1,16 @@
 import asyncio
+import os
 from typing import List, Optional
 from logging import getLogger
 
 import aiohttp
 
 from deeppavlov.core.common.registry import register
+from deeppavlov.core.commands.utils import expand_path
 from deeppavlov.core.models.component import Component
 
+from type_index import TypeIndex
+
 REQUEST_TIMEOUT = 5
 
 log = getLogger(__name__)
@@ -15,8 +19,12 @@ loop = asyncio.get_event_loop()
 
 @register("type_requester")
 class TypeRequester(Component):
-    def __init__(self, *args, **kwargs):
-        pass
+    def __init__(self, index_path: Optional[str] = None, *args, **kwargs):
+        self.index = None
+        if index_path and os.path.exists(expand_path(index_path)):
+            self.index = TypeIndex(str(expand_path(index_path)))
+        else:
+            log.warning(f"type index {index_path} is not found, types are requested from wikidata.org")
 
     async def request_wikidata(self, session, id: str, type_id: bool = False) -> Optional[str]:
         ans = None
@@ -50,5 +58,11 @@ class TypeRequester(Component):
             results = await asyncio.gather(*[self.process_group(session, entity_ids) for entity_ids in x[0]])
             return [results]
 
+    def local_call(self, x: List[List[List[str]]]) -> List[List[List[Optional[str]]]]:
+        type_labels = self.index.get_type_labels(id for entity_ids in x[0] for id in entity_ids)
+        return [[[type_labels.get(id) for id in entity_ids] for entity_ids in x[0]]]
+
     def __call__(self, x: List[List[List[str]]]) -> List[List[List[Optional[str]]]]:
+        if self.index is not None:
+            return self.local_call(x)
         return loop.run_until_complete(self.async_call(x))
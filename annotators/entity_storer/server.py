@@ -31,10 +31,10 @@ def handler(requested_data):
     for dialog, human_utter_index in zip(dialogs, human_utter_indexes):
         human_attr = dialog.get("human", {}).get("attributes", {})
         try:
-            entities = human_attr.get("entities", {})
-            entities = entity_utils.load_raw_entities(entities)
+            entities = entity_utils.load_raw_entities(entity_utils.get_raw_entities(human_attr))
             entities = entity_utils.update_entities(dialog, human_utter_index, entities)
-            human_attr = {"entities": {k: dict(v) for k, v in entities.items()}}
+            # only the entity slots changed on the turn are returned
+            human_attr = entity_utils.get_entity_slots_update(human_attr, entities)
         except Exception as exc:
             logger.exception(exc)
             sentry_sdk.capture_exception(exc)
@@ -0,0 +1,54 @@
+import random
+
+from common.entity_utils import ENTITY_MAX_NO, get_entity_slots, get_entity_slots_update, get_raw_entities
+
+RANDOM_SEED = 31415
+N_TURNS = 50
+
+
+def make_entity(name, human_utterance_index):
+    return {
+        "name": name,
+        "human_encounters": [],
+        "bot_encounters": [{"human_utterance_index": human_utterance_index, "full_name": name, "skill_name": "x"}],
+        "human_attitude": "like",
+        "bot_attitude": None,
+    }
+
+
+def test_entity_slots():
+    # the agent merges the human attributes of the entity storer response key by key
+    attributes = {"entities": {"apple": make_entity("apple", 0)}}
+    entities = {"apple": make_entity("apple", 0), "carrot": make_entity("carrot", 1)}
+    update = get_entity_slots_update(attributes, entities)
+    assert update == {"entity_slot_0": entities["apple"], "entity_slot_1": entities["carrot"], "entities": {}}
+    attributes.update(update)
+    assert get_raw_entities(attributes) == entities
+
+    # only the changed and the new entities are returned
+    entities = {"apple": make_entity("apple", 0), "carrot": make_entity("carrot", 2), "pear": make_entity("pear", 2)}
+    update = get_entity_slots_update(attributes, entities)
+    assert update == {"entity_slot_1": entities["carrot"], "entity_slot_2": entities["pear"]}
+    attributes.update(update)
+    assert get_raw_entities(attributes) == entities
+
+    # the slots of the removed entities are emptied or taken by the new ones
+    entities = {"pear": make_entity("pear", 2), "jewelry": make_entity("jewelry", 3)}
+    update = get_entity_slots_update(attributes, entities)
+    assert update == {"entity_slot_0": entities["jewelry"], "entity_slot_1": None}
+    attributes.update(update)
+    assert get_raw_entities(attributes) == entities
+    assert get_entity_slots_update(attributes, entities) == {}
+
+    random.seed(RANDOM_SEED)
+    for turn in range(N_TURNS):
+        names = random.sample([f"entity {i}" for i in range(3 * ENTITY_MAX_NO)], random.randint(0, ENTITY_MAX_NO))
+        entities = {name: make_entity(name, random.choice([turn, 0])) for name in names}
+        attributes.update(get_entity_slots_update(attributes, entities))
+        assert get_raw_entities(attributes) == entities
+        assert len(get_entity_slots(attributes)) <= ENTITY_MAX_NO
+    print("Success")
+
+
+if __name__ == "__main__":
+    test_entity_slots()
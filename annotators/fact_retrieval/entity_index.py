@@ -0,0 +1,36 @@
+import re
+from collections import defaultdict
+
+re_tokenizer = re.compile(r"[\w']+|[^\w ]")
+
+
+def build_entity_types_index(entity_types_sets):
+    """Invert `entity_types_sets`: entity id -> type substrings of all the sets with this id, in the sets order."""
+    entity_types_index = defaultdict(list)
+    for entity_types_substr, entity_ids in entity_types_sets.items():
+        for entity_id in entity_ids:
+            entity_types_index[entity_id].append(entity_types_substr)
+    return dict(entity_types_index)
+
+
+def build_wikihow_titles_index(subtopics):
+    """Token -> (position, page title) of the first wikihow page title with this token, titles are ordered
+    as they are listed in the subtopics.
+    """
+    wikihow_titles_index = {}
+    position = 0
+    for subtopic in subtopics:
+        for page_title in subtopics[subtopic]:
+            for token in set(page_title.lower().split("-")):
+                wikihow_titles_index.setdefault(token, (position, page_title))
+            position += 1
+    return wikihow_titles_index
+
+
+def find_wikihow_title(entity_substr, wikihow_titles_index):
+    """Find the first wikihow page title which shares a token with the entity substring."""
+    entity_tokens = set(re.findall(re_tokenizer, entity_substr))
+    found_titles = [wikihow_titles_index[token] for token in entity_tokens if token in wikihow_titles_index]
+    if found_titles:
+        return min(found_titles)[1]
+    return ""
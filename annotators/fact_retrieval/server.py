@@ -13,6 +13,7 @@ from sentry_sdk.integrations.flask import FlaskIntegration
 from deeppavlov import build_model
 
 from common.fact_retrieval import topic_titles, find_topic_titles
+from entity_index import build_entity_types_index, build_wikihow_titles_index, find_wikihow_title, re_tokenizer
 from common.wiki_skill import find_all_titles, find_paragraph, delete_hyperlinks, WIKI_BADLIST
 
 logging.basicConfig(format="%(asctime)s - %(name)s - %(levelname)s - %(message)s", level=logging.INFO)
@@ -28,7 +29,7 @@ CONFIG_WOW_PAGE_EXTRACTOR = os.getenv("CONFIG_WHOW")
 DATA_GOOGLE_10K_ENG_NO_SWEARS = "common/google-10000-english-no-swears.txt"
 DATA_SENTENCES = "data/sentences.pickle"
 
-re_tokenizer = re.compile(r"[\w']+|[^\w ]")
+WIKIHOW_TYPES = {"food", "fruit", "vegetable", "berry"}
 
 with open(DATA_GOOGLE_10K_ENG_NO_SWEARS, "r") as fl:
     lines = fl.readlines()
@@ -54,6 +55,10 @@ try:
 
     with open("/root/.deeppavlov/downloads/wikihow/wikihow_topics.json", "r") as fl:
         wikihow_topics = json.load(fl)
+
+    entity_types_index = build_entity_types_index(entity_types_sets)
+    wikihow_titles_index = build_wikihow_titles_index(wikihow_topics["Food and Entertaining"])
+    logger.info(f"entity types index for {len(entity_types_index)} entities is built")
 except Exception as e:
     sentry_sdk.capture_exception(e)
     logger.exception(e)
@@ -62,32 +67,32 @@ except Exception as e:
 app = Flask(__name__)
 
 
-def get_page_content(page_title):
-    page_content = {}
+def get_pages_content(page_titles):
+    pages_content = {}
     try:
-        if page_title:
-            page_content_batch, main_pages_batch = page_extractor([[page_title]])
-            if page_content_batch and page_content_batch[0]:
-                page_content = page_content_batch[0][0]
+        page_titles = [page_title for page_title in dict.fromkeys(page_titles) if page_title]
+        if page_titles:
+            page_content_batch, main_pages_batch = page_extractor([page_titles])
+            pages_content = dict(zip(page_titles, page_content_batch[0]))
     except Exception as e:
         sentry_sdk.capture_exception(e)
         logger.exception(e)
 
-    return page_content
+    return pages_content
 
 
-def get_wikihow_content(page_title):
-    page_content = {}
+def get_wikihow_contents(page_titles):
+    pages_content = {}
     try:
-        if page_title:
-            page_content_batch = whow_page_extractor([[page_title]])
-            if page_content_batch and page_content_batch[0]:
-                page_content = page_content_batch[0][0]
+        page_titles = [page_title for page_title in dict.fromkeys(page_titles) if page_title]
+        if page_titles:
+            page_content_batch = whow_page_extractor([page_titles])
+            pages_content = dict(zip(page_titles, page_content_batch[0]))
     except Exception as e:
         sentry_sdk.capture_exception(e)
         logger.exception(e)
 
-    return page_content
+    return pages_content
 
 
 def find_sentences(paragraphs):
@@ -107,62 +112,74 @@ def find_sentences(paragraphs):
 
 
 def find_facts(entity_substr_batch, entity_ids_batch, entity_pages_batch):
-    facts_batch = []
+    # (entity_substr, entity_types_substr, page_title) of wikihow and wikipedia pages for every sample,
+    # the pages of all the samples are fetched at once
+    entity_facts_batch = []
     for entity_substr_list, entity_ids_list, entity_pages_list in zip(
         entity_substr_batch, entity_ids_batch, entity_pages_batch
     ):
-        facts_list = []
+        entity_facts_list = []
         for entity_substr, entity_ids, entity_pages in zip(entity_substr_list, entity_ids_list, entity_pages_list):
             for entity_id, entity_page in zip(entity_ids, entity_pages):
-                for entity_types_substr in entity_types_sets:
-                    if entity_id in entity_types_sets[entity_types_substr]:
-                        logger.info(f"found_entity_types_substr {entity_types_substr}")
-                        if entity_types_substr in {"food", "fruit", "vegetable", "berry"}:
-                            found_page_title = ""
-                            entity_tokens = set(re.findall(re_tokenizer, entity_substr))
-                            food_subtopics = wikihow_topics["Food and Entertaining"]
-                            for subtopic in food_subtopics:
-                                page_titles = food_subtopics[subtopic]
-                                for page_title in page_titles:
-                                    page_title_tokens = set(page_title.lower().split("-"))
-                                    if entity_tokens.intersection(page_title_tokens):
-                                        found_page_title = page_title
-                                        break
-                                if found_page_title:
-                                    break
-                            if found_page_title:
-                                page_content = get_wikihow_content(found_page_title)
-                                if page_content:
-                                    page_title_clean = found_page_title.lower().replace("-", " ")
-                                    intro = page_content["intro"]
-                                    sentences = nltk.sent_tokenize(intro)
-                                    facts_list.append(
-                                        {
-                                            "entity_substr": entity_substr,
-                                            "entity_type": entity_types_substr,
-                                            "facts": [{"title": page_title_clean, "sentences": sentences}],
-                                        }
-                                    )
-                        else:
-                            facts = []
-                            page_content = get_page_content(entity_page)
-                            all_titles = find_all_titles([], page_content)
-                            if entity_types_substr in topic_titles:
-                                cur_topic_titles = topic_titles[entity_types_substr]
-                                page_titles = find_topic_titles(all_titles, cur_topic_titles)
-                                for title, page_title in page_titles:
-                                    paragraphs = find_paragraph(page_content, page_title)
-                                    sentences_list = find_sentences(paragraphs)
-                                    if sentences_list:
-                                        facts.append({"title": title, "sentences": sentences_list})
-                                if facts:
-                                    facts_list.append(
-                                        {
-                                            "entity_substr": entity_substr,
-                                            "entity_type": entity_types_substr,
-                                            "facts": facts,
-                                        }
-                                    )
+                for entity_types_substr in entity_types_index.get(entity_id, []):
+                    logger.info(f"found_entity_types_substr {entity_types_substr}")
+                    if entity_types_substr in WIKIHOW_TYPES:
+                        found_page_title = find_wikihow_title(entity_substr, wikihow_titles_index)
+                        if found_page_title:
+                            entity_facts_list.append((entity_substr, entity_types_substr, found_page_title))
+                    else:
+                        entity_facts_list.append((entity_substr, entity_types_substr, entity_page))
+        entity_facts_batch.append(entity_facts_list)
+
+    all_entity_facts = sum(entity_facts_batch, [])
+    wikihow_contents = get_wikihow_contents(
+        [page_title for _, entity_types_substr, page_title in all_entity_facts if entity_types_substr in WIKIHOW_TYPES]
+    )
+    pages_content = get_pages_content(
+        [
+            page_title
+            for _, entity_types_substr, page_title in all_entity_facts
+            if entity_types_substr not in WIKIHOW_TYPES
+        ]
+    )
+
+    facts_batch = []
+    for entity_facts_list in entity_facts_batch:
+        facts_list = []
+        for entity_substr, entity_types_substr, page_title in entity_facts_list:
+            if entity_types_substr in WIKIHOW_TYPES:
+                page_content = wikihow_contents.get(page_title, {})
+                if page_content:
+                    page_title_clean = page_title.lower().replace("-", " ")
+                    intro = page_content["intro"]
+                    sentences = nltk.sent_tokenize(intro)
+                    facts_list.append(
+                        {
+                            "entity_substr": entity_substr,
+                            "entity_type": entity_types_substr,
+                            "facts": [{"title": page_title_clean, "sentences": sentences}],
+                        }
+                    )
+            else:
+                facts = []
+                page_content = pages_content.get(page_title, {})
+                all_titles = find_all_titles([], page_content)
+                if entity_types_substr in topic_titles:
+                    cur_topic_titles = topic_titles[entity_types_substr]
+                    page_titles = find_topic_titles(all_titles, cur_topic_titles)
+                    for title, topic_page_title in page_titles:
+                        paragraphs = find_paragraph(page_content, topic_page_title)
+                        sentences_list = find_sentences(paragraphs)
+                        if sentences_list:
+                            facts.append({"title": title, "sentences": sentences_list})
+                    if facts:
+                        facts_list.append(
+                            {
+                                "entity_substr": entity_substr,
+                                "entity_type": entity_types_substr,
+                                "facts": facts,
+                            }
+                        )
         facts_batch.append(facts_list)
     return facts_batch
 
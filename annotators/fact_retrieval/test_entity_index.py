@@ -0,0 +1,65 @@
+import json
+import pickle
+import random
+import re
+
+import common.test_utils as test_utils
+from entity_index import build_entity_types_index, build_wikihow_titles_index, find_wikihow_title, re_tokenizer
+
+ENTITY_TYPES_SETS_PATH = "/root/.deeppavlov/downloads/wikidata/entity_types_sets.pickle"
+WIKIHOW_TOPICS_PATH = "/root/.deeppavlov/downloads/wikihow/wikihow_topics.json"
+RANDOM_SEED = 2718
+N_ENTITY_IDS = 10000
+
+
+def find_entity_types(entity_id, entity_types_sets):
+    # reference implementation: scan of all the type sets
+    return [
+        entity_types_substr
+        for entity_types_substr in entity_types_sets
+        if entity_id in entity_types_sets[entity_types_substr]
+    ]
+
+
+def find_wikihow_title_by_scan(entity_substr, food_subtopics):
+    # reference implementation: scan of all the page titles
+    entity_tokens = set(re.findall(re_tokenizer, entity_substr))
+    for subtopic in food_subtopics:
+        for page_title in food_subtopics[subtopic]:
+            if entity_tokens.intersection(set(page_title.lower().split("-"))):
+                return page_title
+    return ""
+
+
+def test_entity_index():
+    with open(ENTITY_TYPES_SETS_PATH, "rb") as fl:
+        entity_types_sets = pickle.load(fl)
+    with open(WIKIHOW_TOPICS_PATH, "r") as fl:
+        food_subtopics = json.load(fl)["Food and Entertaining"]
+
+    entity_types_index = build_entity_types_index(entity_types_sets)
+    all_entity_ids = sorted(set().union(*entity_types_sets.values()))
+    entity_ids = random.Random(RANDOM_SEED).sample(all_entity_ids, min(N_ENTITY_IDS, len(all_entity_ids)))
+    for entity_id in entity_ids + ["not_an_entity_id"]:
+        entity_types = entity_types_index.get(entity_id, [])
+        assert entity_types == find_entity_types(entity_id, entity_types_sets), f"entity id: {entity_id}"
+
+    # entity substrings of the recorded requests and the wikihow page title tokens
+    wikihow_titles_index = build_wikihow_titles_index(food_subtopics)
+    in_data, _ = test_utils.get_dataset()
+    entity_substrs = [
+        nounphrase
+        for requests_data in in_data.values()
+        for request_data in requests_data
+        for nounphrases in request_data.get("nounphrases", [])
+        for nounphrase in nounphrases
+    ]
+    entity_substrs += list(wikihow_titles_index) + ["apple pie", "green tea", "the capital"]
+    for entity_substr in entity_substrs:
+        found_title = find_wikihow_title(entity_substr, wikihow_titles_index)
+        assert found_title == find_wikihow_title_by_scan(entity_substr, food_subtopics), f"substr: {entity_substr}"
+    print("Success")
+
+
+if __name__ == "__main__":
+    test_entity_index()
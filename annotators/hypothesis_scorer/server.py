@@ -15,6 +15,8 @@ logging.getLogger("werkzeug").setLevel("WARNING")
 
 app = Flask(__name__)
 
+WARMUP_TIMEOUT = float(os.getenv("WARMUP_TIMEOUT", 300))
+
 
 def get_probas(contexts, hypotheses):
     features = get_features(contexts, hypotheses)
@@ -22,39 +24,59 @@ def get_probas(contexts, hypotheses):
     return pred
 
 
+def warm_up(contexts, hypotheses):
+    """Score the example, sentence encoder may be still loading, so the request is retried with a backoff."""
+    deadline = time.time() + WARMUP_TIMEOUT
+    delay = 1
+    while True:
+        try:
+            get_probas(contexts, hypotheses)
+            logger.info("Scorer is warmed up")
+            return
+        except Exception as e:
+            if time.time() + delay > deadline:
+                logger.warning(f"Scorer is not warmed up, sentence encoder is not available: {e}")
+                sentry_sdk.capture_exception(e)
+                return
+            logger.info(f"Sentence encoder is not available, retry in {delay}s")
+            time.sleep(delay)
+            delay = min(2 * delay, 30)
+
+
 try:
     cb = CatBoostClassifier()
     cb.load_model("model-confidence-convert-old_midas.cbm")
-    contexts = [
-        [
-            "i'm good how are you",
-            "Spectacular, by all reports! Do you want to know what I can do?",
-            "absolutely",
-            "I'm a socialbot, and I'm all about chatting with people like you. "
-            "I can answer questions, share fun facts, discuss movies, books and news. What do you want to talk about?",
-            "let's talk about movies",
-        ]
-    ]
-    hypotheses = [
-        {
-            "is_best": True,
-            "text": "Kong: Skull Island is a good action movie. What do you think about it?",
-            "confidence": 1.0,
-            "convers_evaluator_annotator": {
-                "isResponseOnTopic": 0.505,
-                "isResponseErroneous": 0.938,
-                "responseEngagesUser": 0.344,
-                "isResponseInteresting": 0.084,
-                "isResponseComprehensible": 0.454,
-            },
-        }
-    ]
-    get_probas(contexts, hypotheses)
 except Exception as e:
     logger.exception("Scorer not loaded")
     sentry_sdk.capture_exception(e)
     raise e
 
+contexts = [
+    [
+        "i'm good how are you",
+        "Spectacular, by all reports! Do you want to know what I can do?",
+        "absolutely",
+        "I'm a socialbot, and I'm all about chatting with people like you. "
+        "I can answer questions, share fun facts, discuss movies, books and news. What do you want to talk about?",
+        "let's talk about movies",
+    ]
+]
+hypotheses = [
+    {
+        "is_best": True,
+        "text": "Kong: Skull Island is a good action movie. What do you think about it?",
+        "confidence": 1.0,
+        "convers_evaluator_annotator": {
+            "isResponseOnTopic": 0.505,
+            "isResponseErroneous": 0.938,
+            "responseEngagesUser": 0.344,
+            "isResponseInteresting": 0.084,
+            "isResponseComprehensible": 0.454,
+        },
+    }
+]
+warm_up(contexts, hypotheses)
+
 
 @app.route("/batch_model", methods=["POST"])
 def batch_respond():
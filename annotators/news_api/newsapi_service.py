@@ -2,15 +2,20 @@ import logging
 import os
 import requests
 import re
-from collections import deque
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
-from datetime import datetime
 from os import getenv
 
 import sentry_sdk
+from requests.adapters import HTTPAdapter
 from nltk.sentiment.vader import SentimentIntensityAnalyzer
 from nltk.tokenize import sent_tokenize
 
+from common.metrics import CACHE_REQUEST_COUNT, CACHE_REFRESH_LATENCY
+
 sentry_sdk.init(getenv("SENTRY_DSN"))
 logging.basicConfig(format="%(asctime)s - %(name)s - %(levelname)s - %(message)s", level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -45,11 +50,25 @@ class CachedRequestsAPI:
         "https://gnews.io/api/v4/top-headlines?country=us&lang=en&expand=content&max=20&sortby=publishedAt&token="
     )
 
-    def __init__(self, renew_freq_time):
+    def __init__(self, renew_freq_time, max_workers=5, n_prewarmed_topics=10, refresh_ahead=0.9, retry_freq_time=60):
         self.renew_freq_time = renew_freq_time
-        self.first_renew_time = datetime.now()
+        # topics without any news fetched at the last renew are retried after `retry_freq_time`
+        self.retry_freq_time = retry_freq_time
+        # topics are refreshed in background when `refresh_ahead` part of `renew_freq_time` has passed
+        self.refresh_ahead = refresh_ahead
+        self.n_prewarmed_topics = n_prewarmed_topics
         self.prev_renew_times = {}
+        self.failed_renew_times = {}
         self.cached = {}
+        self.topic_counts = Counter()
+        self.refreshing_topics = set()
+        self.lock = threading.Lock()
+        self.refresh_executor = ThreadPoolExecutor(max_workers=max_workers)
+        # one session for all requests to reuse connections to gnews and badlisted words annotator
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         self._api_keys = self._collect_api_keys()
         logger.info(
             f"CachedRequestAPI initialized with renew_freq_time: {renew_freq_time} s;" f"api keys: {self._api_keys}"
@@ -78,7 +97,7 @@ class CachedRequestsAPI:
         for ind, api_key in enumerate(self._api_keys):
             try:
                 request_address = self._construct_address(topic, api_key, return_list_of_news)
-                resp = requests.get(url=request_address, timeout=1.5)
+                resp = self.session.get(url=request_address, timeout=1.5)
             except Exception as e:
                 sentry_sdk.capture_exception(e)
                 logger.exception(e)
@@ -125,19 +144,26 @@ class CachedRequestsAPI:
         """
         prev_news_urls = [] if prev_news_urls is None else prev_news_urls
         topic = topic.lower() if len(topic) > 0 else "all"
-        curr_time = datetime.now()
 
         if return_list_of_news:
             top_news = self.get_new_topic_news(topic, return_list_of_news)
         else:
-            if (
-                len(self.cached.get(topic, [])) == 0
-                or (curr_time - self.prev_renew_times.get(topic, self.first_renew_time)).seconds > self.renew_freq_time
-            ):
-                self.cached[topic] = self.get_new_topic_news(topic, return_list_of_news) + self.cached.get(topic, [])
-                self.prev_renew_times[topic] = curr_time
+            with self.lock:
+                self.topic_counts[topic] += 1
+                prev_renew_time = self.prev_renew_times.get(topic)
+            if prev_renew_time is None:
+                # cold topic, nothing to return until the news are fetched in background
+                CACHE_REQUEST_COUNT.labels("news_api", "miss").inc()
+                self.schedule_renew(topic)
+            elif time.time() - prev_renew_time > self.renew_freq_time:
+                # stale-while-revalidate: return cached news, renew them in background
+                CACHE_REQUEST_COUNT.labels("news_api", "stale").inc()
+                self.schedule_renew(topic)
+            else:
+                CACHE_REQUEST_COUNT.labels("news_api", "hit").inc()
 
-            top_news = deepcopy(self.cached.get(topic, []))
+            with self.lock:
+                top_news = deepcopy(self.cached.get(topic, []))
 
         if len(prev_news_urls) > 0 and status == "headline":
             # some prev discussed news detected
@@ -148,8 +174,58 @@ class CachedRequestsAPI:
         else:
             return []
 
-    @staticmethod
-    def get_not_badlisted_english_news(articles):
+    def renew_topic(self, topic):
+        st_time = time.time()
+        try:
+            news = self.get_new_topic_news(topic, return_list_of_news=False)
+            with self.lock:
+                if news:
+                    self.cached[topic] = news + self.cached.get(topic, [])
+                    self.prev_renew_times[topic] = time.time()
+                    self.failed_renew_times.pop(topic, None)
+                else:
+                    self.failed_renew_times[topic] = time.time()
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+            logger.exception(e)
+            with self.lock:
+                self.failed_renew_times[topic] = time.time()
+        finally:
+            with self.lock:
+                self.refreshing_topics.discard(topic)
+        CACHE_REFRESH_LATENCY.labels("news_api").observe(time.time() - st_time)
+
+    def schedule_renew(self, topic):
+        with self.lock:
+            if topic in self.refreshing_topics:
+                return
+            if time.time() - self.failed_renew_times.get(topic, 0) < self.retry_freq_time:
+                return
+            self.refreshing_topics.add(topic)
+        self.refresh_executor.submit(self.renew_topic, topic)
+
+    def prewarm(self, topics=("all",)):
+        """Renew the given and the most requested topics which are about to expire."""
+        with self.lock:
+            top_topics = [topic for topic, _ in self.topic_counts.most_common(self.n_prewarmed_topics)]
+            prev_renew_times = dict(self.prev_renew_times)
+        for topic in dict.fromkeys(list(topics) + top_topics):
+            if time.time() - prev_renew_times.get(topic, 0) > self.renew_freq_time * self.refresh_ahead:
+                self.schedule_renew(topic)
+
+    def start_refresher(self, topics=("all",), period=60):
+        def refresh():
+            while True:
+                try:
+                    self.prewarm(topics)
+                except Exception as e:
+                    sentry_sdk.capture_exception(e)
+                    logger.exception(e)
+                time.sleep(period)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def get_not_badlisted_english_news(self, articles):
         articles_to_check = []
         for article in articles:
             title = article.get("title", "") or ""
@@ -174,7 +250,7 @@ class CachedRequestsAPI:
             articles_to_check += [f"{title} {description}"]
 
         try:
-            resp = requests.request(
+            resp = self.session.request(
                 url=BADLIST_ANNOTATOR_URL, json={"sentences": articles_to_check}, method="POST", timeout=0.5
             )
         except (requests.ConnectTimeout, requests.ReadTimeout) as e:
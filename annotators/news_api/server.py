@@ -25,7 +25,15 @@ setup_metrics(app)
 N_FACTS_TO_CHOSE = 3
 ASYNC_SIZE = int(os.environ.get("ASYNC_SIZE", 5))
 
-NEWS_API_REQUESTOR = CachedRequestsAPI(renew_freq_time=7200)  # time in seconds
+N_PREWARMED_TOPICS = int(os.environ.get("N_PREWARMED_TOPICS", 10))
+
+NEWS_API_REQUESTOR = CachedRequestsAPI(
+    renew_freq_time=7200,  # time in seconds
+    max_workers=ASYNC_SIZE,
+    n_prewarmed_topics=N_PREWARMED_TOPICS,
+)
+NEWS_API_REQUESTOR.start_refresher(topics=["all"])
+EXECUTOR = ThreadPoolExecutor(max_workers=ASYNC_SIZE)
 
 ARTICLES_PATTERN = re.compile(r"\b(a|an|the)\b", re.IGNORECASE)
 EVERYTHING_EXCEPT_LETTERS_DIGITALS_AND_SPACE = re.compile(r"[^a-zA-Z0-9 ]")
@@ -94,9 +102,8 @@ def respond():
 
         # run asynchronous news requests
         results = []
-        executor = ThreadPoolExecutor(max_workers=ASYNC_SIZE)
         for i, result in enumerate(
-            executor.map(NEWS_API_REQUESTOR.send, topics, statuses, prev_news_samples_urls, return_info_list)
+            EXECUTOR.map(NEWS_API_REQUESTOR.send, topics, statuses, prev_news_samples_urls, return_info_list)
         ):
             # result is a list of articles. the first one is top rated news.
             # curr_topic = topics[i]
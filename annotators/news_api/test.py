@@ -1,7 +1,16 @@
+import time
+
 from common.news import get_news_about_topic
 
 NEWS_API_ANNOTATOR_URL = "http://0.0.0.0:8112/respond"
-result = get_news_about_topic("example", NEWS_API_ANNOTATOR_URL)
+N_ATTEMPTS = 10
+
+# news about a new topic are fetched in background after the first request
+for _ in range(N_ATTEMPTS):
+    result = get_news_about_topic("example", NEWS_API_ANNOTATOR_URL)
+    if result and result.get("title"):
+        break
+    time.sleep(1)
 
 assert result["title"] and len(result["title"]) > 0, print(result)
 
@@ -0,0 +1,68 @@
+import logging
+import time
+from os import getenv
+
+import sentry_sdk
+import spacy
+from flask import Flask, request, jsonify
+
+
+sentry_sdk.init(getenv("SENTRY_DSN"))
+
+logging.basicConfig(format="%(asctime)s - %(name)s - %(levelname)s - %(message)s", level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SPACY_BATCH_SIZE = int(getenv("SPACY_BATCH_SIZE", 64))
+nlp = spacy.load("en_core_web_sm", exclude=["ner"])
+
+app = Flask(__name__)
+
+logger.info("spacy_annotator is ready")
+
+
+def get_doc_annotations(doc):
+    """Token attributes, noun chunks and sentences of the parsed utterance.
+
+    Attributes are lists aligned with `tokens`, `heads` are token indices,
+    `noun_chunks` and `sentences` are [start, end) token spans.
+    """
+    return {
+        "tokens": [token.text for token in doc],
+        "spaces": [bool(token.whitespace_) for token in doc],
+        "lemmas": [token.lemma_ for token in doc],
+        "pos": [token.pos_ for token in doc],
+        "tags": [token.tag_ for token in doc],
+        "deps": [token.dep_ for token in doc],
+        "heads": [token.head.i for token in doc],
+        "noun_chunks": [[chunk.start, chunk.end] for chunk in doc.noun_chunks],
+        "sentences": [[sent.start, sent.end] for sent in doc.sents],
+    }
+
+
+def get_result(request):
+    st_time = time.time()
+    sentences = request.json["sentences"]
+    logger.debug(f"Input sentences: {sentences}")
+
+    docs = nlp.pipe([sentence or "" for sentence in sentences], batch_size=SPACY_BATCH_SIZE)
+    result = [get_doc_annotations(doc) for doc in docs]
+
+    total_time = time.time() - st_time
+    logger.info(f"spacy_annotator exec time: {total_time:.3f}s")
+    return result
+
+
+@app.route("/respond", methods=["POST"])
+def respond():
+    result = get_result(request)
+    return jsonify(result)
+
+
+@app.route("/respond_batch", methods=["POST"])
+def respond_batch():
+    result = get_result(request)
+    return jsonify([{"batch": result}])
+
+
+if __name__ == "__main__":
+    app.run(debug=False, host="0.0.0.0", port=3000)
@@ -0,0 +1,22 @@
+import requests
+
+
+def main():
+    url = "http://0.0.0.0:8125/respond"
+    input_data = {"sentences": ["hey this is a white bear. i like it!", ""]}
+    result = requests.post(url, json=input_data).json()
+
+    annotations = result[0]
+    assert annotations["tokens"] == ["hey", "this", "is", "a", "white", "bear", ".", "i", "like", "it", "!"], result
+    for key in ["spaces", "lemmas", "pos", "tags", "deps", "heads"]:
+        assert len(annotations[key]) == len(annotations["tokens"]), key
+    assert annotations["lemmas"][2] == "be" and annotations["pos"][5] == "NOUN", annotations
+    noun_chunks = [" ".join(annotations["tokens"][start:end]) for start, end in annotations["noun_chunks"]]
+    assert "a white bear" in noun_chunks, noun_chunks
+    assert annotations["sentences"] == [[0, 7], [7, 11]], annotations["sentences"]
+    assert result[1]["tokens"] == [] and result[1]["sentences"] == []
+    print("Success!")
+
+
+if __name__ == "__main__":
+    main()
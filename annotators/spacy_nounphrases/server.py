@@ -9,9 +9,16 @@ from flask import Flask, request, jsonify
 
 from common.ignore_lists import FALSE_POS_NPS_LIST
 
+SPACY_BATCH_SIZE = int(getenv("SPACY_BATCH_SIZE", 64))
+# components needed for noun chunks, dependencies and tags, the others (ner, lemmatizer) are removed
+NOUN_CHUNKS_PIPES = {"tok2vec", "tagger", "attribute_ruler", "parser"}
+
 #  import spacy - not worked
 #  nlp = spacy.load("en_core_web_sm") - not worked
 nlp = en_core_web_sm.load()
+for pipe_name in nlp.pipe_names:
+    if pipe_name not in NOUN_CHUNKS_PIPES:
+        nlp.remove_pipe(pipe_name)
 
 sentry_sdk.init(getenv("SENTRY_DSN"))
 
@@ -27,34 +34,38 @@ words_ignore_in_np = re.compile(r"(which|what)", re.IGNORECASE)
 FALSE_POS_NPS_LIST = set(FALSE_POS_NPS_LIST)
 
 
-def noun_phrase_extraction(input_text):
-    if input_text:
-        input_text = input_text.lower()
-        doc = nlp(input_text)
-        noun_chunks = [str(nounph) for nounph in doc.noun_chunks if str(nounph) not in FALSE_POS_NPS_LIST]
+def noun_phrase_extraction_batch(input_texts):
+    """Noun phrases of the texts, all non-empty texts are processed by spaCy at once."""
+    texts_nums = [n for n, input_text in enumerate(input_texts) if input_text]
+    docs = nlp.pipe([input_texts[n].lower() for n in texts_nums], batch_size=SPACY_BATCH_SIZE)
+    noun_phrases_batch = [[] for _ in input_texts]
+    for n, doc in zip(texts_nums, docs):
+        noun_phrases_batch[n] = noun_phrase_extraction(doc)
+    return noun_phrases_batch
+
+
+def noun_phrase_extraction(doc):
+    noun_chunks = [str(nounph) for nounph in doc.noun_chunks if str(nounph) not in FALSE_POS_NPS_LIST]
 
-        # based on dependency parsing these should be the most likely topics
-        augmented_noun_chunks = []
+    # based on dependency parsing these should be the most likely topics
+    augmented_noun_chunks = []
 
-        subjects = [
-            token for token in doc if any([t in token.dep_ for t in ["obj", "subj", "comp"]]) and not token.is_stop
-        ]
-        subjects = [str(subject) for subject in subjects]
+    subjects = [token for token in doc if any([t in token.dep_ for t in ["obj", "subj", "comp"]]) and not token.is_stop]
+    subjects = [str(subject) for subject in subjects]
 
-        augmented_noun_chunks = [nounph for subject in subjects for nounph in noun_chunks if subject in nounph.split()]
-        augmented_noun_chunks = list(set(augmented_noun_chunks))
+    augmented_noun_chunks = [nounph for subject in subjects for nounph in noun_chunks if subject in nounph.split()]
+    augmented_noun_chunks = list(set(augmented_noun_chunks))
 
-        if not augmented_noun_chunks:
-            # if only one word is VBG, add it to the list
-            vbg = [token for token in doc if ("VBG" == token.tag_)]
-            if len(vbg) == 1:
-                noun_chunks.extend([vbg[0].text])
-            return noun_chunks
+    if not augmented_noun_chunks:
+        # if only one word is VBG, add it to the list
+        vbg = [token for token in doc if ("VBG" == token.tag_)]
+        if len(vbg) == 1:
+            noun_chunks.extend([vbg[0].text])
+        return noun_chunks
 
-        augmented_noun_chunks = [re.sub(words_ignore_in_np, "", nounph).strip() for nounph in augmented_noun_chunks]
+    augmented_noun_chunks = [re.sub(words_ignore_in_np, "", nounph).strip() for nounph in augmented_noun_chunks]
 
-        return augmented_noun_chunks
-    return []
+    return augmented_noun_chunks
 
 
 symbols_for_nounphrases = re.compile(r"[^0-9a-zA-Z \-]+")
@@ -66,7 +77,7 @@ def get_result(request):
     sentences = request.json["sentences"]
     logger.debug(f"Input sentences: {sentences}")
 
-    nounphrases_batch = [noun_phrase_extraction(sentence) for sentence in sentences]
+    nounphrases_batch = noun_phrase_extraction_batch(sentences)
     nounphrases_batch = [
         [re.sub(symbols_for_nounphrases, "", nounph).strip() for nounph in nounphrases]
         for nounphrases in nounphrases_batch
@@ -1,3 +1,4 @@
 #!/bin/bash
 
 python test.py
+python test_throughput.py
@@ -0,0 +1,46 @@
+import time
+
+import en_core_web_sm
+
+import server
+
+UTTERANCES = [
+    "i like michal jordan",
+    "hey this is a white bear",
+    "what is your favorite movie?",
+    "i watched the new batman movie with my friends yesterday",
+    "my dog likes playing in the garden",
+    "can you tell me something about the history of rome?",
+    "i am reading a book about artificial intelligence",
+    "let's talk about video games",
+] * 8
+N_RUNS = 5
+
+
+def loop_extraction(nlp, sentences):
+    """The previous implementation: the full pipeline is called for every sentence."""
+    docs = [nlp(sentence.lower()) if sentence else None for sentence in sentences]
+    return [server.noun_phrase_extraction(doc) if doc is not None else [] for doc in docs]
+
+
+def test_throughput():
+    full_nlp = en_core_web_sm.load()
+    assert len(UTTERANCES) == 64
+
+    start = time.perf_counter()
+    for _ in range(N_RUNS):
+        loop_result = loop_extraction(full_nlp, UTTERANCES)
+    loop_time = (time.perf_counter() - start) / N_RUNS
+    start = time.perf_counter()
+    for _ in range(N_RUNS):
+        pipe_result = server.noun_phrase_extraction_batch(UTTERANCES)
+    pipe_time = (time.perf_counter() - start) / N_RUNS
+
+    assert [sorted(nps) for nps in pipe_result] == [sorted(nps) for nps in loop_result]
+    print(f"64 utterances: loop {loop_time * 1000:.1f}ms, nlp.pipe {pipe_time * 1000:.1f}ms")
+    assert pipe_time < loop_time
+    print("Success!")
+
+
+if __name__ == "__main__":
+    test_throughput()
@@ -5,12 +5,11 @@ from os import getenv
 
 import sentry_sdk
 
-sentry_sdk.init(getenv("SENTRY_DSN"))
 logger = logging.getLogger(__name__)
 
+# urls are checked on the first request, so that the module can be imported by services which do not use them
 WIKIDATA_URL = getenv("WIKIDATA_URL")
 ENTITY_LINKING_URL = getenv("ENTITY_LINKING_URL")
-assert WIKIDATA_URL and ENTITY_LINKING_URL
 
 
 def request_entities_entitylinking(entity, types, return_raw=False, confidence_threshold=0.6):
@@ -27,6 +26,7 @@ def request_entities_entitylinking(entity, types, return_raw=False, confidence_t
     """
     logger.debug(f"Calling request_entities for {entity} {types}")
     try:
+        assert ENTITY_LINKING_URL, "ENTITY_LINKING_URL is not set"
         assert isinstance(entity, str)
         t = time.time()
         response = requests.post(
@@ -68,6 +68,7 @@ def request_triples_wikidata(parser_info, queries, query_dict=None):
     query_dict = {} if query_dict is None else query_dict
     responses = []
     try:
+        assert WIKIDATA_URL, "WIKIDATA_URL is not set"
         t = time.time()
         for query in queries:
             curr_response = ""
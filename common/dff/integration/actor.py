@@ -2,18 +2,22 @@
 
 import logging
 import os
-import json
 
-import sentry_sdk
 from sentry_sdk.integrations.logging import ignore_logger
 
 from common.constants import CAN_NOT_CONTINUE, CAN_CONTINUE_SCENARIO
+from common.dff.integration.serializer import (
+    decode_context,
+    drop_unchanged_attributes,
+    encode_context,
+    observe_state_size,
+    snapshot_attributes,
+)
 
 from df_engine.core import Context, Actor
 
 ignore_logger("root")
 
-sentry_sdk.init(os.getenv("SENTRY_DSN"))
 SERVICE_NAME = os.getenv("SERVICE_NAME")
 
 logger = logging.getLogger(__name__)
@@ -100,7 +104,8 @@ def get_ctx(
         "disliked_skills": disliked_skills,
         "clarification_request_flag": clarification_request_flag,
     }
-    ctx = Context.cast(context)
+    agent["attributes_snapshot"] = snapshot_attributes(agent)
+    ctx = decode_context(context)
     ctx.misc["agent"] = agent
     ctx.add_request(dialog["human_utterances"][-1]["text"])
     return ctx
@@ -116,6 +121,7 @@ def get_response(ctx: Context, actor: Actor, *args, **kwargs):
     disliked_skills = agent["disliked_skills"]
     current_turn_dff_suspended = agent["current_turn_dff_suspended"]
     response_parts = agent.get("response_parts", [])
+    attributes_snapshot = agent.get("attributes_snapshot", {})
     history[str(human_utter_index)] = list(ctx.labels.values())[-1]
     state = {
         "shared_memory": agent["shared_memory"],
@@ -128,7 +134,8 @@ def get_response(ctx: Context, actor: Actor, *args, **kwargs):
     can_continue = ctx.misc["agent"]["response"].get("can_continue", can_continue)
     ctx.clear(2, ["requests", "responses", "labels"])
     del ctx.misc["agent"]
-    state["context"] = json.loads(ctx.json())
+    state["context"] = encode_context(ctx)
+    observe_state_size(state)
 
     human_attr = {
         f"{SERVICE_NAME}_state": state,
@@ -137,6 +144,7 @@ def get_response(ctx: Context, actor: Actor, *args, **kwargs):
         "age_group": age_group,
         "disliked_skills": disliked_skills,
     }
+    human_attr = drop_unchanged_attributes(human_attr, attributes_snapshot)
     hype_attr = {"can_continue": can_continue}
     if response_parts:
         hype_attr["response_parts"] = response_parts
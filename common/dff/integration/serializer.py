@@ -0,0 +1,103 @@
+import base64
+import json
+import logging
+import os
+import zlib
+
+from df_engine.core import Context
+
+try:
+    from prometheus_client import Counter, Histogram
+except ImportError:
+    Counter = Histogram = None
+
+logger = logging.getLogger(__name__)
+SERVICE_NAME = os.getenv("SERVICE_NAME")
+
+# version of the compact context format, it is stored in every encoded context
+STATE_CODEC_VERSION = 1
+# encoded contexts which are longer than this number of bytes are zlib-compressed, 0 disables compression
+DFF_STATE_COMPRESSION_MIN_SIZE = int(os.getenv("DFF_STATE_COMPRESSION_MIN_SIZE", 0))
+# skill states which are longer than this number of bytes are reported as budget overflows
+DFF_STATE_SIZE_BUDGET = int(os.getenv("DFF_STATE_SIZE_BUDGET", 8192))
+# context fields which are stored, the others are restored with their defaults
+CONTEXT_FIELDS = {"labels", "requests", "responses", "misc"}
+# human attributes which are returned by a skill only if the skill has changed them
+SHARED_ATTRIBUTES = ["dff_shared_state", "used_links", "age_group", "disliked_skills"]
+
+if Histogram is not None:
+    STATE_SIZE = Histogram(
+        "dff_state_size_bytes",
+        "Size of the serialized DFF skill state",
+        ["service"],
+        buckets=(256, 512, 1024, 2048, 4096, 8192, 16384, 32768, 65536),
+    )
+    STATE_BUDGET_OVERFLOW = Counter(
+        "dff_state_budget_overflow_count",
+        "Number of DFF skill states exceeding DFF_STATE_SIZE_BUDGET",
+        ["service"],
+    )
+
+
+def dumps(data) -> str:
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+def encode_context(ctx: Context) -> dict:
+    """Encode df_engine context into the compact versioned dict.
+
+    Only the fields which scenarios read on the next turn are kept: `labels`, `requests`, `responses`, `misc`.
+    They are encoded by pydantic, so any value `Context.json()` accepts in `misc` is accepted here too.
+    `id`, `validation` and `actor_state` are restored with their defaults by `decode_context`.
+    """
+    data = json.loads(ctx.json(include=CONTEXT_FIELDS))
+    if DFF_STATE_COMPRESSION_MIN_SIZE:
+        raw_data = dumps(data).encode("utf-8")
+        if len(raw_data) > DFF_STATE_COMPRESSION_MIN_SIZE:
+            data = {"zlib": base64.b64encode(zlib.compress(raw_data)).decode("ascii")}
+    data["v"] = STATE_CODEC_VERSION
+    return data
+
+
+def decode_context(data: dict) -> Context:
+    """Decode the context made by `encode_context`, full `Context.json()` dumps of old states are accepted too."""
+    if not data:
+        return Context()
+    version = data.get("v")
+    if version is None:
+        return Context.cast(data)
+    if version != STATE_CODEC_VERSION:
+        logger.warning(f"Unknown dff state version {version}, context is dropped")
+        return Context()
+    if "zlib" in data:
+        data = json.loads(zlib.decompress(base64.b64decode(data["zlib"])).decode("utf-8"))
+    return Context.cast({key: value for key, value in data.items() if key in CONTEXT_FIELDS})
+
+
+def snapshot_attributes(attributes: dict) -> dict:
+    """Remember serialized values of the shared human attributes received by the skill."""
+    return {key: dumps(attributes[key]) for key in SHARED_ATTRIBUTES if key in attributes}
+
+
+def drop_unchanged_attributes(attributes: dict, snapshot: dict) -> dict:
+    """Diff against the previous turn: drop shared human attributes the skill has not changed.
+
+    The agent updates human attributes key by key, so the stored values stay untouched for the dropped keys.
+    """
+    return {
+        key: value
+        for key, value in attributes.items()
+        if key not in SHARED_ATTRIBUTES or key not in snapshot or snapshot[key] != dumps(value)
+    }
+
+
+def observe_state_size(state: dict, service_name: str = SERVICE_NAME) -> int:
+    """Measure the serialized size of the skill state and report it against DFF_STATE_SIZE_BUDGET."""
+    state_size = len(dumps(state).encode("utf-8"))
+    if Histogram is not None:
+        STATE_SIZE.labels(service_name).observe(state_size)
+    if state_size > DFF_STATE_SIZE_BUDGET:
+        if Counter is not None:
+            STATE_BUDGET_OVERFLOW.labels(service_name).inc()
+        logger.warning(f"{service_name} state size {state_size}B exceeds budget {DFF_STATE_SIZE_BUDGET}B")
+    return state_size
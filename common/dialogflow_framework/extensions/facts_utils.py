@@ -23,7 +23,6 @@ from common.wiki_skill import (
 from common.universal_templates import CONTINUE_PATTERN
 from common.utils import is_no, is_yes
 
-sentry_sdk.init(os.getenv("SENTRY_DSN"))
 logger = logging.getLogger(__name__)
 WIKI_FACTS_URL = os.getenv("WIKI_FACTS_URL")
 
@@ -1,9 +1,7 @@
 #!/usr/bin/env python
 
 import logging
-import os
 
-import sentry_sdk
 from sentry_sdk.integrations.logging import ignore_logger
 
 from dff import cached_functions
@@ -11,7 +9,6 @@ from common.constants import CAN_NOT_CONTINUE, CAN_CONTINUE_SCENARIO
 
 ignore_logger("root")
 
-sentry_sdk.init(os.getenv("SENTRY_DSN"))
 
 logger = logging.getLogger(__name__)
 
@@ -1,54 +1,71 @@
 from typing import List
 import logging
-import os
 import collections
+import itertools
+import sys
+from functools import lru_cache
 
 
-import en_core_web_sm
 import sentry_sdk
 from nltk.stem import WordNetLemmatizer
 
 from common.utils import get_entities
 from common.universal_templates import get_entities_with_attitudes
 
-sentry_sdk.init(dsn=os.getenv("SENTRY_DSN"))
 
 ENCOUNTERS_MAX_LEN = 3
 ENTITY_MAX_NO = 10
+# every stored entity is a separate human attribute, so `update_attributes` of the agent merges only changed ones
+ENTITY_SLOT_PREFIX = "entity_slot_"
 
 logger = logging.getLogger(__name__)
 
-spacy_nlp = en_core_web_sm.load()
-
 wnl = WordNetLemmatizer()
 
 
+@lru_cache(maxsize=2**14)
+def lemmatize_noun(word):
+    return wnl.lemmatize(word, "n")
+
+
+def intern_str(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
 class HumanEntityEncounter:
+    # next_skill_name is set on the next turn by Entity.update_human_encounters
+    __slots__ = ("human_utterance_index", "full_name", "previous_skill_name", "next_skill_name")
+
     def __init__(self, human_utterance_index: int, full_name: List[str], previous_skill_name: str = "", **kwargs):
         self.human_utterance_index = human_utterance_index
-        self.full_name = full_name
-        self.previous_skill_name = previous_skill_name
+        self.full_name = intern_str(full_name)
+        self.previous_skill_name = intern_str(previous_skill_name)
 
     def __iter__(self):
-        for x, y in self.__dict__.items():
-            yield x, y
+        for x in self.__slots__:
+            if hasattr(self, x):
+                yield x, getattr(self, x)
 
 
 class BotEntityEncounter:
+    __slots__ = ("human_utterance_index", "full_name", "skill_name")
+
     def __init__(self, human_utterance_index: int, full_name: str, skill_name: str, **kwargs):
         self.human_utterance_index = human_utterance_index
-        self.full_name = full_name
-        self.skill_name = skill_name
+        self.full_name = intern_str(full_name)
+        self.skill_name = intern_str(skill_name)
 
     def __iter__(self):
-        for x, y in self.__dict__.items():
-            yield x, y
+        for x in self.__slots__:
+            yield x, getattr(self, x)
 
 
 class Entity:
+    __slots__ = ("name", "human_encounters", "bot_encounters", "human_attitude", "bot_attitude")
+
     def __init__(self, name=None, raw_data=None):
         if name:
-            self.name = name
+            self.name = intern_str(name)
             self.human_encounters = []
             self.bot_encounters = []
             self.human_attitude = None
@@ -59,7 +76,7 @@ class Entity:
                 assert isinstance(raw_data["name"], str)
                 assert isinstance(raw_data["human_encounters"], list)
                 assert isinstance(raw_data["bot_encounters"], list)
-                self.name = raw_data["name"]
+                self.name = intern_str(raw_data["name"])
                 self.human_encounters = [
                     HumanEntityEncounter(**encounter) for encounter in raw_data["human_encounters"]
                 ]
@@ -72,12 +89,15 @@ class Entity:
                 self.name = "#LOAD_ENTITY_ERROR"
                 self.human_encounters = []
                 self.bot_encounters = []
+                self.human_attitude = None
+                self.bot_attitude = None
 
         self.human_encounters = collections.deque(self.human_encounters, maxlen=ENCOUNTERS_MAX_LEN)
         self.bot_encounters = collections.deque(self.bot_encounters, maxlen=ENCOUNTERS_MAX_LEN)
 
     def __iter__(self):
-        for x, y in self.__dict__.items():
+        for x in self.__slots__:
+            y = getattr(self, x)
             if x in ["human_encounters", "bot_encounters"]:
                 yield x, [dict(i) for i in y]
             else:
@@ -93,7 +113,7 @@ class Entity:
         human_utter = human_utters[-1]
         bot_utter = bot_utters[0] if bot_utters else {}
         entities = get_entities(human_utter, only_named=False, with_labels=False)
-        entities = [ent for ent in entities if self.name in wnl.lemmatize(ent, "n")]
+        entities = [ent for ent in entities if self.name in lemmatize_noun(ent)]
 
         active_skill = bot_utter.get("active_skill", "pre_start")
         for entity in entities:
@@ -107,7 +127,7 @@ class Entity:
     def add_bot_encounters(self, human_utters, bot_utters, human_utter_index):
         bot_utter = bot_utters[0] if bot_utters else {}
         entities = get_entities(bot_utter, only_named=False, with_labels=False)
-        entities = [ent for ent in entities if self.name in wnl.lemmatize(ent, "n")]
+        entities = [ent for ent in entities if self.name in lemmatize_noun(ent)]
 
         active_skill = bot_utter.get("active_skill", "pre_start")
         for entity in entities:
@@ -139,8 +159,8 @@ class Entity:
 def parse_entities_with_attitude(annotated_uttr: dict, prev_annotated_uttr: dict):
     entities_with_attitude = get_entities_with_attitudes(annotated_uttr, prev_annotated_uttr)
     entities_with_attitude = {
-        "like": [wnl.lemmatize(ent, "n") for ent in entities_with_attitude["like"]],
-        "dislike": [wnl.lemmatize(ent, "n") for ent in entities_with_attitude["dislike"]],
+        "like": [lemmatize_noun(ent) for ent in entities_with_attitude["like"]],
+        "dislike": [lemmatize_noun(ent) for ent in entities_with_attitude["dislike"]],
     }
     return entities_with_attitude
 
@@ -153,6 +173,47 @@ def load_raw_entities(raw_entities):
     return entities
 
 
+def get_entity_slots(attributes):
+    """Entity slot attributes of the human, removed entities leave their slots empty."""
+    return {key: value for key, value in attributes.items() if key.startswith(ENTITY_SLOT_PREFIX)}
+
+
+def get_raw_entities(attributes):
+    """Stored entities by names from the entity slots and from the former `entities` attribute of the human."""
+    raw_entities = dict(attributes.get("entities") or {})
+    for raw_entity in get_entity_slots(attributes).values():
+        if raw_entity:
+            raw_entities[raw_entity.get("name")] = raw_entity
+    return raw_entities
+
+
+def get_entity_slots_update(attributes, entities):
+    """Human attributes to update with the changed entities.
+
+    An entity keeps its slot, new entities take the free slots with the smallest numbers and the slots of the removed
+    entities are emptied, so there are at most `ENTITY_MAX_NO` slots. The former `entities` attribute is emptied.
+    """
+    slots = get_entity_slots(attributes)
+    entity_slots = {raw_entity["name"]: key for key, raw_entity in slots.items() if raw_entity}
+    entity_slots = {entity_name: key for entity_name, key in entity_slots.items() if entity_name in entities}
+    used_slots = set(entity_slots.values())
+    free_slots = (f"{ENTITY_SLOT_PREFIX}{i}" for i in itertools.count())
+    free_slots = (key for key in free_slots if key not in used_slots)
+
+    attributes_update = {key: None for key, raw_entity in slots.items() if raw_entity and key not in used_slots}
+    for entity_name, entity in entities.items():
+        raw_entity = dict(entity)
+        key = entity_slots.get(entity_name)
+        if key is None:
+            key = next(free_slots)
+        elif slots[key] == raw_entity:
+            continue
+        attributes_update[key] = raw_entity
+    if attributes.get("entities"):
+        attributes_update["entities"] = {}
+    return attributes_update
+
+
 def update_entities(dialog, human_utter_index, entities=None):
     entities = {} if entities is None else entities
     old_entities = list(entities)
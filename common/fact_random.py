@@ -6,7 +6,6 @@ import requests
 import sentry_sdk
 
 
-sentry_sdk.init(getenv("SENTRY_DSN"))
 logger = logging.getLogger(__name__)
 
 
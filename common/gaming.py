@@ -1,12 +1,11 @@
 import json
 import logging
-import os
 import re
 from pathlib import Path
 from typing import Dict, List, Union
 
 import requests
-import sentry_sdk
+from common import lazy_patterns
 from common.inflect import engine
 from requests import RequestException
 
@@ -24,8 +23,6 @@ CHECK_DEFINITELY_GAME_COMPILED_PATTERN = re.compile(
 
 logger = logging.getLogger(__name__)
 
-sentry_sdk.init(os.getenv("SENTRY_DSN"))
-
 
 inflect_engine = engine()
 
@@ -220,8 +217,9 @@ def load_json(file_path):
 
 path = Path(__file__).parent / Path("games_with_at_least_1M_copies_sold.json")
 GAMES_WITH_AT_LEAST_1M_COPIES_SOLD = load_json(path)
-GAMES_WITH_AT_LEAST_1M_COPIES_SOLD_COMPILED_PATTERN = compile_re_pattern_for_list_of_strings(
-    GAMES_WITH_AT_LEAST_1M_COPIES_SOLD
+# the alternation of all the games is compiled on the first search, not on the import
+GAMES_WITH_AT_LEAST_1M_COPIES_SOLD_COMPILED_PATTERN = lazy_patterns.from_factory(
+    lambda: compile_re_pattern_for_list_of_strings(GAMES_WITH_AT_LEAST_1M_COPIES_SOLD)
 )
 
 
@@ -2,6 +2,8 @@ import ast
 import re
 from typing import Dict, Union, Optional, Iterable, List, Match, Tuple, Callable
 
+from common import lazy_patterns
+
 
 """Copyright Jason R. Coombs
 
@@ -1541,7 +1543,7 @@ pl_prep_bysize = bysize(pl_prep_list_da)
 
 pl_prep = enclose("|".join(pl_prep_list_da))
 
-pl_sb_prep_dual_compound = fr"(.*?)((?:-|\s+)(?:{pl_prep})(?:-|\s+))a(?:-|\s+)(.*)"
+pl_sb_prep_dual_compound = rf"(.*?)((?:-|\s+)(?:{pl_prep})(?:-|\s+))a(?:-|\s+)(.*)"
 
 
 singular_pronoun_genders = {
@@ -1727,7 +1729,9 @@ plverb_ambiguous_pres = {
     "views": "view",
 }
 
-plverb_ambiguous_pres_keys = re.compile(fr"^({enclose('|'.join(plverb_ambiguous_pres))})((\s.*)?)$", re.IGNORECASE)
+plverb_ambiguous_pres_keys = lazy_patterns.compile(
+    rf"^({enclose('|'.join(plverb_ambiguous_pres))})((\s.*)?)$", re.IGNORECASE
+)
 
 
 plverb_irregular_non_pres = (
@@ -1747,7 +1751,7 @@ plverb_irregular_non_pres = (
     "should",
 )
 
-plverb_ambiguous_non_pres = re.compile(r"^((?:thought|saw|bent|will|might|cut))((\s.*)?)$", re.IGNORECASE)
+plverb_ambiguous_non_pres = lazy_patterns.compile(r"^((?:thought|saw|bent|will|might|cut))((\s.*)?)$", re.IGNORECASE)
 
 # "..oes" -> "..oe" (the rest are "..oes" -> "o")
 
@@ -1763,7 +1767,7 @@ pl_count_one = ("1", "a", "an", "one", "each", "every", "this", "that")
 
 pl_adj_special = {"a": "some", "an": "some", "this": "these", "that": "those"}
 
-pl_adj_special_keys = re.compile(fr"^({enclose('|'.join(pl_adj_special))})$", re.IGNORECASE)
+pl_adj_special_keys = lazy_patterns.compile(rf"^({enclose('|'.join(pl_adj_special))})$", re.IGNORECASE)
 
 pl_adj_poss = {
     "my": "our",
@@ -1774,7 +1778,7 @@ pl_adj_poss = {
     "their": "their",
 }
 
-pl_adj_poss_keys = re.compile(fr"^({enclose('|'.join(pl_adj_poss))})$", re.IGNORECASE)
+pl_adj_poss_keys = lazy_patterns.compile(rf"^({enclose('|'.join(pl_adj_poss))})$", re.IGNORECASE)
 
 
 # 2. INDEFINITE ARTICLES
@@ -1783,7 +1787,7 @@ pl_adj_poss_keys = re.compile(fr"^({enclose('|'.join(pl_adj_poss))})$", re.IGNOR
 # CONSONANT FOLLOWED BY ANOTHER CONSONANT, AND WHICH ARE NOT LIKELY
 # TO BE REAL WORDS (OH, ALL RIGHT THEN, IT'S JUST MAGIC!)
 
-A_abbrev = re.compile(
+A_abbrev = lazy_patterns.compile(
     r"""
 (?! FJO | [HLMNS]Y.  | RY[EO] | SQU
   | ( F[LR]? | [HL] | MN? | N | RH? | S[CHKLMNPTVW]? | X(YL)?) [AEIOU])
@@ -1796,17 +1800,17 @@ A_abbrev = re.compile(
 # 'y' FOLLOWED BY A CONSONANT. ANY OTHER Y-CONSONANT PREFIX THEREFORE
 # IMPLIES AN ABBREVIATION.
 
-A_y_cons = re.compile(r"^(y(b[lor]|cl[ea]|fere|gg|p[ios]|rou|tt))", re.IGNORECASE)
+A_y_cons = lazy_patterns.compile(r"^(y(b[lor]|cl[ea]|fere|gg|p[ios]|rou|tt))", re.IGNORECASE)
 
 # EXCEPTIONS TO EXCEPTIONS
 
-A_explicit_a = re.compile(r"^((?:unabomber|unanimous|US))", re.IGNORECASE)
+A_explicit_a = lazy_patterns.compile(r"^((?:unabomber|unanimous|US))", re.IGNORECASE)
 
-A_explicit_an = re.compile(r"^((?:euler|hour(?!i)|heir|honest|hono[ur]|mpeg))", re.IGNORECASE)
+A_explicit_an = lazy_patterns.compile(r"^((?:euler|hour(?!i)|heir|honest|hono[ur]|mpeg))", re.IGNORECASE)
 
-A_ordinal_an = re.compile(r"^([aefhilmnorsx]-?th)", re.IGNORECASE)
+A_ordinal_an = lazy_patterns.compile(r"^([aefhilmnorsx]-?th)", re.IGNORECASE)
 
-A_ordinal_a = re.compile(r"^([bcdgjkpqtuvwyz]-?th)", re.IGNORECASE)
+A_ordinal_a = lazy_patterns.compile(r"^([bcdgjkpqtuvwyz]-?th)", re.IGNORECASE)
 
 
 # NUMERICAL INFLECTIONS
@@ -1838,7 +1842,7 @@ ordinal = dict(
     twelve="twelfth",
 )
 
-ordinal_suff = re.compile(fr"({'|'.join(ordinal)})\Z")
+ordinal_suff = lazy_patterns.compile(rf"({'|'.join(ordinal)})\Z")
 
 
 # NUMBERS
@@ -1897,63 +1901,63 @@ string_to_constant = {"True": True, "False": False, "None": None}
 
 
 # Pre-compiled regular expression objects
-DOLLAR_DIGITS = re.compile(r"\$(\d+)")
-FUNCTION_CALL = re.compile(r"((\w+)\([^)]*\)*)", re.IGNORECASE)
-PARTITION_WORD = re.compile(r"\A(\s*)(.+?)(\s*)\Z")
-PL_SB_POSTFIX_ADJ_STEMS_RE = re.compile(fr"^(?:{pl_sb_postfix_adj_stems})$", re.IGNORECASE)
-PL_SB_PREP_DUAL_COMPOUND_RE = re.compile(fr"^(?:{pl_sb_prep_dual_compound})$", re.IGNORECASE)
-DENOMINATOR = re.compile(r"(?P<denominator>.+)( (per|a) .+)")
-PLVERB_SPECIAL_S_RE = re.compile(fr"^({plverb_special_s})$")
-WHITESPACE = re.compile(r"\s")
-ENDS_WITH_S = re.compile(r"^(.*[^s])s$", re.IGNORECASE)
-ENDS_WITH_APOSTROPHE_S = re.compile(r"^(.*)'s?$")
-INDEFINITE_ARTICLE_TEST = re.compile(r"\A(\s*)(?:an?\s+)?(.+?)(\s*)\Z", re.IGNORECASE)
-SPECIAL_AN = re.compile(r"^[aefhilmnorsx]$", re.IGNORECASE)
-SPECIAL_A = re.compile(r"^[bcdgjkpqtuvwyz]$", re.IGNORECASE)
-SPECIAL_ABBREV_AN = re.compile(r"^[aefhilmnorsx][.-]", re.IGNORECASE)
-SPECIAL_ABBREV_A = re.compile(r"^[a-z][.-]", re.IGNORECASE)
-CONSONANTS = re.compile(r"^[^aeiouy]", re.IGNORECASE)
-ARTICLE_SPECIAL_EU = re.compile(r"^e[uw]", re.IGNORECASE)
-ARTICLE_SPECIAL_ONCE = re.compile(r"^onc?e\b", re.IGNORECASE)
-ARTICLE_SPECIAL_ONETIME = re.compile(r"^onetime\b", re.IGNORECASE)
-ARTICLE_SPECIAL_UNIT = re.compile(r"^uni([^nmd]|mo)", re.IGNORECASE)
-ARTICLE_SPECIAL_UBA = re.compile(r"^u[bcfghjkqrst][aeiou]", re.IGNORECASE)
-ARTICLE_SPECIAL_UKR = re.compile(r"^ukr", re.IGNORECASE)
-SPECIAL_CAPITALS = re.compile(r"^U[NK][AIEO]?")
-VOWELS = re.compile(r"^[aeiou]", re.IGNORECASE)
-
-DIGIT_GROUP = re.compile(r"(\d)")
-TWO_DIGITS = re.compile(r"(\d)(\d)")
-THREE_DIGITS = re.compile(r"(\d)(\d)(\d)")
-THREE_DIGITS_WORD = re.compile(r"(\d)(\d)(\d)(?=\D*\Z)")
-TWO_DIGITS_WORD = re.compile(r"(\d)(\d)(?=\D*\Z)")
-ONE_DIGIT_WORD = re.compile(r"(\d)(?=\D*\Z)")
-
-FOUR_DIGIT_COMMA = re.compile(r"(\d)(\d{3}(?:,|\Z))")
-NON_DIGIT = re.compile(r"\D")
-WHITESPACES_COMMA = re.compile(r"\s+,")
-COMMA_WORD = re.compile(r", (\S+)\s+\Z")
-WHITESPACES = re.compile(r"\s+")
+DOLLAR_DIGITS = lazy_patterns.compile(r"\$(\d+)")
+FUNCTION_CALL = lazy_patterns.compile(r"((\w+)\([^)]*\)*)", re.IGNORECASE)
+PARTITION_WORD = lazy_patterns.compile(r"\A(\s*)(.+?)(\s*)\Z")
+PL_SB_POSTFIX_ADJ_STEMS_RE = lazy_patterns.compile(rf"^(?:{pl_sb_postfix_adj_stems})$", re.IGNORECASE)
+PL_SB_PREP_DUAL_COMPOUND_RE = lazy_patterns.compile(rf"^(?:{pl_sb_prep_dual_compound})$", re.IGNORECASE)
+DENOMINATOR = lazy_patterns.compile(r"(?P<denominator>.+)( (per|a) .+)")
+PLVERB_SPECIAL_S_RE = lazy_patterns.compile(rf"^({plverb_special_s})$")
+WHITESPACE = lazy_patterns.compile(r"\s")
+ENDS_WITH_S = lazy_patterns.compile(r"^(.*[^s])s$", re.IGNORECASE)
+ENDS_WITH_APOSTROPHE_S = lazy_patterns.compile(r"^(.*)'s?$")
+INDEFINITE_ARTICLE_TEST = lazy_patterns.compile(r"\A(\s*)(?:an?\s+)?(.+?)(\s*)\Z", re.IGNORECASE)
+SPECIAL_AN = lazy_patterns.compile(r"^[aefhilmnorsx]$", re.IGNORECASE)
+SPECIAL_A = lazy_patterns.compile(r"^[bcdgjkpqtuvwyz]$", re.IGNORECASE)
+SPECIAL_ABBREV_AN = lazy_patterns.compile(r"^[aefhilmnorsx][.-]", re.IGNORECASE)
+SPECIAL_ABBREV_A = lazy_patterns.compile(r"^[a-z][.-]", re.IGNORECASE)
+CONSONANTS = lazy_patterns.compile(r"^[^aeiouy]", re.IGNORECASE)
+ARTICLE_SPECIAL_EU = lazy_patterns.compile(r"^e[uw]", re.IGNORECASE)
+ARTICLE_SPECIAL_ONCE = lazy_patterns.compile(r"^onc?e\b", re.IGNORECASE)
+ARTICLE_SPECIAL_ONETIME = lazy_patterns.compile(r"^onetime\b", re.IGNORECASE)
+ARTICLE_SPECIAL_UNIT = lazy_patterns.compile(r"^uni([^nmd]|mo)", re.IGNORECASE)
+ARTICLE_SPECIAL_UBA = lazy_patterns.compile(r"^u[bcfghjkqrst][aeiou]", re.IGNORECASE)
+ARTICLE_SPECIAL_UKR = lazy_patterns.compile(r"^ukr", re.IGNORECASE)
+SPECIAL_CAPITALS = lazy_patterns.compile(r"^U[NK][AIEO]?")
+VOWELS = lazy_patterns.compile(r"^[aeiou]", re.IGNORECASE)
+
+DIGIT_GROUP = lazy_patterns.compile(r"(\d)")
+TWO_DIGITS = lazy_patterns.compile(r"(\d)(\d)")
+THREE_DIGITS = lazy_patterns.compile(r"(\d)(\d)(\d)")
+THREE_DIGITS_WORD = lazy_patterns.compile(r"(\d)(\d)(\d)(?=\D*\Z)")
+TWO_DIGITS_WORD = lazy_patterns.compile(r"(\d)(\d)(?=\D*\Z)")
+ONE_DIGIT_WORD = lazy_patterns.compile(r"(\d)(?=\D*\Z)")
+
+FOUR_DIGIT_COMMA = lazy_patterns.compile(r"(\d)(\d{3}(?:,|\Z))")
+NON_DIGIT = lazy_patterns.compile(r"\D")
+WHITESPACES_COMMA = lazy_patterns.compile(r"\s+,")
+COMMA_WORD = lazy_patterns.compile(r", (\S+)\s+\Z")
+WHITESPACES = lazy_patterns.compile(r"\s+")
 
 
 PRESENT_PARTICIPLE_REPLACEMENTS = (
-    (re.compile(r"ie$"), r"y"),
+    (lazy_patterns.compile(r"ie$"), r"y"),
     (
-        re.compile(r"ue$"),
+        lazy_patterns.compile(r"ue$"),
         r"u",
     ),  # TODO: isn't ue$ -> u encompassed in the following rule?
-    (re.compile(r"([auy])e$"), r"\g<1>"),
-    (re.compile(r"ski$"), r"ski"),
-    (re.compile(r"[^b]i$"), r""),
-    (re.compile(r"^(are|were)$"), r"be"),
-    (re.compile(r"^(had)$"), r"hav"),
-    (re.compile(r"^(hoe)$"), r"\g<1>"),
-    (re.compile(r"([^e])e$"), r"\g<1>"),
-    (re.compile(r"er$"), r"er"),
-    (re.compile(r"([^aeiou][aeiouy]([bdgmnprst]))$"), r"\g<1>\g<2>"),
+    (lazy_patterns.compile(r"([auy])e$"), r"\g<1>"),
+    (lazy_patterns.compile(r"ski$"), r"ski"),
+    (lazy_patterns.compile(r"[^b]i$"), r""),
+    (lazy_patterns.compile(r"^(are|were)$"), r"be"),
+    (lazy_patterns.compile(r"^(had)$"), r"hav"),
+    (lazy_patterns.compile(r"^(hoe)$"), r"\g<1>"),
+    (lazy_patterns.compile(r"([^e])e$"), r"\g<1>"),
+    (lazy_patterns.compile(r"er$"), r"er"),
+    (lazy_patterns.compile(r"([^aeiou][aeiouy]([bdgmnprst]))$"), r"\g<1>\g<2>"),
 )
 
-DIGIT = re.compile(r"\d")
+DIGIT = lazy_patterns.compile(r"\d")
 
 
 class Words(str):
@@ -2073,7 +2077,7 @@ class engine:
 
     def ud_match(self, word: str, wordlist: List[str]) -> Optional[str]:
         for i in range(len(wordlist) - 2, -2, -2):  # backwards through even elements
-            mo = re.search(fr"^{wordlist[i]}$", word, re.IGNORECASE)
+            mo = re.search(rf"^{wordlist[i]}$", word, re.IGNORECASE)
             if mo:
                 if wordlist[i + 1] is None:
                     return None
@@ -2441,7 +2445,7 @@ class engine:
         return False
 
     def _pl_reg_plurals(self, pair: str, stems: str, end1: str, end2: str) -> bool:
-        pattern = fr"({stems})({end1}\|\1{end2}|{end2}\|\1{end1})"
+        pattern = rf"({stems})({end1}\|\1{end2}|{end2}\|\1{end1})"
         return bool(re.search(pattern, pair))
 
     def _pl_check_plurals_N(self, word1: str, word2: str) -> bool:
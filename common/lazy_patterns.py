@@ -0,0 +1,87 @@
+"""Regular expressions compiled on the first use instead of the import of the module.
+
+```
+from common import lazy_patterns
+
+BIG_COMPILED_PATTERN = lazy_patterns.compile(r"\\b(?:first|second)\\b", re.IGNORECASE)
+BIG_COMPILED_PATTERN.search(text)  # compiled here
+re.search(lazy_patterns.resolve(pattern), text)  # `re` functions need the compiled pattern
+```
+
+Lazy patterns proxy all the methods and attributes of `re.Pattern`, but they are not its instances,
+so patterns which are passed to `re.search(pattern, ...)` and alike should be resolved by `resolve`.
+"""
+import re
+
+REGISTRY = []
+
+
+class LazyPattern:
+    __slots__ = ("_source", "_flags", "_factory", "_compiled")
+
+    def __init__(self, source=None, flags=0, factory=None):
+        self._source = source
+        self._flags = flags
+        self._factory = factory
+        self._compiled = None
+
+    @property
+    def compiled(self):
+        # concurrent first uses may compile the pattern twice, which is harmless, while a lock would deadlock
+        # the factories which use other lazy patterns
+        if self._compiled is None:
+            if self._factory is not None:
+                self._compiled = self._factory()
+            else:
+                self._compiled = re.compile(self._source, self._flags)
+        return self._compiled
+
+    @property
+    def is_compiled(self):
+        return self._compiled is not None
+
+    @property
+    def pattern(self):
+        if self._source is None:
+            return self.compiled.pattern
+        return self._source
+
+    @property
+    def flags(self):
+        return self.compiled.flags
+
+    def __getattr__(self, name):
+        if name.startswith("_") or name == "compiled":
+            raise AttributeError(name)
+        return getattr(self.compiled, name)
+
+    def __repr__(self):
+        return f"LazyPattern({self._source or self._factory!r})"
+
+
+def compile(pattern, flags=0):
+    """Drop-in replacement of `re.compile` which postpones the compilation."""
+    lazy_pattern = LazyPattern(pattern, flags)
+    REGISTRY.append(lazy_pattern)
+    return lazy_pattern
+
+
+def from_factory(factory):
+    """Lazy pattern for a function which builds and returns the compiled pattern, e.g. from a data file."""
+    lazy_pattern = LazyPattern(factory=factory)
+    REGISTRY.append(lazy_pattern)
+    return lazy_pattern
+
+
+def resolve(pattern):
+    """Compiled pattern for a lazy pattern, other patterns and strings are returned as they are."""
+    if isinstance(pattern, LazyPattern):
+        return pattern.compiled
+    return pattern
+
+
+def compile_all():
+    """Compile all registered patterns, e.g. to warm up the service before the first request."""
+    for lazy_pattern in REGISTRY:
+        lazy_pattern.compiled
+    return len(REGISTRY)
@@ -1,6 +1,25 @@
-from flask import request, Response
-from prometheus_client import generate_latest, Counter, Histogram, Gauge, CONTENT_TYPE_LATEST
+"""Prometheus instrumentation shared by Flask and FastAPI services.
+
+```
+from common.metrics import setup_metrics, observe_batch_size, measure_stage
+
+app = Flask(__name__)  # or app = FastAPI()
+setup_metrics(app)
+
+@app.route("/respond", methods=["POST"])
+def respond():
+    observe_batch_size(len(request.json["sentences"]))
+    with measure_stage("preprocessing"):
+        inputs = preprocess(request.json["sentences"])
+    with measure_stage("inference"):
+        outputs = model(inputs)
+    ...
+```
+"""
 import time
+from contextlib import contextmanager
+
+from prometheus_client import generate_latest, Counter, Histogram, Gauge, CONTENT_TYPE_LATEST
 
 REQUEST_COUNT = Counter(
     "http_request_count",
@@ -22,13 +41,80 @@ REQUEST_IN_PROGRESS = Gauge(
     ],
 )
 
+BATCH_SIZE = Histogram(
+    "batch_size",
+    "Number of samples in request batch",
+    ["endpoint"],
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+)
+
+STAGE_LATENCY = Histogram(
+    "stage_latency_seconds",
+    "Latency of request processing stage: preprocessing, inference, postprocessing, etc.",
+    ["stage"],
+)
+
+CACHE_REQUEST_COUNT = Counter(
+    "cache_request_count",
+    "Cache lookups by result: hit, miss or stale",
+    [
+        "cache",
+        "result",
+    ],
+)
+
+CACHE_REFRESH_LATENCY = Histogram("cache_refresh_latency_seconds", "Cache entry refresh latency", ["cache"])
+
+UPSTREAM_REQUEST_COUNT = Counter(
+    "upstream_request_count",
+    "Requests to other services by result: ok, timeout or error",
+    [
+        "service",
+        "result",
+    ],
+)
+
+UPSTREAM_TIMEOUT = Gauge("upstream_timeout_seconds", "Current timeout of requests to other services", ["service"])
+
+NOT_TRACKED_PATHS = ["/ready", "/health", "/metrics"]
+
 
 def do_not_track(func):
     func._do_not_track = True
     return func
 
 
+def observe_batch_size(batch_size, endpoint="/respond"):
+    BATCH_SIZE.labels(endpoint).observe(batch_size)
+
+
+@contextmanager
+def measure_stage(stage):
+    st_time = time.time()
+    try:
+        yield
+    finally:
+        STAGE_LATENCY.labels(stage).observe(time.time() - st_time)
+
+
+def count_cache_request(cache, hit):
+    CACHE_REQUEST_COUNT.labels(cache, "hit" if hit else "miss").inc()
+
+
+def count_upstream_request(service, result):
+    UPSTREAM_REQUEST_COUNT.labels(service, result).inc()
+
+
 def setup_metrics(app):
+    """Add /ready, /health and /metrics endpoints and request metrics to Flask or FastAPI app."""
+    if hasattr(app, "before_request"):
+        setup_flask_metrics(app)
+    else:
+        setup_fastapi_metrics(app)
+
+
+def setup_flask_metrics(app):
+    from flask import request, Response
 
     # readiness endpoint
     @app.route("/ready", methods=["GET"])
@@ -69,3 +155,39 @@ def setup_metrics(app):
 
     app.before_request(before_request)
     app.after_request(after_request)
+
+
+def setup_fastapi_metrics(app):
+    from starlette.responses import PlainTextResponse, Response
+
+    # readiness endpoint
+    @app.get("/ready")
+    def ready():
+        return PlainTextResponse("OK")
+
+    # liveness endpoint
+    @app.get("/health")
+    def health():
+        return PlainTextResponse("OK")
+
+    # metrics endpoint
+    @app.get("/metrics")
+    def metrics():
+        return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+    @app.middleware("http")
+    async def track_request(request, call_next):
+        path = request.url.path
+        if path in NOT_TRACKED_PATHS:
+            return await call_next(request)
+        st_time = time.time()
+        REQUEST_IN_PROGRESS.labels(path).inc()
+        status_code = 500
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+            return response
+        finally:
+            REQUEST_COUNT.labels(request.method, path, status_code).inc()
+            REQUEST_LATENCY.labels(path).observe(time.time() - st_time)
+            REQUEST_IN_PROGRESS.labels(path).dec()
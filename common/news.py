@@ -2,15 +2,16 @@ import logging
 import random
 import re
 import requests
-from os import getenv
 
 import sentry_sdk
 from common.utils import is_yes, get_entities
 
-sentry_sdk.init(getenv("SENTRY_DSN"))
 
 logger = logging.getLogger(__name__)
 
+# long-lived session keeps connections to news api annotator alive between requests
+NEWS_API_SESSION = requests.Session()
+
 # this way news skill offers latest news when nothing specific found
 OFFER_BREAKING_NEWS = "Would you like to hear the latest news?"
 OFFER_TOPIC_SPECIFIC_NEWS = "Would you like to hear news about TOPIC?"
@@ -116,7 +117,7 @@ def get_news_about_topic(
         "return_list_of_news": return_list_of_news,
     }
     try:
-        result = requests.post(NEWS_API_ANNOTATOR_URL, json=dialogs, timeout=timeout_value)
+        result = NEWS_API_SESSION.post(NEWS_API_ANNOTATOR_URL, json=dialogs, timeout=timeout_value)
         result = result.json()[0]
         for entity_news_dict in result:
             if entity_news_dict and str(entity_news_dict["entity"]).lower() == topic.lower():
@@ -12,16 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import os
 import re
 import logging
 
-import sentry_sdk
 
 from deeppavlov.core.common.registry import register
 from deeppavlov.core.models.estimator import Component
 
-sentry_sdk.init(os.getenv("SENTRY_DSN"))
 logging.basicConfig(format="%(asctime)s - %(name)s - %(levelname)s - %(message)s", level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
@@ -126,6 +123,20 @@ class PagePreprocessor(Component):
         return processed_pages_batch, main_pages_batch
 
 
+def split_whow_page(page):
+    page_dict = {}
+    if page:
+        keys_and_values = page.split("\n")
+        keys = [keys_and_values[i] for i in range(0, len(keys_and_values), 2)]
+        values = [keys_and_values[i] for i in range(1, len(keys_and_values), 2)]
+        for key, value in zip(keys, values):
+            if key == "intro":
+                page_dict["intro"] = value
+            else:
+                page_dict[key] = value.split("\t")
+    return page_dict
+
+
 @register("whow_page_preprocessor")
 class WhowPagePreprocessor(Component):
     def __init__(self, *args, **kwargs):
@@ -136,17 +147,7 @@ class WhowPagePreprocessor(Component):
         for pages_list in pages_batch:
             processed_pages_list = []
             for page in pages_list:
-                page_dict = {}
-                if page:
-                    keys_and_values = page.split("\n")
-                    keys = [keys_and_values[i] for i in range(0, len(keys_and_values), 2)]
-                    values = [keys_and_values[i] for i in range(1, len(keys_and_values), 2)]
-                    for key, value in zip(keys, values):
-                        if key == "intro":
-                            page_dict["intro"] = value
-                        else:
-                            page_dict[key] = value.split("\t")
-                processed_pages_list.append(page_dict)
+                processed_pages_list.append(split_whow_page(page))
             processed_pages_batch.append(processed_pages_list)
 
         return processed_pages_batch
@@ -0,0 +1,136 @@
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+from cachetools import LRUCache
+from deeppavlov.core.commands.utils import expand_path
+from deeppavlov.core.common.registry import register
+from deeppavlov.core.models.component import Component
+
+from common.page_preprocessor import split_page, split_whow_page
+
+logger = logging.getLogger(__name__)
+
+PAGE_PARSERS = {"wiki": split_page, "whow": split_whow_page}
+# sqlite limits the number of variables in one query by 999
+MAX_QUERY_VARIABLES = 900
+
+
+def get_table_name(connection):
+    # DeepPavlov page databases have a single table with `id` and `text` columns
+    return connection.execute("SELECT name FROM sqlite_master WHERE type='table'").fetchone()[0]
+
+
+class PageStore:
+    """Parsed Wikipedia or wikiHow pages by titles.
+
+    Pages are read from the store made by `convert_pages`, where they are kept parsed and compressed,
+    or from the raw DeepPavlov database, then they are parsed on the fly. All the pages of a call are fetched
+    with one `IN (...)` query and parsed pages are kept in LRU cache. Returned pages must not be modified.
+    """
+
+    def __init__(self, load_path, page_type="wiki", cache_size=1000):
+        self.parse = PAGE_PARSERS[page_type]
+        self.connection = sqlite3.connect(str(load_path), check_same_thread=False)
+        self.table_name = get_table_name(self.connection)
+        self.converted = self.table_name == "pages"
+        self.cache = LRUCache(maxsize=cache_size)
+        self.lock = threading.Lock()
+        logger.info(f"page store {load_path}, converted: {self.converted}")
+
+    def decode(self, content):
+        if self.converted:
+            return json.loads(zlib.decompress(content).decode("utf-8"))
+        return self.parse(content)
+
+    def get_pages(self, titles):
+        titles = list(dict.fromkeys(titles))
+        pages = {}
+        with self.lock:
+            missing_titles = [title for title in titles if title not in self.cache]
+            for start in range(0, len(missing_titles), MAX_QUERY_VARIABLES):
+                titles_chunk = missing_titles[start : start + MAX_QUERY_VARIABLES]
+                column = "content" if self.converted else "text"
+                rows = self.connection.execute(
+                    f"SELECT id, {column} FROM {self.table_name} WHERE id IN ({', '.join('?' * len(titles_chunk))})",
+                    titles_chunk,
+                ).fetchall()
+                for title, content in rows:
+                    pages[title] = self.cache[title] = self.decode(content)
+            for title in titles:
+                if title not in pages:
+                    if title not in self.cache:
+                        # pages which are not in the database are parsed as empty ones
+                        self.cache[title] = self.parse(None)
+                    pages[title] = self.cache[title]
+        return pages
+
+
+@register("page_store")
+class PageExtractor(Component):
+    """Get parsed pages by a batch of lists of titles, replaces `wiki_sqlite_vocab` with a page preprocessor.
+
+    Args:
+        load_path: a path to the raw DeepPavlov page database
+        store_path: a path to the converted page store, it is used instead of `load_path` if it exists
+        page_type: `wiki` returns pages and main pages as `PagePreprocessor`, `whow` returns pages
+            as `WhowPagePreprocessor`
+        cache_size: number of parsed pages kept in memory
+    """
+
+    def __init__(self, load_path, store_path=None, page_type="wiki", cache_size=1000, **kwargs):
+        self.page_type = page_type
+        if store_path and expand_path(store_path).exists():
+            load_path = store_path
+        self.page_store = PageStore(expand_path(load_path), page_type, cache_size)
+
+    def __call__(self, titles_batch):
+        tm_st = time.time()
+        pages = self.page_store.get_pages(title for titles in titles_batch for title in titles)
+        processed_pages_batch = [[pages[title] for title in titles] for titles in titles_batch]
+        logger.debug(f"page store time {time.time() - tm_st}")
+        if self.page_type == "whow":
+            return processed_pages_batch
+        main_pages_batch = [[page[1] for page in pages_list] for pages_list in processed_pages_batch]
+        processed_pages_batch = [[page[0] for page in pages_list] for pages_list in processed_pages_batch]
+        return processed_pages_batch, main_pages_batch
+
+
+def convert_pages(load_path, save_path, page_type="wiki", batch_size=10000):
+    """Parse all pages of the raw DeepPavlov database and save them compressed to the page store."""
+    parse = PAGE_PARSERS[page_type]
+    source = sqlite3.connect(str(load_path))
+    if os.path.exists(save_path):
+        os.remove(save_path)
+    target = sqlite3.connect(str(save_path))
+    target.execute("CREATE TABLE pages (id TEXT PRIMARY KEY, content BLOB)")
+    cursor = source.execute(f"SELECT id, text FROM {get_table_name(source)}")
+    n_pages = 0
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        target.executemany(
+            "INSERT INTO pages VALUES (?, ?)",
+            [(title, zlib.compress(json.dumps(parse(text)).encode("utf-8"))) for title, text in rows],
+        )
+        target.commit()
+        n_pages += len(rows)
+        logger.info(f"converted {n_pages} pages")
+    target.close()
+    source.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(format="%(asctime)s - %(name)s - %(levelname)s - %(message)s", level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Convert DeepPavlov page database to the page store")
+    parser.add_argument("load_path", help="raw page database, e.g. enwiki_latest_topic.db")
+    parser.add_argument("save_path", help="page store, e.g. enwiki_latest_topic_pages.db")
+    parser.add_argument("--page-type", choices=list(PAGE_PARSERS), default="wiki")
+    args = parser.parse_args()
+    convert_pages(args.load_path, args.save_path, args.page_type)
@@ -1,11 +1,8 @@
 import logging
-import os
 
 import requests
-import sentry_sdk
 
 
-sentry_sdk.init(dsn=os.getenv("SENTRY_DSN"))
 logging.basicConfig(format="%(asctime)s - %(name)s - %(levelname)s - %(message)s", level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -1,5 +1,6 @@
 import re
 
+from common import lazy_patterns
 from common.animals import ANIMALS_TEMPLATE, PETS_TEMPLATE
 from common.books import BOOK_PATTERN
 from common.gaming import GAMES_WITH_AT_LEAST_1M_COPIES_SOLD_COMPILED_PATTERN, VIDEO_GAME_WORDS_COMPILED_PATTERN
@@ -189,10 +190,10 @@ def turn_on_skills(
     for skill_name in SKILL_TRIGGERS:
         if available_skills is None or (available_skills is not None and skill_name in available_skills):
             for pattern in SKILL_TRIGGERS[skill_name]["compiled_patterns"]:
-                if re.search(pattern, user_uttr_text):
+                if re.search(lazy_patterns.resolve(pattern), user_uttr_text):
                     skills.append(skill_name)
             for pattern in SKILL_TRIGGERS[skill_name]["previous_bot_patterns"]:
-                if re.search(pattern, prev_bot_uttr_text):
+                if re.search(lazy_patterns.resolve(pattern), prev_bot_uttr_text):
                     skills.append(skill_name)
             if set(SKILL_TRIGGERS[skill_name]["cobot_dialogact_topics"]) & cobot_dialogact_topics:
                 skills.append(skill_name)
@@ -1,5 +1,4 @@
 # %%
-import os
 import logging
 import random
 import re
@@ -22,7 +21,6 @@ import common.constants as common_constants
 from common.speech_functions import utils as current_utils
 from common.psychometrics import is_introvert
 
-sentry_sdk.init(dsn=os.getenv("SENTRY_DSN"))
 
 logger = logging.getLogger(__name__)
 
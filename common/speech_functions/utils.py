@@ -1,16 +1,12 @@
 # %%
 import logging
-import os
 import re
 
 import common.speech_functions.generic_responses_templates as current_templates
-import sentry_sdk
 
 import common.dialogflow_framework.utils.state as state_utils
 import common.utils as common_utils
 
-sentry_sdk.init(dsn=os.getenv("SENTRY_DSN"))
-
 
 logger = logging.getLogger(__name__)
 
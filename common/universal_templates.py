@@ -1,8 +1,8 @@
 import logging
 import re
-from os import getenv
 from random import choice
 
+from common import lazy_patterns
 from common.utils import (
     join_words_in_or_pattern,
     join_sentences_in_or_pattern,
@@ -15,11 +15,9 @@ from common.utils import (
     join_word_beginnings_in_or_pattern,
 )
 from common.greeting import GREETING_QUESTIONS, WHAT_DO_YOU_DO_RESPONSES, FREE_TIME_RESPONSES
-import sentry_sdk
 
 logger = logging.getLogger(__name__)
 
-sentry_sdk.init(getenv("SENTRY_DSN"))
 
 # https://www.englishclub.com/vocabulary/fl-asking-for-opinions.htm
 UNIVERSAL_OPINION_REQUESTS = [
@@ -159,7 +157,7 @@ KNOW = join_words_in_or_pattern(KNOW_LIKE)
 SOMETHING_ELSE = re.compile(r"((something|anything|everything) (else|other))", re.IGNORECASE)
 
 # --------------- Let's talk. / Can we talk? / Talk to me. ------------
-COMPILE_LETS_TALK = re.compile(
+COMPILE_LETS_TALK = lazy_patterns.compile(
     join_sentences_in_or_pattern(
         [
             TALK_TO_ME + END,
@@ -185,7 +183,7 @@ COMPILE_NOT_WANT_TO_TALK_ABOUT_IT = re.compile(
 )
 
 # ----- Let's talk about something. / Can we talk about something? / Talk to me about something. ----
-COMPILE_LETS_TALK_ABOUT_SOMETHING = re.compile(
+COMPILE_LETS_TALK_ABOUT_SOMETHING = lazy_patterns.compile(
     join_sentences_in_or_pattern(
         [
             TALK_TO_ME + r"\s?" + ABOUT_SOMETHING + END,
@@ -200,7 +198,7 @@ COMPILE_LETS_TALK_ABOUT_SOMETHING = re.compile(
 
 # ----- Let's talk about something ELSE. / Can we talk about something ELSE? / Talk to me about something ELSE. ----
 # ----- .. switch the topic. / .. next topic. / .. switch topic. / Next. ----
-COMPILE_SWITCH_TOPIC = re.compile(
+COMPILE_SWITCH_TOPIC = lazy_patterns.compile(
     join_sentences_in_or_pattern(
         [
             BEGIN_OF_SENT + TALK_TO_ME + r"\s?" + ABOUT_SOMETHING + " else" + END,
@@ -216,7 +214,7 @@ COMPILE_SWITCH_TOPIC = re.compile(
 )
 
 # ----- Let's talk about TOPIC. / Can we talk about TOPIC? / Talk to me about TOPIC. ----
-COMPILE_LETS_TALK_ABOUT_TOPIC = re.compile(
+COMPILE_LETS_TALK_ABOUT_TOPIC = lazy_patterns.compile(
     join_sentences_in_or_pattern(
         [
             TALK_TO_ME + SOMETHING_WITH_SPACES + ABOUT_TOPIC + END,
@@ -278,7 +276,7 @@ CONTINUE_PATTERN = re.compile(r"(continue|more|go ahead)", re.IGNORECASE)
 
 def if_lets_chat(uttr):
     uttr_ = uttr.lower()
-    if re.search(COMPILE_LETS_TALK, uttr_):
+    if COMPILE_LETS_TALK.search(uttr_):
         return True
     else:
         return False
@@ -288,11 +286,11 @@ def if_lets_chat_about_topic(uttr):
     uttr_ = uttr.lower()
     # True if `let's talk about particular-topic`
     if not re.search(COMPILE_NOT_WANT_TO_TALK_ABOUT_IT, uttr_):
-        if re.search(COMPILE_LETS_TALK_ABOUT_SOMETHING, uttr_):
+        if COMPILE_LETS_TALK_ABOUT_SOMETHING.search(uttr_):
             return False
-        elif re.search(COMPILE_SWITCH_TOPIC, uttr_):
+        elif COMPILE_SWITCH_TOPIC.search(uttr_):
             return False
-        elif re.search(COMPILE_LETS_TALK_ABOUT_TOPIC, uttr_):
+        elif COMPILE_LETS_TALK_ABOUT_TOPIC.search(uttr_):
             return True
         else:
             return False
@@ -302,7 +300,7 @@ def if_lets_chat_about_topic(uttr):
 
 def if_switch_topic(uttr):
     uttr_ = uttr.lower()
-    if re.search(COMPILE_SWITCH_TOPIC, uttr_):
+    if COMPILE_SWITCH_TOPIC.search(uttr_):
         return True
     else:
         return False
@@ -337,7 +335,7 @@ def if_choose_topic(annotated_uttr, prev_annotated_uttr=None):
     chat_about_intent = "lets_chat_about" in get_intents(annotated_uttr, probs=False, which="intent_catcher")
     user_asks_what_to_talk_about = re.search(COMPILE_WHAT_TO_TALK_ABOUT, uttr_)
     # user ask to "talk about something"
-    smth1 = re.search(COMPILE_LETS_TALK_ABOUT_SOMETHING, uttr_) or (
+    smth1 = COMPILE_LETS_TALK_ABOUT_SOMETHING.search(uttr_) or (
         chat_about_intent and re.search(COMPILE_SOMETHING, uttr_)
     )
     # bot asks "what user wants to talk about", and user answers "something"
@@ -435,7 +433,7 @@ def if_chat_about_particular_topic(annotated_uttr, prev_annotated_uttr=None, key
                     rf"{compiled_pattern.pattern}[a-zA-Z0-9,\-\' ]+\?", prev_uttr_, re.IGNORECASE
                 )
             user_agrees_or_any = ANY_TOPIC_AMONG_OFFERED.search(uttr_) or is_yes(annotated_uttr)
-            if re.search(compiled_pattern, uttr_) or (offered_this_topic and user_agrees_or_any):
+            if re.search(lazy_patterns.resolve(compiled_pattern), uttr_) or (offered_this_topic and user_agrees_or_any):
                 return True
             else:
                 return False
@@ -1,6 +1,5 @@
 import re
 import logging
-from os import getenv
 from copy import deepcopy
 from random import choice
 
@@ -9,7 +8,6 @@ import sentry_sdk
 
 logger = logging.getLogger(__name__)
 
-sentry_sdk.init(getenv("SENTRY_DSN"))
 
 other_skills = {
     "dff_intent_responder_skill",
@@ -914,6 +912,15 @@ def get_entities(annotated_utterance, only_named=False, with_labels=False):
     return entities if entities is not None else []
 
 
+def get_spacy_annotations(annotated_utterance):
+    """Parse of the utterance by `spacy_annotator`, empty dict if the utterance is not annotated.
+
+    Keys are `tokens`, `spaces`, `lemmas`, `pos`, `tags`, `deps` (lists aligned with the tokens),
+    `heads` (token indices), `noun_chunks` and `sentences` ([start, end) token spans).
+    """
+    return annotated_utterance.get("annotations", {}).get("spacy_annotator", {})
+
+
 def get_named_persons(annotated_utterance):
     named_entities = get_entities(annotated_utterance, only_named=True, with_labels=True)
     all_entities = get_entities(annotated_utterance, only_named=False, with_labels=True)
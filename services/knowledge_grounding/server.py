@@ -44,31 +44,52 @@ logger.info("knowledge grounding script has loaded the model and is ready")
 app = Flask(__name__)
 
 
-@app.route("/respond", methods=["POST"])
-def respond():
-    batch = request.json["batch"]
-    responses = [""]
-    random.seed(42)
-    st_time = time.time()
-    if batch:
-        user_inputs = {"history": batch[0]["history"].split("\n") if batch[0]["history"] else [""], "inputs": []}
-        for sample in batch:
-            user_inputs["inputs"].append(
+def generate_responses(batch):
+    """Generate responses for the samples, every sample has its own history.
+
+    `kg_script.run` takes one history for all its inputs and generates them as one padded batch,
+    so the samples are grouped by history and every group is generated in one run.
+    """
+    responses = [""] * len(batch)
+    history_groups = {}
+    for sample_id, sample in enumerate(batch):
+        history_groups.setdefault(sample["history"], []).append(sample_id)
+    for history, sample_ids in history_groups.items():
+        user_inputs = {
+            "history": history.split("\n") if history else [""],
+            "inputs": [
                 {
-                    "checked_sentence": sample["checked_sentence"],
-                    "knowledge": sample["knowledge"],
-                    "text": sample["text"],
+                    "checked_sentence": batch[sample_id]["checked_sentence"],
+                    "knowledge": batch[sample_id]["knowledge"],
+                    "text": batch[sample_id]["text"],
                 }
-            )
+                for sample_id in sample_ids
+            ],
+        }
         try:
             raw_responses = kg_script.run(user_inputs)
-            responses = [r["text"] for r in raw_responses]
-            logger.info(f"Current sample responses: {responses}")
+            for sample_id, raw_response in zip(sample_ids, raw_responses):
+                responses[sample_id] = raw_response["text"]
         except Exception as e:
             sentry_sdk.capture_exception(e)
             logger.exception(e)
+    return responses, len(history_groups)
+
+
+@app.route("/respond", methods=["POST"])
+def respond():
+    batch = request.json["batch"]
+    responses = [""]
+    random.seed(42)
+    st_time = time.time()
+    if batch:
+        responses, n_histories = generate_responses(batch)
+        logger.info(f"Current sample responses: {responses}")
+        total_time = time.time() - st_time
+        logger.info(
+            f"knowledge grounding batch of {len(batch)} samples with {n_histories} histories exec time: "
+            f"{total_time:.3f}s, {len(batch) / total_time:.1f} samples/s"
+        )
     else:
         logger.info("Received empty batch, exiting with empty responses")
-    total_time = time.time() - st_time
-    logger.info(f"knowledge grounding one batch exec time: {total_time:.3f}s")
     return jsonify(responses)
@@ -0,0 +1,38 @@
+#!/usr/bin/env python
+
+import time
+
+import numpy as np
+import requests
+
+URL = "http://0.0.0.0:8083/respond"
+
+SAMPLE = {
+    "checked_sentence": "Penguins are a group of aquatic flightless birds.",
+    "knowledge": "Penguins are a group of aquatic flightless birds.",
+    "text": "Who are penguins?",
+}
+
+
+def main_test():
+    loops = 5
+    for batch_size in [1, 2, 4, 8, 16]:
+        for n_histories in sorted({1, batch_size}):
+            batch = [
+                dict(SAMPLE, history=f"Hi! I'm from dialog {i % n_histories}.\nHello! Let's talk about birds.")
+                for i in range(batch_size)
+            ]
+            times = []
+            for i in range(loops):
+                start = time.time()
+                results = requests.post(URL, json={"batch": batch}).json()
+                times.append(time.time() - start)
+                assert len(results) == batch_size
+            print(
+                f"batch_size={batch_size} histories={n_histories}: mean latency {np.mean(times):.3f}s, "
+                f"throughput {batch_size / np.mean(times):.1f} samples/s"
+            )
+
+
+if __name__ == "__main__":
+    main_test()
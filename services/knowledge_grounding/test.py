@@ -28,13 +28,18 @@ def test_knowledge_grounding():
         "she once said. Do you like her poetry?"
     )
 
+    # sample from another dialog with its own history
+    history3 = "Hi! Let's talk about penguins.\nSure! Do you like them?"
+
     request_data = {
         "batch": [
             {"checked_sentence": checked_sentence1, "knowledge": knowledge1, "text": text1, "history": history},
             {"checked_sentence": checked_sentence2, "knowledge": knowledge2, "text": text2, "history": history},
+            {"checked_sentence": checked_sentence2, "knowledge": knowledge2, "text": text2, "history": history3},
         ]
     }
     results = requests.post(url, json=request_data).json()
+    assert len(results) == 3, f"Got {len(results)} results for 3 samples"
     assert all(results), f"Got empty string among results"
     print("Got\n{}\nSuccess".format(results))
 
@@ -17,7 +17,10 @@ logger = logging.getLogger(__name__)
 
 PRETRAINED_MODEL_NAME_OR_PATH = os.environ.get("PRETRAINED_MODEL_NAME_OR_PATH")
 logging.info(f"PRETRAINED_MODEL_NAME_OR_PATH = {PRETRAINED_MODEL_NAME_OR_PATH}")
-MASK_ID = 103
+QUANTIZE_MODEL = int(os.environ.get("QUANTIZE_MODEL", 0))
+TOP_K = 10
+# torch.inference_mode appeared in torch 1.9, older versions fall back to no_grad
+inference_mode = getattr(torch, "inference_mode", torch.no_grad)
 try:
     cuda = torch.cuda.is_available()
     if cuda:
@@ -34,6 +37,12 @@ try:
     model.eval()
     if cuda:
         model.cuda()
+    elif QUANTIZE_MODEL:
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        logger.info("masked_lm model is quantized to int8")
+    mask_id = tokenizer.mask_token_id
+    # decoded tokens are looked up by id instead of one tokenizer.decode call per predicted token
+    vocab = [tokenizer.decode([token_id]) for token_id in range(len(tokenizer))]
 
     logger.info("masked_lm model is ready")
 except Exception as e:
@@ -46,6 +55,29 @@ health = HealthCheck(app, "/healthcheck")
 logging.getLogger("werkzeug").setLevel("WARNING")
 
 
+def predict_masked_tokens(inputs):
+    with inference_mode():
+        hidden_states = model.bert(**inputs)[0]
+        masked_positions = inputs["input_ids"] == mask_id
+        # LM head and softmax are computed for the masked positions only, not for batch x seq_len x vocab
+        logits = model.cls(hidden_states[masked_positions])
+        probs = torch.nn.functional.softmax(logits, dim=-1)
+        top_probs, top_ids = probs.topk(TOP_K, dim=-1)
+    top_probs, top_ids = top_probs.cpu().tolist(), top_ids.cpu().tolist()
+    n_masks = masked_positions.sum(dim=1).cpu().tolist()
+
+    batch_predicted_tokens = []
+    start = 0
+    for n_mask in n_masks:
+        predicted_tokens = [
+            {vocab[token_id]: prob for token_id, prob in zip(token_ids, token_probs)}
+            for token_ids, token_probs in zip(top_ids[start : start + n_mask], top_probs[start : start + n_mask])
+        ]
+        batch_predicted_tokens.append(predicted_tokens)
+        start += n_mask
+    return batch_predicted_tokens
+
+
 @app.route("/respond", methods=["POST"])
 def respond():
     st_time = time.time()
@@ -54,19 +86,7 @@ def respond():
     try:
         inputs = tokenizer(text, return_tensors="pt", padding=True)
         inputs = {k: v.cuda() for k, v in inputs.items()} if cuda else inputs
-        logits = model(**inputs).logits.cpu()
-        probs = torch.nn.functional.softmax(logits, dim=2)
-
-        batch_predicted_tokens = []
-        for batch_i in range(probs.shape[0]):
-            masked_tokens = probs[batch_i][inputs["input_ids"][batch_i] == MASK_ID]
-            predicted_tokens = []
-            for token_id in range(masked_tokens.shape[0]):
-                token_probs, token_ids = masked_tokens[token_id].topk(10)
-                token_probs = token_probs.tolist()
-                token_ids = [tokenizer.decode([id]) for id in token_ids.tolist()]
-                predicted_tokens.append({token: prob for token, prob in zip(token_ids, token_probs)})
-            batch_predicted_tokens.append(predicted_tokens)
+        batch_predicted_tokens = predict_masked_tokens(inputs)
     except Exception as exc:
         logger.exception(exc)
         sentry_sdk.capture_exception(exc)
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+
+import os
+import time
+
+import numpy as np
+import torch
+
+os.environ.setdefault("PRETRAINED_MODEL_NAME_OR_PATH", "bert-base-uncased")
+
+from server import model, tokenizer, mask_id, predict_masked_tokens, inference_mode  # noqa: E402
+
+TEXT = "Hello, it's [MASK] dog from my [MASK]."
+
+
+def full_vocab_prediction(inputs):
+    # the previous implementation: softmax over batch x seq_len x vocab and one decode call per token
+    with inference_mode():
+        logits = model(**inputs).logits.cpu()
+    probs = torch.nn.functional.softmax(logits, dim=2)
+    batch_predicted_tokens = []
+    for batch_i in range(probs.shape[0]):
+        masked_tokens = probs[batch_i][inputs["input_ids"][batch_i] == mask_id]
+        predicted_tokens = []
+        for token_id in range(masked_tokens.shape[0]):
+            token_probs, token_ids = masked_tokens[token_id].topk(10)
+            token_ids = [tokenizer.decode([id]) for id in token_ids.tolist()]
+            predicted_tokens.append({token: prob for token, prob in zip(token_ids, token_probs.tolist())})
+        batch_predicted_tokens.append(predicted_tokens)
+    return batch_predicted_tokens, logits.numel() * logits.element_size()
+
+
+def main_test():
+    loops = 10
+    for batch_size in [1, 8, 32, 64]:
+        inputs = tokenizer([TEXT] * batch_size, return_tensors="pt", padding=True)
+        inputs = {k: v.to(next(model.parameters()).device) for k, v in inputs.items()}
+        n_masks = int((inputs["input_ids"] == mask_id).sum())
+        masked_logits_size = n_masks * len(tokenizer) * 4
+        full_times, masked_times = [], []
+        for i in range(loops):
+            start = time.time()
+            full_result, full_logits_size = full_vocab_prediction(inputs)
+            full_times.append(time.time() - start)
+            start = time.time()
+            masked_result = predict_masked_tokens(inputs)
+            masked_times.append(time.time() - start)
+        assert [list(tokens) for tokens in full_result[0]] == [list(tokens) for tokens in masked_result[0]]
+        print(
+            f"batch_size={batch_size}: "
+            f"full vocab {np.mean(full_times):.3f}s, logits {full_logits_size / 2 ** 20:.1f}MB; "
+            f"masked only {np.mean(masked_times):.3f}s, logits {masked_logits_size / 2 ** 20:.1f}MB"
+        )
+
+
+if __name__ == "__main__":
+    main_test()
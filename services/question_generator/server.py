@@ -5,6 +5,7 @@ import os
 from utils import QGTokenizer
 
 import torch
+from cachetools import LRUCache
 from transformers import T5Config, T5ForConditionalGeneration
 from flask import Flask, request, jsonify
 import sentry_sdk
@@ -19,6 +20,8 @@ logger = logging.getLogger(__name__)
 MODEL_PATH = os.environ.get("MODEL_PATH", "/data/model.pth")
 BASE_MODEL = os.environ.get("BASE_MODEL", "t5-base")
 DECODING = os.environ.get("DECODING", "greedy")  # greedy, topk-N (e.g., topk-10)
+BATCH_SIZE = int(os.environ.get("BATCH_SIZE", 16))
+CACHE_SIZE = int(os.environ.get("CACHE_SIZE", 0))  # 0 disables cache of generated questions
 
 cuda = torch.cuda.is_available()
 if cuda:
@@ -45,26 +48,76 @@ logger.info(f"question generation model is ready")
 app = Flask(__name__)
 
 
+cache = LRUCache(maxsize=CACHE_SIZE) if CACHE_SIZE else None
+
+
+def generate(input_ids, attention_mask, decoding):
+    if decoding == "greedy":
+        return model.generate(input_ids, attention_mask=attention_mask, max_length=t.max_tgt_len)
+    elif "topk-" in decoding:
+        k = int(decoding.split("-")[1])
+        return model.generate(
+            input_ids, attention_mask=attention_mask, top_k=k, do_sample=True, max_length=t.max_tgt_len
+        )
+    else:
+        raise RuntimeError(f"Unknown decoding algo: {decoding}")
+
+
+def postprocess(question):
+    question = t.tokenizer.decode(question)
+    return question.replace("<pad>", "").replace("question:", "").replace("</s>", "").strip()
+
+
+def generate_questions(samples, decoding=DECODING):
+    """Generate questions for (text, answer) samples in batches of inputs with similar lengths."""
+    questions = [None] * len(samples)
+    keys = [(sample["text"], sample["answer"], decoding) for sample in samples]
+    if cache is not None:
+        for i, key in enumerate(keys):
+            questions[i] = cache.get(key)
+    not_cached = [i for i, question in enumerate(questions) if question is None]
+    tokenized = {i: t(samples[i])["input_ids"] for i in not_cached}
+    # length bucketing: neighbours by length share a batch, so little padding is added
+    not_cached = sorted(not_cached, key=lambda i: len(tokenized[i]))
+    for start in range(0, len(not_cached), BATCH_SIZE):
+        bucket = not_cached[start : start + BATCH_SIZE]
+        max_len = max(len(tokenized[i]) for i in bucket)
+        input_ids = [tokenized[i] + [t.tokenizer.pad_token_id] * (max_len - len(tokenized[i])) for i in bucket]
+        attention_mask = [[1] * len(tokenized[i]) + [0] * (max_len - len(tokenized[i])) for i in bucket]
+        outputs = generate(torch.tensor(input_ids).to(device), torch.tensor(attention_mask).to(device), decoding)
+        for i, output in zip(bucket, outputs):
+            questions[i] = postprocess(output)
+            if cache is not None:
+                cache[keys[i]] = questions[i]
+    return questions
+
+
 @app.route("/question", methods=["POST"])
 def respond():
     st_time = time.time()
 
     text = request.json["text"]
     answer = request.json["answer"]
-    sample = {"text": text, "answer": answer}
-    input_ids = t(sample)["input_ids"]
-    input_ids_t = torch.tensor([input_ids]).to(device)
-    if DECODING == "greedy":
-        question = model.generate(input_ids_t, max_length=t.max_tgt_len)[0]
-    elif "topk-" in DECODING:
-        k = int(DECODING.split("-")[1])
-        question = model.generate(input_ids_t, top_k=k, do_sample=True, max_length=t.max_tgt_len)[0]
-    else:
-        raise RuntimeError(f"Unknown decoding algo: {DECODING}")
-    question = t.tokenizer.decode(question)
-    question = question.replace("<pad>", "").replace("question:", "").replace("</s>", "").strip()
+    decoding = request.json.get("decoding", DECODING)
+    question = generate_questions([{"text": text, "answer": answer}], decoding)[0]
 
     logger.info(question)
     total_time = time.time() - st_time
     logger.info(f"question generation exec time: {total_time:.3f}s")
     return jsonify({"question": question})
+
+
+@app.route("/question_batch", methods=["POST"])
+def respond_batch():
+    st_time = time.time()
+
+    texts = request.json["text"]
+    answers = request.json["answer"]
+    decoding = request.json.get("decoding", DECODING)
+    samples = [{"text": text, "answer": answer} for text, answer in zip(texts, answers)]
+    questions = generate_questions(samples, decoding)
+
+    logger.info(questions)
+    total_time = time.time() - st_time
+    logger.info(f"question generation exec time for batch of {len(samples)}: {total_time:.3f}s")
+    return jsonify([{"question": question} for question in questions])
@@ -0,0 +1,37 @@
+#!/usr/bin/env python
+
+import time
+
+import requests
+
+TEXT = (
+    "Lipa was born on 22 August 1995 in London to Kosovar Albanian parents who had moved from Pristina, "
+    "FR Yugoslavia in 1992. Her father—Dukagjin Lipa—is a marketing manager and the lead vocalist in the "
+    "Kosovan rock band Oda, while her mother—Anesa Lipa (née Rexha)—works in tourism."
+)
+ANSWERS = ["22 August 1995", "London", "Kosovar Albanian", "1992", "a marketing manager", "Oda", "tourism"]
+
+
+def main_test():
+    url = "http://0.0.0.0:8079"
+    for decoding in ["greedy", "topk-10"]:
+        for batch_size in [1, 4, 8, 16, 32]:
+            answers = [ANSWERS[i % len(ANSWERS)] + " " * (i // len(ANSWERS)) for i in range(batch_size)]
+            start = time.time()
+            for answer in answers:
+                requests.post(f"{url}/question", json={"text": TEXT, "answer": answer, "decoding": decoding})
+            single_time = time.time() - start
+            start = time.time()
+            requests.post(
+                f"{url}/question_batch", json={"text": [TEXT] * batch_size, "answer": answers, "decoding": decoding}
+            )
+            batch_time = time.time() - start
+            print(
+                f"decoding={decoding} batch_size={batch_size}: "
+                f"single requests {batch_size / single_time:.2f} questions/s, "
+                f"batch request {batch_size / batch_time:.2f} questions/s"
+            )
+
+
+if __name__ == "__main__":
+    main_test()
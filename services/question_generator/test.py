@@ -19,6 +19,11 @@ def test_question_generator():
     gold_result = {"question": "What is Lipa's father's job?"}
 
     assert result == gold_result, f"Got\n{result}\n, but expected:\n{gold_result}"
+
+    batch_url = "http://0.0.0.0:8079/question_batch"
+    request_data = {"text": [text, text], "answer": [answer, "London"]}
+    result = requests.post(batch_url, json=request_data).json()
+    assert len(result) == 2 and result[0] == gold_result, f"Got\n{result}\n, but expected:\n{gold_result}"
     print("Success")
 
 
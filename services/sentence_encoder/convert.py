@@ -0,0 +1,31 @@
+import tensorflow_hub as tfhub
+import tensorflow as tf
+import tensorflow_text
+
+tensorflow_text.__name__
+
+
+class ConveRT:
+    """TF1 graph of ConveRT with `encode_context` and `encode_response` signatures."""
+
+    def __init__(self, model_path):
+        self.sess = tf.InteractiveSession(graph=tf.Graph())
+        module = tfhub.Module(model_path)
+        self.text_placeholder = tf.placeholder(dtype=tf.string, shape=[None])
+        self.extra_text_placeholder = tf.placeholder(dtype=tf.string, shape=[None])
+        self.context_encoding_tensor = module(
+            {"context": self.text_placeholder, "extra_context": self.extra_text_placeholder}, signature="encode_context"
+        )
+        self.response_text_placeholder = tf.placeholder(dtype=tf.string, shape=[None])
+        self.response_encoding_tensor = module(self.response_text_placeholder, signature="encode_response")
+        self.sess.run(tf.tables_initializer())
+        self.sess.run(tf.global_variables_initializer())
+
+    def encode_contexts(self, contexts, extra_contexts):
+        return self.sess.run(
+            self.context_encoding_tensor,
+            feed_dict={self.text_placeholder: list(contexts), self.extra_text_placeholder: list(extra_contexts)},
+        )
+
+    def encode_responses(self, texts):
+        return self.sess.run(self.response_encoding_tensor, feed_dict={self.response_text_placeholder: list(texts)})
@@ -0,0 +1,105 @@
+import hashlib
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+from cachetools import LRUCache
+
+logger = logging.getLogger(__name__)
+
+CONTEXT = "context"
+RESPONSE = "response"
+
+
+def split_history(dialog_history):
+    """ConveRT context features: the last utterance and the previous ones in reversed order."""
+    extra_context = list(dialog_history[:-1])
+    extra_context.reverse()
+    return dialog_history[-1], " ".join(extra_context)
+
+
+def get_key(kind, *texts):
+    return kind, hashlib.sha1("\n".join(texts).encode("utf-8")).hexdigest()
+
+
+class SentenceEncoder:
+    """Context and response encoder with an LRU cache and micro-batching of concurrent calls.
+
+    `encode_contexts(contexts, extra_contexts)` and `encode_responses(texts)` are the batch functions of the model.
+    Calls from different threads waiting for at most `batch_wait` seconds are encoded with one model call per kind,
+    the texts already encoded or being encoded for another caller are not encoded again.
+    """
+
+    def __init__(self, encode_contexts, encode_responses, cache_size=100000, max_batch_size=64, batch_wait=0.005):
+        self.encoders = {CONTEXT: encode_contexts, RESPONSE: encode_responses}
+        self.cache = LRUCache(maxsize=cache_size)
+        self.max_batch_size = max_batch_size
+        self.batch_wait = batch_wait
+        self.lock = threading.Lock()
+        # futures of the texts which are queued or being encoded
+        self.pending = {}
+        self.queue = queue.Queue()
+        self.n_model_calls = 0
+        self.n_encoded = 0
+        threading.Thread(target=self.run, daemon=True).start()
+
+    def encode_contexts(self, dialog_histories):
+        return self.encode(dialog_histories, [])[0]
+
+    def encode_responses(self, texts):
+        return self.encode([], texts)[1]
+
+    def encode(self, dialog_histories, responses):
+        """Return encodings of the contexts of the dialog histories and of the responses."""
+        items = [(get_key(CONTEXT, *split_history(history)), split_history(history)) for history in dialog_histories]
+        items += [(get_key(RESPONSE, text), (text,)) for text in responses]
+        results = []
+        with self.lock:
+            for key, features in items:
+                encoding = self.cache.get(key)
+                if encoding is None:
+                    encoding = self.pending.get(key)
+                    if encoding is None:
+                        encoding = self.pending[key] = Future()
+                        self.queue.put((key, features))
+                results.append(encoding)
+        results = [result.result() if isinstance(result, Future) else result for result in results]
+        empty = np.zeros((0, 0), dtype=np.float32)
+        context_encodings = np.stack(results[: len(dialog_histories)]) if dialog_histories else empty
+        response_encodings = np.stack(results[len(dialog_histories) :]) if responses else empty
+        return context_encodings, response_encodings
+
+    def get_batch(self):
+        batch = [self.queue.get()]
+        deadline = time.time() + self.batch_wait
+        while len(batch) < self.max_batch_size:
+            try:
+                batch.append(self.queue.get(timeout=max(deadline - time.time(), 0)))
+            except queue.Empty:
+                break
+        return batch
+
+    def run(self):
+        while True:
+            batch = self.get_batch()
+            for kind, encoder in self.encoders.items():
+                items = [(key, features) for key, features in batch if key[0] == kind]
+                if not items:
+                    continue
+                try:
+                    encodings = np.asarray(encoder(*zip(*[features for _, features in items])))
+                    self.n_model_calls += 1
+                    self.n_encoded += len(items)
+                except Exception as e:
+                    logger.exception(e)
+                    with self.lock:
+                        for key, _ in items:
+                            self.pending.pop(key).set_exception(e)
+                    continue
+                with self.lock:
+                    for (key, _), encoding in zip(items, encodings):
+                        self.cache[key] = encoding
+                        self.pending.pop(key).set_result(encoding)
@@ -0,0 +1,58 @@
+import logging
+import time
+import os
+
+from flask import Flask, request, jsonify
+from healthcheck import HealthCheck
+import sentry_sdk
+from sentry_sdk.integrations.flask import FlaskIntegration
+
+from encoder import SentenceEncoder
+
+sentry_sdk.init(dsn=os.getenv("SENTRY_DSN"), integrations=[FlaskIntegration()])
+
+
+logging.basicConfig(format="%(asctime)s - %(name)s - %(levelname)s - %(message)s", level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MODEL_PATH = os.getenv("MODEL_PATH")
+CACHE_SIZE = int(os.getenv("CACHE_SIZE", 100000))
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", 64))
+BATCH_WAIT = float(os.getenv("BATCH_WAIT", 0.005))
+
+try:
+    from convert import ConveRT
+
+    model = ConveRT(MODEL_PATH)
+    encoder = SentenceEncoder(
+        model.encode_contexts,
+        model.encode_responses,
+        cache_size=CACHE_SIZE,
+        max_batch_size=MAX_BATCH_SIZE,
+        batch_wait=BATCH_WAIT,
+    )
+    encoder.encode([["hello"]], ["hello"])
+    logger.info("sentence_encoder is ready")
+except Exception as e:
+    sentry_sdk.capture_exception(e)
+    logger.exception(e)
+    raise e
+
+app = Flask(__name__)
+health = HealthCheck(app, "/healthcheck")
+logging.getLogger("werkzeug").setLevel("WARNING")
+
+
+@app.route("/encode", methods=["POST"])
+def encode():
+    """Encodings of the contexts (dialog histories in chronological order) and of the responses.
+
+    Every unique context and response is encoded once for all the services, repeated ones come from the cache.
+    """
+    st_time = time.time()
+    contexts = request.json.get("contexts", [])
+    responses = request.json.get("responses", [])
+    context_encodings, response_encodings = encoder.encode(contexts, responses)
+    total_time = time.time() - st_time
+    logger.info(f"sentence_encoder exec time: {total_time:.3f}s")
+    return jsonify({"context_encodings": context_encodings.tolist(), "response_encodings": response_encodings.tolist()})
@@ -0,0 +1,23 @@
+import numpy as np
+import requests
+
+
+def test_encode():
+    url = "http://0.0.0.0:8122/encode"
+    contexts = [["hi", "hello! how are you?", "fine, let's talk about movies"]]
+    responses = ["i like movies", "what is your favorite book?"]
+
+    result = requests.post(url, json={"contexts": contexts, "responses": responses}).json()
+    context_encodings = np.array(result["context_encodings"])
+    response_encodings = np.array(result["response_encodings"])
+    assert context_encodings.shape == (1, 512) and response_encodings.shape == (2, 512), result
+    scores = context_encodings.dot(response_encodings.T)[0]
+    assert scores[0] > scores[1], scores
+
+    cached_result = requests.post(url, json={"responses": responses[::-1]}).json()
+    assert cached_result["response_encodings"] == result["response_encodings"][::-1]
+    print("Success")
+
+
+if __name__ == "__main__":
+    test_encode()
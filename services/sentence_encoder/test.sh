@@ -0,0 +1,4 @@
+#!/bin/bash
+
+python test_encoder.py
+python test.py
@@ -0,0 +1,68 @@
+import threading
+import time
+
+import numpy as np
+
+from encoder import SentenceEncoder, split_history
+
+EMBEDDING_DIM = 8
+# overhead of one call of the tensorflow session
+ENCODE_CALL_TIME = 0.01
+
+
+class StubModel:
+    """Tiny deterministic encoder which counts the encoded texts."""
+
+    def __init__(self):
+        self.encoded_texts = []
+
+    def embed(self, text):
+        return np.random.RandomState(sum(map(ord, text)) % 2**32).rand(EMBEDDING_DIM).astype(np.float32)
+
+    def encode_contexts(self, contexts, extra_contexts):
+        time.sleep(ENCODE_CALL_TIME)
+        self.encoded_texts += list(contexts)
+        return np.stack([self.embed(c) + self.embed(e) for c, e in zip(contexts, extra_contexts)])
+
+    def encode_responses(self, texts):
+        time.sleep(ENCODE_CALL_TIME)
+        self.encoded_texts += list(texts)
+        return np.stack([self.embed(text) for text in texts])
+
+
+def test_encoder():
+    model = StubModel()
+    encoder = SentenceEncoder(model.encode_contexts, model.encode_responses, batch_wait=0.02)
+    history = ["hi", "hello! how are you?", "fine, let's talk about movies"]
+    responses = ["i like movies", "what is your favorite movie?", "i like movies"]
+
+    context_encodings, response_encodings = encoder.encode([history], responses)
+    assert np.allclose(context_encodings[0], model.encode_contexts(*zip(split_history(history))))
+    assert np.allclose(response_encodings, model.encode_responses(responses))
+    # repeated response is encoded once, one model call per kind
+    assert encoder.n_encoded == 3 and encoder.n_model_calls == 2, (encoder.n_encoded, encoder.n_model_calls)
+
+    # the same turn is scored by 8 services at once: new texts are encoded once in one batch, old are cached
+    n_callers = 8
+    new_responses = [f"response {i}" for i in range(4)]
+    results = [None] * n_callers
+
+    def call(i):
+        results[i] = encoder.encode([history], new_responses + responses)
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(n_callers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(np.array_equal(result[1], results[0][1]) for result in results)
+    assert results[0][1].shape == (len(new_responses) + len(responses), EMBEDDING_DIM)
+    assert encoder.n_encoded == 3 + len(new_responses), encoder.n_encoded
+    assert encoder.n_model_calls == 3, encoder.n_model_calls
+
+    assert encoder.encode_contexts([]).shape == (0, 0)
+    print("Success")
+
+
+if __name__ == "__main__":
+    test_encoder()
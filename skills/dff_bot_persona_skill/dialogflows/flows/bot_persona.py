@@ -6,7 +6,6 @@ import random
 import re
 
 import sentry_sdk
-from spacy import load
 
 from dff import dialogflow_extension
 import common.dialogflow_framework.utils.state as state_utils
@@ -31,9 +30,6 @@ logging.basicConfig(format="%(asctime)s - %(name)s - %(levelname)s - %(message)s
 logger = logging.getLogger(__name__)
 
 
-spacy_nlp = load("en_core_web_sm")
-
-
 with open("common/topic_favorites.json", "r") as f:
     FAV_STORIES_TOPICS = json.load(f)
 
@@ -9,7 +9,6 @@ from common.fact_random import get_fact
 from enum import Enum, auto
 
 import sentry_sdk
-from spacy import load
 
 from dff import dialogflow_extension
 import common.dialogflow_framework.utils.state as state_utils
@@ -17,7 +16,7 @@ import common.dialogflow_framework.utils.condition as condition_utils
 import dialogflows.scopes as scopes
 from common.universal_templates import if_chat_about_particular_topic, DONOTKNOW_LIKE, COMPILE_NOT_WANT_TO_TALK_ABOUT_IT
 from common.constants import CAN_CONTINUE_SCENARIO, CAN_CONTINUE_PROMPT, MUST_CONTINUE, CAN_NOT_CONTINUE
-from common.utils import is_yes, is_no, get_entities, join_words_in_or_pattern
+from common.utils import is_yes, is_no, get_entities, join_words_in_or_pattern, get_spacy_annotations
 from common.food import (
     TRIGGER_PHRASES,
     FOOD_WORDS,
@@ -41,9 +40,6 @@ sentry_sdk.init(dsn=os.getenv("SENTRY_DSN"))
 logger = logging.getLogger(__name__)
 
 
-spacy_nlp = load("en_core_web_sm")
-
-
 with open("cuisines_facts.json", "r") as f:
     CUISINES_FACTS = json.load(f)
 
@@ -290,9 +286,9 @@ def what_cuisine_response(vars):
 def cuisine_request(ngrams, vars):
     # nounphr = get_entities(state_utils.get_last_human_utterance(vars), only_named=False, with_labels=False)
     # flag = bool(nounphr)
-    utt = state_utils.get_last_human_utterance(vars)["text"].lower()
-    spacy_utt = spacy_nlp(utt)
-    utt_adj = any([w.pos_ == "ADJ" for w in spacy_utt])
+    last_utt = state_utils.get_last_human_utterance(vars)
+    utt = last_utt["text"].lower()
+    utt_adj = "ADJ" in get_spacy_annotations(last_utt).get("pos", [])
     all_words = any([i in utt for i in ["all", "many", "multiple"]])
     flag = any([utt_adj, check_conceptnet(vars)[0], all_words]) and (
         not any([bool(re.search(NO_WORDS_RE, utt)), dont_want_talk(vars)])
@@ -308,7 +304,7 @@ def cuisine_fact_response(vars):
         last_utt = state_utils.get_last_human_utterance(vars)
         last_utt_lower = last_utt["text"].lower()
         conceptnet_flag, food_item = check_conceptnet(vars)
-        if any([w.pos_ == "ADJ" for w in spacy_nlp(last_utt_lower)]):
+        if "ADJ" in get_spacy_annotations(last_utt).get("pos", []):
             for cuisine in list(CUISINES_FACTS.keys()):
                 if cuisine in last_utt_lower:
                     cuisine_fact = CUISINES_FACTS.get(cuisine, "")
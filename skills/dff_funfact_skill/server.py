@@ -11,6 +11,7 @@ from healthcheck import HealthCheck
 from sentry_sdk.integrations.logging import ignore_logger
 
 import test_server
+from common.metrics import setup_metrics
 from common.dff.integration.actor import load_ctxs, get_response
 from scenario.main import actor
 
@@ -28,6 +29,7 @@ logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 health = HealthCheck(app, "/healthcheck")
+setup_metrics(app)
 logging.getLogger("werkzeug").setLevel("WARNING")
 
 
@@ -239,8 +239,9 @@ def get_people_related_to_bot_mentioned_ones(vars, user_mentioned_person):
 
     people_mentioned_and_liked_by_bot = get_mentioned_people(vars, "people_mentioned_by_bot", ["Liked", "Disliked"])
 
+    relationships = utils.get_relationships(user_mentioned_person, people_mentioned_and_liked_by_bot)
     for person in people_mentioned_and_liked_by_bot:
-        relationship = utils.get_relationship_between_two_people(user_mentioned_person, person)
+        relationship = relationships[person]
         if relationship:
             related_people.append([person, relationship])
 
@@ -258,8 +259,9 @@ def get_people_related_to_user_mentioned_ones(vars, user_mentioned_person):
 
     people_mentioned_and_liked_by_user = get_mentioned_people(vars, "people_mentioned_by_user", ["Liked", "Disliked"])
 
+    relationships = utils.get_relationships(user_mentioned_person, people_mentioned_and_liked_by_user)
     for person in people_mentioned_and_liked_by_user:
-        relationship = utils.get_relationship_between_two_people(user_mentioned_person, person)
+        relationship = relationships[person]
         if relationship:
             related_people.append([person, relationship])
 
@@ -1,4 +1,5 @@
 # %%
+import itertools
 import os
 import logging
 import re
@@ -6,6 +7,7 @@ import re
 import requests
 
 import sentry_sdk
+from cachetools import TTLCache
 
 import common.dialogflow_framework.utils.state as state_utils
 import common.custom_requests as custom_requests
@@ -15,6 +17,7 @@ import common.utils as common_utils
 import dialogflows.scenarios.gossip as this_gossip
 
 import common.gossip as common_gossip
+from common.metrics import count_cache_request
 
 sentry_sdk.init(dsn=os.getenv("SENTRY_DSN"))
 
@@ -23,8 +26,30 @@ WIKIDATA_URL = os.getenv("WIKIDATA_URL")
 assert ENTITY_LINKING_URL, ENTITY_LINKING_URL
 assert WIKIDATA_URL, WIKIDATA_URL
 
+PERSON_PROFILE_CACHE_SIZE = int(os.getenv("PERSON_PROFILE_CACHE_SIZE", 2000))
+PERSON_PROFILE_CACHE_TTL = int(os.getenv("PERSON_PROFILE_CACHE_TTL", 24 * 60 * 60))
+# empty results may be caused by a failure of the services, so they are kept for a short time
+MISSING_PERSON_PROFILE_CACHE_TTL = int(os.getenv("MISSING_PERSON_PROFILE_CACHE_TTL", 10 * 60))
+# wiki parser runs the queries of a request one by one
+WIKI_PARSER_TIMEOUT = float(os.getenv("WIKI_PARSER_TIMEOUT", 0.8))
+WIKI_PARSER_QUERY_TIMEOUT = float(os.getenv("WIKI_PARSER_QUERY_TIMEOUT", 0.2))
+WIKI_PARSER_MAX_TIMEOUT = float(os.getenv("WIKI_PARSER_MAX_TIMEOUT", 1.5))
+
 logger = logging.getLogger(__name__)
 
+# long-lived session keeps connections to entity linking and wiki parser alive between requests
+session = requests.Session()
+# (person, context) -> entity ids
+entity_ids_cache = TTLCache(maxsize=PERSON_PROFILE_CACHE_SIZE, ttl=PERSON_PROFILE_CACHE_TTL)
+# (person, context) -> wiki parser entities info
+entities_info_cache = TTLCache(maxsize=PERSON_PROFILE_CACHE_SIZE, ttl=PERSON_PROFILE_CACHE_TTL)
+# (person_1, person_2) -> relationship
+relationships_cache = TTLCache(maxsize=PERSON_PROFILE_CACHE_SIZE, ttl=PERSON_PROFILE_CACHE_TTL)
+# keys of the caches above with empty values
+missing_entity_ids_cache = TTLCache(maxsize=PERSON_PROFILE_CACHE_SIZE, ttl=MISSING_PERSON_PROFILE_CACHE_TTL)
+missing_entities_info_cache = TTLCache(maxsize=PERSON_PROFILE_CACHE_SIZE, ttl=MISSING_PERSON_PROFILE_CACHE_TTL)
+missing_relationships_cache = TTLCache(maxsize=PERSON_PROFILE_CACHE_SIZE, ttl=MISSING_PERSON_PROFILE_CACHE_TTL)
+
 DIALOG_BEGINNING_START_CONFIDENCE = 0.98
 DIALOG_BEGINNING_CONTINUE_CONFIDENCE = 0.9
 DIALOG_BEGINNING_SHORT_ANSWER_CONFIDENCE = 0.98
@@ -42,115 +67,198 @@ HIGH_CONFIDENCE = 0.98
 ##################################################################################################################
 
 
-def request_el_wp_entities(person, utterance):
-    entities_info = {}
-    try:
-        el_output = requests.post(
+def is_cached(key, cache, missing_cache):
+    return key in cache or key in missing_cache
+
+
+def cache_value(key, value, cache, missing_cache):
+    """Cache the value, empty values are kept in `missing_cache` with the short TTL to be requested again soon."""
+    if value:
+        cache[key] = value
+    else:
+        missing_cache[key] = value
+    return value
+
+
+def get_entity_ids(entity_info_list, n_persons):
+    """Entity ids of every person from the entity linking output for one sample, both output formats are supported."""
+    entity_ids = [[] for _ in range(n_persons)]
+    if entity_info_list and isinstance(entity_info_list[0], dict):
+        for i, entity_info in enumerate(entity_info_list[:n_persons]):
+            entity_ids[i] = entity_info.get("entity_ids", []) if entity_info else []
+    elif entity_info_list and isinstance(entity_info_list[0], list):
+        for i, person_entity_ids in enumerate(entity_info_list[0][:n_persons]):
+            entity_ids[i] = person_entity_ids or []
+    return entity_ids
+
+
+def link_persons(persons_by_context):
+    """Entity ids by (person, context), persons of all the contexts are linked with one entity linking request."""
+    entity_ids = {}
+    samples = []
+    for context, persons in persons_by_context.items():
+        persons = list(dict.fromkeys(persons))
+        for person in persons:
+            if is_cached((person, context), entity_ids_cache, missing_entity_ids_cache):
+                entity_ids[(person, context)] = entity_ids_cache.get((person, context), [])
+        missing_persons = [person for person in persons if (person, context) not in entity_ids]
+        if missing_persons:
+            samples.append((context, missing_persons))
+    if samples:
+        el_output = session.post(
             ENTITY_LINKING_URL,
-            json={"entity_substr": [[person]], "template": [""], "context": [[utterance]]},
+            json={
+                "entity_substr": [persons for _, persons in samples],
+                "template": [""] * len(samples),
+                "context": [[context] for context, _ in samples],
+            },
             timeout=0.8,
         ).json()
-        entity_info = el_output and el_output[0] and el_output[0][0]
-        if isinstance(entity_info, list) and entity_info and entity_info[0]:
-            entity_ids = entity_info[0]
-            entity_id = entity_ids[0]
-            wp_output = requests.post(
-                WIKIDATA_URL,
-                json={"parser_info": ["find_top_triplets"], "query": [[[entity_id]]]},
-                timeout=0.8,
-            ).json()
-        elif isinstance(entity_info, dict):
-            entity_ids = entity_info.get("entity_ids", [])
-            entity_id = entity_ids and entity_ids[0]
-            wp_output = (
-                entity_id
-                and requests.post(
-                    WIKIDATA_URL,
-                    json={
-                        "parser_info": ["find_top_triplets"],
-                        "query": [[{"entity_substr": person, "entity_ids": [entity_id]}]],
-                    },
-                    timeout=0.8,
-                ).json()
-            )
-        else:
-            raise Exception(entities_info)
-        entities_info = wp_output and wp_output[0].get("entities_info", {})
-    except Exception as exc:
-        msg = f"request_el_wp_entities exception: {exc}"
-        logger.debug(msg)
-        sentry_sdk.capture_message(msg)
-    return entities_info if entities_info else {}
+        for (context, persons), entity_info_list in zip(samples, el_output):
+            for person, person_entity_ids in zip(persons, get_entity_ids(entity_info_list, len(persons))):
+                entity_ids[(person, context)] = cache_value(
+                    (person, context), person_entity_ids, entity_ids_cache, missing_entity_ids_cache
+                )
+    return entity_ids
 
 
-def get_relationship_between_two_people(person_1, person_2):
-    wp_output = []
+def fetch_persons_info(persons, utterance="", pairs=()):
+    """Fill the caches with one entity linking and one wiki parser request for all the given persons and pairs.
+
+    Triplets of `persons` are found for the entities linked in the context of `utterance`,
+    relationships of `pairs` of persons are found for the entities linked without context, as before.
+    """
     try:
-        persons = [person_1, person_2]
-        el_output = requests.post(
-            ENTITY_LINKING_URL,
-            json={"entity_substr": [persons], "template": [""], "context": [[""]]},
-            timeout=0.8,
-        ).json()
-        entity_info_list = el_output and el_output[0]
-        if entity_info_list:
-            if (
-                isinstance(entity_info_list[0], list)
-                and len(entity_info_list[0]) == 2
-                and entity_info_list[0][0]
-                and entity_info_list[0][1]
-            ):
-                entities1, entities2 = entity_info_list[0]
-            if isinstance(entity_info_list[0], dict) and len(entity_info_list) == 2:
-                entities1, entities2 = entity_info_list
-                entities1 = entities1.get("entity_ids", [])
-                entities2 = entities2.get("entity_ids", [])
-
-        wp_output = requests.post(
-            WIKIDATA_URL,
-            json={"parser_info": ["find_connection"], "query": [[entities1, entities2]]},
-            timeout=0.8,
+        persons_by_context = {utterance: list(persons)}
+        persons_by_context[""] = persons_by_context.get("", []) + [person for pair in pairs for person in pair]
+        entity_ids = link_persons(persons_by_context)
+
+        parser_info, queries, keys = [], [], []
+        for person in persons:
+            person_entity_ids = entity_ids.get((person, utterance), [])
+            if person_entity_ids:
+                parser_info.append("find_top_triplets")
+                queries.append([{"entity_substr": person, "entity_ids": person_entity_ids[:1]}])
+                keys.append((person, utterance))
+            else:
+                cache_value((person, utterance), {}, entities_info_cache, missing_entities_info_cache)
+        for pair in pairs:
+            entities1, entities2 = entity_ids.get((pair[0], ""), []), entity_ids.get((pair[1], ""), [])
+            if entities1 and entities2:
+                parser_info.append("find_connection")
+                queries.append([entities1, entities2])
+                keys.append(pair)
+            else:
+                cache_value(pair, "", relationships_cache, missing_relationships_cache)
+        if not queries:
+            return
+        timeout = min(WIKI_PARSER_TIMEOUT + WIKI_PARSER_QUERY_TIMEOUT * (len(queries) - 1), WIKI_PARSER_MAX_TIMEOUT)
+        wp_output = session.post(
+            WIKIDATA_URL, json={"parser_info": parser_info, "query": queries}, timeout=timeout
         ).json()
+        for info_type, key, query_output in zip(parser_info, keys, wp_output):
+            if info_type == "find_top_triplets":
+                entities_info = (query_output and query_output.get("entities_info", {})) or {}
+                cache_value(key, entities_info, entities_info_cache, missing_entities_info_cache)
+            else:
+                relationship = (query_output and query_output[0]) or ""
+                cache_value(key, relationship, relationships_cache, missing_relationships_cache)
     except Exception as exc:
-        msg = f"request_relationship_between_two_people exception: {exc}"
+        msg = f"fetch_persons_info exception: {exc}"
         logger.debug(msg)
         sentry_sdk.capture_message(msg)
 
-    relationship = wp_output and wp_output[0] and wp_output[0][0]
 
-    return relationship
+def make_person_profile(entities_info):
+    profile = {
+        "entities_info": entities_info,
+        "occupations": [],
+        "gender": "unknown",
+        "age": 0,
+        "sport": [[]],
+        "teams": [[]],
+        "spouse": "",
+        "partner": "",
+    }
+    for entity_label in entities_info:
+        triplets = entities_info[entity_label]
+        if "occupation" in triplets:
+            profile["occupations"] += [triplets["occupation"]]
+        gender = triplets.get("gender", [])
+        gender = gender and gender[0] and gender[0][1]
+        profile["gender"] = gender if gender else "they"
+        profile["age"] = triplets.get("age", 0)
+        profile["sport"] = triplets.get("sport", [[]])
+        profile["teams"] = triplets.get("member of sports team", [[]])
+        spouse = triplets.get("spouse", [])
+        partner = triplets.get("partner", [])
+        profile["spouse"] = spouse[0][1] if spouse else None
+        profile["partner"] = partner[0][1] if partner else None
+    return profile
+
+
+def get_person_profiles(persons, utterance="", related_persons=()):
+    """Profiles of the persons: occupations, gender, age, sport, teams, spouse, partner and relationships
+    to `related_persons`. All the persons are resolved together and kept in the TTL caches.
+    """
+    missing_persons = []
+    for person in dict.fromkeys(persons):
+        hit = is_cached((person, utterance), entities_info_cache, missing_entities_info_cache)
+        count_cache_request("gossip_person_profile", hit)
+        if not hit:
+            missing_persons.append(person)
+    missing_pairs = []
+    for pair in itertools.product(dict.fromkeys(persons), dict.fromkeys(related_persons)):
+        hit = is_cached(pair, relationships_cache, missing_relationships_cache)
+        count_cache_request("gossip_relationships", hit)
+        if not hit:
+            missing_pairs.append(pair)
+    if missing_persons or missing_pairs:
+        fetch_persons_info(missing_persons, utterance, missing_pairs)
+
+    profiles = {}
+    for person in persons:
+        profiles[person] = make_person_profile(entities_info_cache.get((person, utterance), {}))
+        profiles[person]["relationships"] = {
+            related_person: relationships_cache.get((person, related_person), "") for related_person in related_persons
+        }
+    return profiles
+
+
+def get_person_profile(person, utterance=""):
+    return get_person_profiles([person], utterance)[person]
+
+
+def get_relationships(person, related_persons):
+    """Relationships between the person and each of `related_persons`, found with one round trip."""
+    missing_pairs = []
+    for related_person in dict.fromkeys(related_persons):
+        hit = is_cached((person, related_person), relationships_cache, missing_relationships_cache)
+        count_cache_request("gossip_relationships", hit)
+        if not hit:
+            missing_pairs.append((person, related_person))
+    if missing_pairs:
+        fetch_persons_info([], pairs=missing_pairs)
+    return {related_person: relationships_cache.get((person, related_person), "") for related_person in related_persons}
 
 
-def get_occupations_for_person_from_wiki_parser(person, utterance):
-    occupations = []
+def request_el_wp_entities(person, utterance):
+    return get_person_profile(person, utterance)["entities_info"]
 
-    entities_info = request_el_wp_entities(person, utterance)
 
-    logger.debug(f"Get Occupations: {entities_info}")
+def get_relationship_between_two_people(person_1, person_2):
+    return get_relationships(person_1, [person_2])[person_2]
 
-    for entity_label in entities_info:
-        triplets = entities_info[entity_label]
-        logger.debug(triplets)
-        if "occupation" in triplets:
-            occupations += [triplets["occupation"]]
 
+def get_occupations_for_person_from_wiki_parser(person, utterance):
+    occupations = get_person_profile(person, utterance)["occupations"]
+    logger.debug(f"Get Occupations: {occupations}")
     return occupations
 
 
 def get_gender_age_person(person, utterance):
-    gender = "unknown"
-    age = 0
-
-    entities_info = request_el_wp_entities(person, utterance)
-
-    for entity_label in entities_info:
-        triplets = entities_info[entity_label]
-        gender = triplets.get("gender", [])
-        age = triplets.get("age", 0)
-
-        gender = gender and gender[0] and gender[0][1]
-        gender = gender if gender else "they"
-    return gender, age
+    profile = get_person_profile(person, utterance)
+    return profile["gender"], profile["age"]
 
 
 # def is_creative_person(person, utterance):
@@ -174,34 +282,13 @@ def get_gender_age_person(person, utterance):
 
 
 def get_teams_for_sportsperson(person, utterance):
-    sport = [[]]
-    teams = [[]]
-
-    entities_info = request_el_wp_entities(person, utterance)
-
-    for entity_label in entities_info:
-        triplets = entities_info[entity_label]
-
-    sport = triplets.get("sport", [[]])
-    teams = triplets.get("member of sports team", [[]])
-
-    return sport, teams
+    profile = get_person_profile(person, utterance)
+    return profile["sport"], profile["teams"]
 
 
 def get_spouse_or_partner_person(person, utterance):
-    spouse = ""
-    partner = ""
-
-    entities_info = request_el_wp_entities(person, utterance)
-
-    for entity_label in entities_info:
-        triplets = entities_info[entity_label]
-        spouse = triplets.get("spouse", [])
-        partner = triplets.get("partner", [])
-        spouse = spouse[0][1] if spouse else None
-        partner = partner[0][1] if partner else None
-
-    return spouse, partner
+    profile = get_person_profile(person, utterance)
+    return profile["spouse"], profile["partner"]
 
 
 def get_human_readable_gender_statement_current_is(gender: str):
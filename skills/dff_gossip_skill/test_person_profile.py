@@ -0,0 +1,109 @@
+import os
+
+os.environ.setdefault("ENTITY_LINKING_URL", "http://entity-linking/model")
+os.environ.setdefault("WIKIDATA_URL", "http://wiki-parser/model")
+
+import dialogflows.flows.utils as utils  # noqa: E402
+
+ENTITIES = {
+    "Brad Pitt": ["Q35332", "Q1"],
+    "Angelina Jolie": ["Q13909"],
+    "Jennifer Aniston": ["Q32522"],
+    "Lionel Messi": ["Q615"],
+}
+TRIPLETS = {
+    "Q35332": {
+        "occupation": [["Q33999", "actor"]],
+        "gender": [["Q6581097", "male"]],
+        "age": 58,
+        "spouse": [["Q13909", "Angelina Jolie"]],
+        "films of actor": [["Q190050", "Fight Club"]],
+    },
+    "Q615": {
+        "occupation": [["Q937857", "association football player"]],
+        "gender": [["Q6581097", "male"]],
+        "sport": [["Q2736", "association football"]],
+        "member of sports team": [["Q7156", "FC Barcelona"]],
+    },
+}
+CONNECTIONS = {("Q35332", "Q13909"): ["spouse"], ("Q35332", "Q32522"): ["spouse"]}
+
+
+class Response:
+    def __init__(self, data):
+        self.data = data
+
+    def json(self):
+        return self.data
+
+
+class StubSession:
+    """Entity linking and wiki parser stubs which count the round trips."""
+
+    def __init__(self):
+        self.n_requests = 0
+        self.wiki_parser_timeouts = []
+
+    def post(self, url, json, timeout):
+        self.n_requests += 1
+        if url == utils.ENTITY_LINKING_URL:
+            return Response(
+                [
+                    [{"entity_substr": person, "entity_ids": ENTITIES.get(person, [])} for person in persons]
+                    for persons in json["entity_substr"]
+                ]
+            )
+        self.wiki_parser_timeouts.append(timeout)
+        outputs = []
+        for parser_info, query in zip(json["parser_info"], json["query"]):
+            if parser_info == "find_top_triplets":
+                entity_info = query[0]
+                triplets = TRIPLETS.get(entity_info["entity_ids"][0])
+                outputs.append({"entities_info": {entity_info["entity_substr"]: triplets} if triplets else {}})
+            elif parser_info == "find_connection":
+                outputs.append(CONNECTIONS.get((query[0][0], query[1][0]), []))
+        return Response(outputs)
+
+
+def test_person_profile():
+    utils.session = stub = StubSession()
+    utterance = "I like to learn more about actor Brad Pitt movies"
+
+    # one gossip turn about the person: 4 helpers, each of them made 2 round trips before
+    gender, age = utils.get_gender_age_person("Brad Pitt", utterance)
+    spouse, partner = utils.get_spouse_or_partner_person("Brad Pitt", utterance)
+    films, _, _, _ = utils.get_notable_works_for_creative_person("Brad Pitt", utterance)
+    sport, teams = utils.get_teams_for_sportsperson("Brad Pitt", utterance)
+    assert (gender, age, spouse, partner) == ("male", 58, "Angelina Jolie", None)
+    assert films == [[["Q190050", "Fight Club"]]] and (sport, teams) == ([[]], [[]])
+    assert stub.n_requests == 2, stub.n_requests
+
+    # relationships with 3 persons, each of them made 2 round trips before
+    relationships = utils.get_relationships("Brad Pitt", ["Angelina Jolie", "Jennifer Aniston", "Lionel Messi"])
+    assert relationships == {"Angelina Jolie": "spouse", "Jennifer Aniston": "spouse", "Lionel Messi": ""}
+    assert stub.n_requests == 4, stub.n_requests
+    # the timeout grows with the number of queries wiki parser runs one by one
+    assert [round(timeout, 3) for timeout in stub.wiki_parser_timeouts] == [0.8, 1.2], stub.wiki_parser_timeouts
+
+    # several persons with relationships at once, repeat celebrities come from the cache
+    profiles = utils.get_person_profiles(["Brad Pitt", "Lionel Messi", "Nobody"], utterance, ["Angelina Jolie"])
+    assert profiles["Lionel Messi"]["teams"] == [["Q7156", "FC Barcelona"]]
+    assert profiles["Nobody"]["gender"] == "unknown"
+    assert profiles["Brad Pitt"]["relationships"] == {"Angelina Jolie": "spouse"}
+    assert stub.n_requests == 6, stub.n_requests
+    utils.get_person_profiles(["Brad Pitt", "Lionel Messi", "Nobody"], utterance, ["Angelina Jolie"])
+    assert utils.get_relationship_between_two_people("Brad Pitt", "Jennifer Aniston") == "spouse"
+    assert stub.n_requests == 6, stub.n_requests
+
+    # empty results are requested again when their short TTL has expired, the found ones are still cached
+    for cache in [utils.missing_entity_ids_cache, utils.missing_entities_info_cache, utils.missing_relationships_cache]:
+        cache.clear()
+    assert utils.get_relationships("Brad Pitt", ["Angelina Jolie", "Lionel Messi"])["Lionel Messi"] == ""
+    assert stub.n_requests == 7, stub.n_requests
+    assert utils.get_person_profile("Nobody", utterance)["gender"] == "unknown"
+    assert stub.n_requests == 8, stub.n_requests
+    print("Success")
+
+
+if __name__ == "__main__":
+    test_person_profile()
@@ -1,15 +1,22 @@
+import argparse
 import json
+import os
+import pickle
 import time
 import re
 import logging
 
 import numpy as np
 
+from dialogflows.flows.token_trie import TokenTrie
 from dialogflows.flows.utils import GENRES, ALL_GENRES
 
 logging.basicConfig(format="%(asctime)s - %(name)s - %(levelname)s - %(message)s", level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# version of the prebuilt index format, the index of another version is rebuilt from the database
+INDEX_VERSION = 1
+
 
 class IMDb:
     professions = ["actor", "director"]
@@ -61,16 +68,17 @@ class IMDb:
         (re.compile(r"\b9\b"), "nine"),
     ]
 
-    def __init__(self, db_path="./databases/database_most_popular_main_info.json"):
+    def __init__(self, db_path="./databases/database_most_popular_main_info.json", index_path=None):
         t0 = time.time()
         self.database = {}
         self.professionals = {}
         self.preprocessed_original = {}
         self.preprocessed_alternative = {}
-        self.genres_pattern = None
-        self.names_pattern = {}
+        self.genres_pattern = re.compile("(" + "|".join([r"\b%s" % genre for genre in ALL_GENRES]) + ")", re.IGNORECASE)
+        self.names_trie = {}
 
-        self.create_database(db_path)
+        if not (index_path and self.load_index(index_path, db_path)):
+            self.create_database(db_path)
 
         logger.info(f"Initialized in {time.time() - t0} sec")
         logger.info(f"Search across {len(self.preprocessed_original)} original movie titles")
@@ -296,18 +304,45 @@ class IMDb:
         self.professionals = {}
         for prof in self.professions:
             self.collect_persons_and_movies(profession=prof)
-
-        logger.info(f"Everything's except patterns were done in {time.time() - t0} sec")
-
-        for prof in self.professions:
-            self.names_pattern[prof] = re.compile(
-                "(" + "|".join([r"\b%s\b" % name for name in self.professionals[f"lowercased_{prof}s"]]) + ")",
-                re.IGNORECASE,
-            )
-        self.genres_pattern = re.compile("(" + "|".join([r"\b%s" % genre for genre in ALL_GENRES]) + ")", re.IGNORECASE)
+            self.names_trie[prof] = TokenTrie(self.professionals[f"lowercased_{prof}s"])
 
         logger.info(f"Created db in {time.time() - t0} sec")
 
+    def save_index(self, index_path, db_path):
+        """Save the processed database, titles and persons indexes to load them by `load_index` at start."""
+        index = {
+            "version": INDEX_VERSION,
+            "db_size": os.path.getsize(db_path),
+            "database": self.database,
+            "preprocessed_original": self.preprocessed_original,
+            "preprocessed_alternative": self.preprocessed_alternative,
+            "frequent_unigrams": self.frequent_unigrams,
+            "professionals": self.professionals,
+            "names_trie": self.names_trie,
+        }
+        with open(index_path, "wb") as f:
+            pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def load_index(self, index_path, db_path):
+        """Load the index made by `save_index`, return False if it is absent or made for another database."""
+        if not os.path.exists(index_path):
+            logger.warning(f"IMDb index {index_path} not found, the database is processed at start")
+            return False
+        with open(index_path, "rb") as f:
+            index = pickle.load(f)
+        if index["version"] != INDEX_VERSION or (
+            os.path.exists(db_path) and index["db_size"] != os.path.getsize(db_path)
+        ):
+            logger.warning(f"IMDb index {index_path} is outdated, the database is processed at start")
+            return False
+        self.database = index["database"]
+        self.preprocessed_original = index["preprocessed_original"]
+        self.preprocessed_alternative = index["preprocessed_alternative"]
+        self.frequent_unigrams = index["frequent_unigrams"]
+        self.professionals = index["professionals"]
+        self.names_trie = index["names_trie"]
+        return True
+
     def process_movie_name(self, movie):
         movie_name = movie.lower()
         for pair in self.pairs:
@@ -504,7 +539,7 @@ class IMDb:
         lower_cased_reply = f" {self.process_movie_name(reply.lower())} "
 
         if subject in self.professions:
-            results = re.findall(self.names_pattern[subject], lower_cased_reply)
+            results = self.names_trie[subject].findall(lower_cased_reply)
         elif subject == "genre":
             results = re.findall(self.genres_pattern, lower_cased_reply)
         else:
@@ -685,3 +720,13 @@ class IMDb:
                 if n not in names:
                     names.append(n)
         return names
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Prebuild IMDb index so that the skill does not process titles at start"
+    )
+    parser.add_argument("db_path", help="database, e.g. /data/database_most_popular_main_info.json")
+    parser.add_argument("index_path", help="index, e.g. /data/database_most_popular_main_info.pkl")
+    args = parser.parse_args()
+    IMDb(args.db_path).save_index(args.index_path, args.db_path)
@@ -40,9 +40,13 @@ class MovieSkillTemplates:
     notsure_confidence = 0.5
     zero_confidence = 0.0
 
-    def __init__(self, db_path="/data/database_most_popular_main_info.json"):
+    def __init__(
+        self,
+        db_path="/data/database_most_popular_main_info.json",
+        index_path="/data/database_most_popular_main_info.pkl",
+    ):
         np.random.seed(42)
-        self.imdb = IMDb(db_path)
+        self.imdb = IMDb(db_path, index_path)
 
     @staticmethod
     def extract_previous_dialog_subjects(dialog, n_previous=4):
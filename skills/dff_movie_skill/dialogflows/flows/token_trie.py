@@ -0,0 +1,60 @@
+import re
+
+TOKEN_PATTERN = re.compile(r"\w+")
+# key of the node dictionary which keeps (rank, name) of the name ending in this node
+END = ""
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class TokenTrie:
+    """Trie of names by their word tokens, replaces huge `\\b(name1|name2|...)\\b` alternations.
+
+    `findall` scans the text once and at every token tries only the names continuing with the next tokens,
+    so its time depends on the text length but not on the number of names. As in the alternation,
+    of several names starting with the same token the earliest added one is taken, matches do not overlap.
+    """
+
+    def __init__(self, names=()):
+        self.root = {}
+        self.size = 0
+        for name in names:
+            self.add(name)
+
+    def add(self, name):
+        tokens = tokenize(name)
+        if not tokens:
+            return
+        node = self.root
+        for token in tokens:
+            node = node.setdefault(token, {})
+        if END not in node:
+            node[END] = (self.size, name)
+            self.size += 1
+
+    def match(self, tokens, start):
+        """Return (end, name) of the earliest added name which starts at `tokens[start]` or None."""
+        node = self.root
+        best = None
+        for end in range(start, len(tokens)):
+            node = node.get(tokens[end])
+            if node is None:
+                break
+            if END in node and (best is None or node[END][0] < best[0]):
+                best = (node[END][0], end + 1, node[END][1])
+        return best and best[1:]
+
+    def findall(self, text):
+        tokens = tokenize(text)
+        names = []
+        start = 0
+        while start < len(tokens):
+            found = self.match(tokens, start)
+            if found:
+                start, name = found
+                names.append(name)
+            else:
+                start += 1
+        return names
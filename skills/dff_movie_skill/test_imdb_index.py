@@ -0,0 +1,41 @@
+import os
+import random
+import re
+import tempfile
+
+from dialogflows.flows.imdb_database import IMDb
+from dialogflows.flows.token_trie import TokenTrie
+
+DB_PATH = "/data/database_most_popular_main_info.json"
+RANDOM_SEED = 2718
+N_NAMES = 2000
+
+
+def test_imdb_index():
+    imdb = IMDb(DB_PATH)
+    rng = random.Random(RANDOM_SEED)
+    for profession in imdb.professions:
+        # reference implementation: alternation of the names, names with punctuation are matched by the trie only
+        names = [name for name in imdb.professionals[f"lowercased_{profession}s"] if re.fullmatch(r"[\w ]+", name)]
+        names = rng.sample(names, min(N_NAMES, len(names)))
+        names_pattern = re.compile("(" + "|".join([r"\b%s\b" % name for name in names]) + ")", re.IGNORECASE)
+        trie = TokenTrie(names)
+        for name in names:
+            for uttr in [f"i like {name}", f"{name} and {rng.choice(names)} are cool", name.replace(" ", "")]:
+                processed_uttr = f" {imdb.process_movie_name(uttr)} "
+                assert trie.findall(processed_uttr) == re.findall(names_pattern, processed_uttr), uttr
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        index_path = os.path.join(tmp_dir, "index.pkl")
+        imdb.save_index(index_path, DB_PATH)
+        loaded_imdb = IMDb(DB_PATH, index_path)
+    assert loaded_imdb.preprocessed_original == imdb.preprocessed_original
+    assert loaded_imdb.professionals == imdb.professionals
+    for uttr in ["i like brad pitt and quentin tarantino", "tom hanks is great", "what about comedies"]:
+        for subject in imdb.professions + ["genre"]:
+            assert loaded_imdb.find_name(uttr, subject) == imdb.find_name(uttr, subject)
+    print("Success")
+
+
+if __name__ == "__main__":
+    test_imdb_index()
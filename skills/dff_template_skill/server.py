@@ -11,6 +11,7 @@ import sentry_sdk
 from sentry_sdk.integrations.logging import ignore_logger
 
 
+from common.metrics import setup_metrics
 from common.dff.integration.actor import load_ctxs, get_response
 
 from scenario.main import actor
@@ -31,6 +32,7 @@ logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 health = HealthCheck(app, "/healthcheck")
+setup_metrics(app)
 logging.getLogger("werkzeug").setLevel("WARNING")
 
 
@@ -0,0 +1,78 @@
+import datetime
+import enum
+import json
+
+from df_engine.core import Context
+
+import common.dff.integration.serializer as serializer
+from common.dff.integration.serializer import STATE_CODEC_VERSION, decode_context, encode_context
+
+
+class Color(enum.Enum):
+    RED = "red"
+
+
+def make_context():
+    ctx = Context()
+    for turn in range(3):
+        ctx.add_request(f"request {turn}")
+        ctx.add_label(("flow", f"node_{turn}"))
+        ctx.add_response(f"response {turn}")
+    ctx.misc = {"topics": ["movies"], "counter": 3}
+    return ctx
+
+
+def assert_same_context(ctx, decoded_ctx):
+    assert decoded_ctx.labels == ctx.labels
+    assert decoded_ctx.requests == ctx.requests
+    assert decoded_ctx.responses == ctx.responses
+    assert decoded_ctx.misc == ctx.misc
+
+
+def test_round_trip():
+    ctx = make_context()
+    data = encode_context(ctx)
+    assert data["v"] == STATE_CODEC_VERSION
+    assert not {"id", "validation", "actor_state"} & set(data)
+    # the state is stored by the agent as json
+    assert_same_context(ctx, decode_context(json.loads(json.dumps(data))))
+
+
+def test_non_json_misc():
+    ctx = make_context()
+    ctx.misc = {"set": {1}, "enum": Color.RED, "date": datetime.date(2022, 2, 24)}
+    decoded_ctx = decode_context(json.loads(json.dumps(encode_context(ctx))))
+    assert decoded_ctx.misc == json.loads(ctx.json())["misc"]
+
+
+def test_zlib_state():
+    ctx = make_context()
+    compression_min_size = serializer.DFF_STATE_COMPRESSION_MIN_SIZE
+    serializer.DFF_STATE_COMPRESSION_MIN_SIZE = 1
+    try:
+        data = encode_context(ctx)
+    finally:
+        serializer.DFF_STATE_COMPRESSION_MIN_SIZE = compression_min_size
+    assert set(data) == {"zlib", "v"}
+    assert_same_context(ctx, decode_context(json.loads(json.dumps(data))))
+
+
+def test_legacy_state():
+    ctx = make_context()
+    assert_same_context(ctx, decode_context(json.loads(ctx.json())))
+
+
+def test_unknown_version():
+    data = encode_context(make_context())
+    data["v"] = STATE_CODEC_VERSION + 1
+    decoded_ctx = decode_context(data)
+    assert not decoded_ctx.labels and not decoded_ctx.requests and not decoded_ctx.misc
+
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_non_json_misc()
+    test_zlib_state()
+    test_legacy_state()
+    test_unknown_version()
+    print("Success")
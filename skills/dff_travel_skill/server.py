@@ -11,6 +11,7 @@ import sentry_sdk
 from sentry_sdk.integrations.logging import ignore_logger
 
 
+from common.metrics import setup_metrics
 import common.dialogflow_framework.utils.dialogflow as dialogflow_utils
 import common.dialogflow_framework.programy.text_preprocessing as text_utils
 import dialogflows.main as main_dialogflow
@@ -29,6 +30,7 @@ logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 health = HealthCheck(app, "/healthcheck")
+setup_metrics(app)
 logging.getLogger("werkzeug").setLevel("WARNING")
 
 DF = main_dialogflow.composite_dialogflow
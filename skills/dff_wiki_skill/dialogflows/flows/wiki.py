@@ -309,7 +309,7 @@ def more_details_request(ngrams, vars):
     annotations = user_uttr["annotations"]
     bot_uttr = state_utils.get_last_bot_utterance(vars)
     bot_more_details = "more details" in bot_uttr["text"]
-    user_more_details = re.findall(COMPILE_LETS_TALK, user_uttr["text"])
+    user_more_details = COMPILE_LETS_TALK.findall(user_uttr["text"])
     isyes = is_yes(state_utils.get_last_human_utterance(vars))
     nounphrases = annotations.get("spacy_nounphrases", [])
     inters = set(nounphrases).intersection(set(mentions_list))
@@ -325,7 +325,7 @@ def factoid_q_request(ngrams, vars):
     shared_memory = state_utils.get_shared_memory(vars)
     user_uttr = state_utils.get_last_human_utterance(vars)
     bot_uttr = state_utils.get_last_bot_utterance(vars)
-    user_more_details = re.findall(COMPILE_LETS_TALK, user_uttr["text"])
+    user_more_details = COMPILE_LETS_TALK.findall(user_uttr["text"])
     user_annotations = user_uttr["annotations"]
     is_factoid = False
     factoid_cl = user_annotations.get("factoid_classification", {})
@@ -0,0 +1,83 @@
+import logging
+import os
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+ENCODE_BATCH_SIZE = 256
+
+
+def normalize_text(text):
+    return " ".join(text.lower().split())
+
+
+def normalize_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+class DialogIndex:
+    """Scripted dialogs with a hash index by the first utterance and the matrix of anticipated responses embeddings.
+
+    `dialogs_by_type` is an ordered dict `{dialog_type: {dialog_id: [utterance, ...]}}`. Dialogs are continued
+    by the bot from the odd positions, so only the utterances at the odd positions followed by a bot utterance
+    and a human one are encoded. Embeddings are saved to `embeddings_path` and memory mapped at the next start.
+    """
+
+    def __init__(self, dialogs_by_type, encode, embeddings_path=None):
+        self.dialogs_by_type = dialogs_by_type
+        self.encode = encode
+        self.first_utterances = {}
+        self.offsets = {}
+        texts = []
+        for dialog_type, dialogs in dialogs_by_type.items():
+            first_utterances = {}
+            for dialog_id, dialog in dialogs.items():
+                # of the dialogs with the same first utterance the first one is taken, of the types the last one
+                first_utterances.setdefault(normalize_text(dialog[0]), (dialog_id, dialog_type))
+                self.offsets[(dialog_type, dialog_id)] = len(texts)
+                texts.extend(dialog[1 : len(dialog) - 2 : 2])
+            self.first_utterances.update(first_utterances)
+
+        self.embeddings = None
+        if embeddings_path and os.path.exists(embeddings_path):
+            self.embeddings = np.load(embeddings_path, mmap_mode="r")
+            if self.embeddings.shape[0] != len(texts):
+                logger.warning(f"{embeddings_path} does not match the dialogs, anticipated responses are re-encoded")
+                self.embeddings = None
+        if self.embeddings is None:
+            self.embeddings = self.encode_texts(texts)
+            if embeddings_path:
+                # gunicorn workers start together, so the file is replaced at once to be never read half-written
+                tmp_path = f"{embeddings_path}.{os.getpid()}.npy"
+                np.save(tmp_path, self.embeddings)
+                os.replace(tmp_path, embeddings_path)
+
+    def encode_texts(self, texts):
+        embeddings = [
+            normalize_rows(np.asarray(self.encode(texts[start : start + ENCODE_BATCH_SIZE]), dtype=np.float32))
+            for start in range(0, len(texts), ENCODE_BATCH_SIZE)
+        ]
+        return np.concatenate(embeddings) if embeddings else np.zeros((0, 0), dtype=np.float32)
+
+    def find_dialog(self, first_utterance):
+        """Return (dialog_id, dialog_type) of the dialog starting with the utterance or ("", "")."""
+        return self.first_utterances.get(normalize_text(first_utterance), ("", ""))
+
+    def get_dialog(self, dialog_type, dialog_id):
+        return self.dialogs_by_type[dialog_type][dialog_id]
+
+    def get_row(self, dialog_type, dialog_id, dialog_position):
+        """Row of the anticipated response embedding or None if the bot can not continue the dialog from it."""
+        dialog = self.get_dialog(dialog_type, dialog_id)
+        if dialog_position % 2 == 0 or not 0 < dialog_position < len(dialog) - 2:
+            return None
+        return self.offsets[(dialog_type, dialog_id)] + dialog_position // 2
+
+    def score(self, human_responses, rows):
+        """Cosine similarities of the human responses to the anticipated ones, all responses are encoded at once."""
+        if not rows:
+            return np.zeros(0, dtype=np.float32)
+        human_responses_encoded = self.encode_texts(human_responses)
+        return np.einsum("ij,ij->i", human_responses_encoded, self.embeddings[rows])
@@ -13,11 +13,13 @@ import sentry_sdk
 import tensorflow_hub as tfhub
 import tensorflow as tf
 import tensorflow_text  # noqa
-from sklearn.preprocessing import normalize
+
+from dialog_index import DialogIndex
 
 MODEL_PATH = os.getenv("MODEL_PATH")
 TOPIC_DIALOGS_PATH = os.getenv("TOPIC_DIALOGS_PATH")
 NP_DIALOGS_PATH = os.getenv("NP_DIALOGS_PATH")
+EMBEDDINGS_PATH = os.getenv("EMBEDDINGS_PATH")
 
 sentry_sdk.init(getenv("SENTRY_DSN"))
 
@@ -46,6 +48,11 @@ def encode(texts):
     return sess.run(encoding_tensor, feed_dict={text_placeholder: texts})
 
 
+# noun phrase dialogs override topic ones with the same first utterance
+DIALOG_INDEX = DialogIndex({"topic": TOPIC_DIALOGS, "noun_phrase": NP_DIALOGS}, encode, EMBEDDINGS_PATH)
+logger.info(f"dummy_skill_dialog: {DIALOG_INDEX.embeddings.shape[0]} anticipated responses are encoded")
+
+
 @app.route("/respond", methods=["POST"])
 def respond():
     st_time = time.time()
@@ -54,15 +61,15 @@ def respond():
     final_confidences = []
     final_responses = []
     final_attributes = []
+    # dialogs to continue if the human response is similar to the anticipated one
+    to_score = []
 
     for dialog in dialogs_batch:
-
         bot_response = "I really do not know what to answer."
         confidence = 0.0
         dialog_position, dialog_id, dialog_type = -1, "", ""
         attr = {}
 
-        st_time = time.time()
         if len(dialog["bot_utterances"]) > 0:
             last_active_skill = dialog["bot_utterances"][-1]["active_skill"]
         else:
@@ -71,17 +78,7 @@ def respond():
         if last_active_skill in ["dummy_skill", "dummy_skill_dialog"]:
 
             if last_active_skill == "dummy_skill":
-                text = dialog["bot_utterances"][-1]["text"]
-                for key, value in TOPIC_DIALOGS.items():
-                    if text == value[0]:
-                        dialog_id = key
-                        dialog_type = "topic"
-                        break
-                for key, value in NP_DIALOGS.items():
-                    if text == value[0]:
-                        dialog_id = key
-                        dialog_type = "noun_phrase"
-                        break
+                dialog_id, dialog_type = DIALOG_INDEX.find_dialog(dialog["bot_utterances"][-1]["text"])
                 dialog_position = 1
             else:
                 for hypothesis in dialog["human_utterances"][-2]["hypotheses"]:
@@ -91,23 +88,9 @@ def respond():
                         dialog_type = hypothesis["dialog_type"]
 
             if dialog_type in ["topic", "noun_phrase"]:
-
-                if dialog_type == "topic":
-                    anticipated_dialog = TOPIC_DIALOGS[dialog_id]
-                else:
-                    anticipated_dialog = NP_DIALOGS[dialog_id]
-
-                human_response = dialog["human_utterances"][-1]["text"]
-                anticipated_response = anticipated_dialog[dialog_position]
-                human_response_encoded = normalize(encode([human_response]))[0]
-                anticipated_response_encoded = normalize(encode([anticipated_response]))[0]
-
-                score = human_response_encoded.dot(anticipated_response_encoded.T)
-
-                if score > 0.5 and len(anticipated_dialog) - 2 > dialog_position:
-                    bot_response = anticipated_dialog[dialog_position + 1]
-                    confidence = float(score)
-                    dialog_position += 2
+                row = DIALOG_INDEX.get_row(dialog_type, dialog_id, dialog_position)
+                if row is not None:
+                    to_score.append((len(final_responses), row, dialog["human_utterances"][-1]["text"]))
 
             attr = {"dialog_position": dialog_position, "dialog_id": dialog_id, "dialog_type": dialog_type}
 
@@ -115,6 +98,15 @@ def respond():
         final_responses.append(bot_response)
         final_attributes.append(attr)
 
+    scores = DIALOG_INDEX.score([text for _, _, text in to_score], [row for _, row, _ in to_score])
+    for (i, _, _), score in zip(to_score, scores):
+        if score > 0.5:
+            attr = final_attributes[i]
+            anticipated_dialog = DIALOG_INDEX.get_dialog(attr["dialog_type"], attr["dialog_id"])
+            final_responses[i] = anticipated_dialog[attr["dialog_position"] + 1]
+            final_confidences[i] = float(score)
+            attr["dialog_position"] += 2
+
     total_time = time.time() - st_time
     logger.warning(f"dummy_skill_dialog exec time: {total_time:.3f}s")
     return jsonify(list(zip(final_responses, final_confidences, final_attributes)))
@@ -1,3 +1,5 @@
 #!/bin/bash
 
 python test.py
+
+python test_dialog_index.py
@@ -0,0 +1,107 @@
+import random
+import time
+import zlib
+
+import numpy as np
+
+from dialog_index import DialogIndex, normalize_rows
+
+RANDOM_SEED = 2718
+N_DIALOGS = 5000
+N_REQUESTS = 20
+BATCH_SIZE = 10
+EMBEDDING_DIM = 512
+# overhead of one call of the tensorflow session
+ENCODE_CALL_TIME = 0.002
+WORDS = ["marvel", "comics", "batman", "movie", "music", "travel", "cat", "dog", "food", "science", "yes", "no"]
+WORD_VECTORS = {}
+
+
+def encode(texts):
+    """Bag of words of random word vectors, costs the same session call overhead as the encoder."""
+    time.sleep(ENCODE_CALL_TIME)
+    embeddings = np.zeros((len(texts), EMBEDDING_DIM), dtype=np.float32)
+    for i, text in enumerate(texts):
+        for word in text.split():
+            if word not in WORD_VECTORS:
+                WORD_VECTORS[word] = np.random.RandomState(zlib.crc32(word.encode())).randn(EMBEDDING_DIM)
+            embeddings[i] += WORD_VECTORS[word]
+    return embeddings
+
+
+def make_dialogs(rng, prefix):
+    return {
+        f"{prefix}{i}": [f"{prefix} dialog {i} " + " ".join(rng.choices(WORDS, k=5)) for _ in range(rng.randint(2, 9))]
+        for i in range(N_DIALOGS)
+    }
+
+
+def respond_loop(topic_dialogs, np_dialogs, requests):
+    """The previous implementation: linear scan of the dialogs and two encoder calls per dialog."""
+    results = []
+    for first_utterance, human_response in requests:
+        dialog_id, dialog_type = "", ""
+        for key, value in topic_dialogs.items():
+            if first_utterance == value[0]:
+                dialog_id, dialog_type = key, "topic"
+                break
+        for key, value in np_dialogs.items():
+            if first_utterance == value[0]:
+                dialog_id, dialog_type = key, "noun_phrase"
+                break
+        anticipated_dialog = topic_dialogs[dialog_id] if dialog_type == "topic" else np_dialogs[dialog_id]
+        human_response_encoded = normalize_rows(encode([human_response]))[0]
+        anticipated_response_encoded = normalize_rows(encode([anticipated_dialog[1]]))[0]
+        score = human_response_encoded.dot(anticipated_response_encoded.T)
+        if score > 0.5 and len(anticipated_dialog) - 2 > 1:
+            results.append((anticipated_dialog[2], round(float(score), 4)))
+        else:
+            results.append(None)
+    return results
+
+
+def respond_index(dialog_index, requests):
+    results = [None] * len(requests)
+    to_score = []
+    for i, (first_utterance, human_response) in enumerate(requests):
+        dialog_id, dialog_type = dialog_index.find_dialog(first_utterance)
+        row = dialog_index.get_row(dialog_type, dialog_id, 1)
+        if row is not None:
+            to_score.append((i, dialog_type, dialog_id, row, human_response))
+    scores = dialog_index.score([text for *_, text in to_score], [row for *_, row, _ in to_score])
+    for (i, dialog_type, dialog_id, _, _), score in zip(to_score, scores):
+        if score > 0.5:
+            results[i] = (dialog_index.get_dialog(dialog_type, dialog_id)[2], round(float(score), 4))
+    return results
+
+
+def test_dialog_index():
+    rng = random.Random(RANDOM_SEED)
+    topic_dialogs, np_dialogs = make_dialogs(rng, "topic"), make_dialogs(rng, "np")
+    # the same first utterance in both types, noun phrase dialog is taken
+    np_dialogs["np0"][0] = topic_dialogs["topic0"][0]
+    dialog_index = DialogIndex({"topic": topic_dialogs, "noun_phrase": np_dialogs}, encode)
+
+    batches = []
+    for _ in range(N_REQUESTS):
+        dialogs = [rng.choice(list(dialogs_.values())) for dialogs_ in [topic_dialogs, np_dialogs] * BATCH_SIZE]
+        dialogs[0] = np_dialogs["np0"]
+        # half of the human responses are similar to the anticipated ones
+        batches.append([(dialog[0], dialog[1] if rng.random() < 0.5 else " ".join(WORDS)) for dialog in dialogs])
+
+    start = time.perf_counter()
+    loop_results = [respond_loop(topic_dialogs, np_dialogs, batch) for batch in batches]
+    loop_time = (time.perf_counter() - start) / N_REQUESTS
+    start = time.perf_counter()
+    index_results = [respond_index(dialog_index, batch) for batch in batches]
+    index_time = (time.perf_counter() - start) / N_REQUESTS
+
+    assert index_results == loop_results
+    assert any(loop_results[0]) and not all(loop_results[0])
+    print(f"batch of {2 * BATCH_SIZE} dialogs: loop {loop_time * 1000:.1f}ms, index {index_time * 1000:.1f}ms")
+    assert index_time < loop_time
+    print("Success")
+
+
+if __name__ == "__main__":
+    test_dialog_index()
@@ -0,0 +1,89 @@
+import logging
+import threading
+import time
+
+import requests
+import sentry_sdk
+
+from common.metrics import UPSTREAM_TIMEOUT, count_upstream_request
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveTimeout:
+    """Timeout of the requests to a service estimated from the observed latencies as the TCP retransmission timeout.
+
+    timeout = smoothed latency + `k` * latency deviation, clamped by `min_timeout` and `max_timeout`.
+    After a timeout the latency is unknown, so the timeout is doubled until a request succeeds.
+    """
+
+    def __init__(self, initial_timeout, min_timeout, max_timeout, alpha=0.125, beta=0.25, k=4):
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.alpha = alpha
+        self.beta = beta
+        self.k = k
+        self.lock = threading.Lock()
+        self.latency = None
+        self.deviation = None
+        self.timeout = self.clamp(initial_timeout)
+
+    def clamp(self, timeout):
+        return min(max(timeout, self.min_timeout), self.max_timeout)
+
+    def get(self):
+        return self.timeout
+
+    def observe(self, latency):
+        with self.lock:
+            if self.latency is None:
+                self.latency, self.deviation = latency, latency / 2
+            else:
+                self.deviation = (1 - self.beta) * self.deviation + self.beta * abs(latency - self.latency)
+                self.latency = (1 - self.alpha) * self.latency + self.alpha * latency
+            self.timeout = self.clamp(self.latency + self.k * self.deviation)
+
+    def observe_timeout(self):
+        with self.lock:
+            self.timeout = self.clamp(2 * self.timeout)
+
+
+class QAClient:
+    """Batched requests to a QA service through one session with the adaptive timeout.
+
+    Requests, timeouts and errors are counted by `upstream_request_count` metric, the timeout rate of the service is
+    `rate(upstream_request_count{service=..., result="timeout"}) / rate(upstream_request_count{service=...})`.
+    """
+
+    def __init__(self, service, url, timeout, session=None):
+        self.service = service
+        self.url = url
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        UPSTREAM_TIMEOUT.labels(service).set(timeout.get())
+
+    def post(self, payload):
+        """Return the json response of the service or None if the service did not answer in time."""
+        timeout = self.timeout.get()
+        st_time = time.time()
+        try:
+            resp = self.session.post(self.url, json=payload, timeout=timeout)
+            resp.raise_for_status()
+            result = resp.json()
+        except requests.Timeout:
+            logger.info(f"{self.service} did not answer in {timeout:.3f}s")
+            self.timeout.observe_timeout()
+            count_upstream_request(self.service, "timeout")
+            result = None
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+            logger.exception(e)
+            count_upstream_request(self.service, "error")
+            result = None
+        else:
+            latency = time.time() - st_time
+            logger.info(f"Query against {self.service} succeeded, time {latency:.3f}s")
+            self.timeout.observe(latency)
+            count_upstream_request(self.service, "ok")
+        UPSTREAM_TIMEOUT.labels(self.service).set(self.timeout.get())
+        return result
@@ -8,13 +8,16 @@ import json
 import requests
 import sentry_sdk
 import spacy
-import concurrent.futures
+from concurrent.futures import ThreadPoolExecutor
 from flask import Flask, request, jsonify
 from os import getenv
+from requests.adapters import HTTPAdapter
 
 from common.factoid import DONT_KNOW_ANSWER, FACTOID_NOTSURE_CONFIDENCE
+from common.metrics import setup_metrics
 from common.universal_templates import if_chat_about_particular_topic
 from common.utils import get_entities
+from qa_client import AdaptiveTimeout, QAClient
 
 sentry_sdk.init(getenv("SENTRY_DSN"))
 
@@ -22,9 +25,15 @@ logging.basicConfig(format="%(asctime)s - %(name)s - %(levelname)s - %(message)s
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
+setup_metrics(app)
 
 KBQA_URL = getenv("KBQA_URL")
 TEXT_QA_URL = getenv("TEXT_QA_URL")
+# timeouts of the requests to text_qa and kbqa are adapted to their latency in these bounds
+QA_INITIAL_TIMEOUT = float(getenv("QA_INITIAL_TIMEOUT", 0.5))
+QA_MIN_TIMEOUT = float(getenv("QA_MIN_TIMEOUT", 0.3))
+QA_MAX_TIMEOUT = float(getenv("QA_MAX_TIMEOUT", 1.5))
+QA_MAX_WORKERS = int(getenv("QA_MAX_WORKERS", 4))
 use_annotators_output = True
 FACTOID_DEFAULT_CONFIDENCE = 0.99  # otherwise dummy often beats it
 ASKED_ABOUT_FACT_PROB = 0.99
@@ -38,6 +47,15 @@ decrease_coef = 0.95
 
 nlp = spacy.load("en_core_web_sm")
 
+# the pool and the connections to the QA services live as long as the process
+executor = ThreadPoolExecutor(max_workers=QA_MAX_WORKERS)
+session = requests.Session()
+session.mount("http://", HTTPAdapter(pool_connections=2, pool_maxsize=QA_MAX_WORKERS))
+qa_clients = {
+    system: QAClient(system, url, AdaptiveTimeout(QA_INITIAL_TIMEOUT, QA_MIN_TIMEOUT, QA_MAX_TIMEOUT), session)
+    for system, url in [("kbqa", KBQA_URL), ("text_qa", TEXT_QA_URL)]
+}
+
 tell_me = r"(do you know|(can|could) you tell me|tell me)"
 tell_me_template = re.compile(tell_me)
 full_template = re.compile(tell_me + r" (who|where|when|what|why)")
@@ -143,41 +161,33 @@ def asked_about_fact(x):
     return any([j in x.lower() for j in ["fact about", "talk about", "tell me about", "tell me more about"]])
 
 
-def getQaResponse(query, system):
-    qa_response = dict()
-    qa_response["qa_system"] = system
-    qa_response["answer"] = "Not Found"
-    qa_response["confidence"] = 0.0
+def get_qa_responses(questions, system, facts=None):
+    """Answers of kbqa or text_qa to the questions, all of them are sent with one request."""
+    # kbqa did not find the answer or did not answer in time
+    answer = "Not Found" if system == "kbqa" else ""
+    qa_responses = [
+        {"qa_system": system, "answer": answer, "answer_sentence": "", "confidence": 0.0} for _ in questions
+    ]
+    if not questions:
+        return qa_responses
+    if system == "kbqa":
+        outputs = qa_clients[system].post({"x_init": questions})
+    else:
+        outputs = qa_clients[system].post({"question_raw": questions, "top_facts": facts})
+    logger.info(f"Response of {system}: {outputs}")
     try:
-        x = [query]
-        if system == "kbqa":
-            qa_request_dict = dict([("x_init", x)])
-            qa_url = KBQA_URL
-        else:
-            qa_request_dict = dict([("question_raw", x)])
-            qa_url = TEXT_QA_URL
-        qa_request = json.dumps(qa_request_dict, ensure_ascii=False).encode("utf8")
-        logger.info(f"Preparing to run query against {system} DP Model: {qa_request}")
-        tm_st = time.time()
-        resp = requests.post(qa_url, data=qa_request, timeout=1.5)
-        tm_end = time.time()
-        if resp.status_code != 200:
-            logger.info(f"API Error: {system} DP Model inaccessible, status code: " + str(resp.status_code))
-        else:
-            logger.info(f"Query against {system} DP Model succeeded, time {tm_end - tm_st}")
-            logger.info("Response: " + str(resp.json()))
+        for qa_response, output in zip(qa_responses, outputs or []):
             if system == "kbqa":
-                qa_response["answer"] = resp.json()[0][0][0]
-                qa_response["confidence"] = resp.json()[0][0][1]
+                qa_response["answer"] = output[0][0]
+                qa_response["confidence"] = output[0][1]
             else:
-                qa_response["answer"] = resp.json()[0][0]
-                qa_response["answer_sentence"] = resp.json()[0][3]
-                qa_response["confidence"] = resp.json()[0][1]
+                qa_response["answer"] = output[0]
+                qa_response["answer_sentence"] = output[3]
+                qa_response["confidence"] = output[1]
     except Exception as ex:
         sentry_sdk.capture_exception(ex)
         logger.exception(ex)
-
-    return qa_response
+    return qa_responses
 
 
 def qa_choose(question, odqa_response, kbqa_response):
@@ -221,8 +231,8 @@ def qa_choose(question, odqa_response, kbqa_response):
 @app.route("/test", methods=["POST"])
 def test():
     last_phrase = request.json["query"]
-    response_dict = getQaResponse(last_phrase)
-    return response_dict["response"]
+    response_dict = get_qa_responses([last_phrase], "kbqa")[0]
+    return response_dict["answer"]
 
 
 @app.route("/respond", methods=["POST"])
@@ -286,64 +296,24 @@ def respond():
             facts_batch.append(annotations.get("fact_retrieval", {}).get("facts", []))
             question_nums.append(n)
 
-    text_qa_response_batch = [{"answer": "", "answer_sentence": "", "confidence": 0.0} for _ in dialogs_batch]
-    resp = requests.post(TEXT_QA_URL, json={"question_raw": questions_batch, "top_facts": facts_batch}, timeout=0.5)
-    if resp.status_code != 200:
-        logger.info(f"API Error: Text QA inaccessible")
+    # questions of the batch are sent to text_qa and kbqa at once, the services are queried concurrently
+    text_qa_future = executor.submit(get_qa_responses, questions_batch, "text_qa", facts_batch)
+    if use_annotators_output:
+        kbqa_responses = [
+            dialogs_batch[n]["human_utterances"][-1]["annotations"].get("kbqa", {}) for n in question_nums
+        ]
+        logger.info(f"Using annotators output, kbqa_responses {kbqa_responses}")
     else:
-        logger.info(f"Query against Text QA succeeded")
-        text_qa_resp = resp.json()
-        text_qa_response_batch = []
-        cnt_fnd = 0
-        for i in range(len(dialogs_batch)):
-            if i in question_nums and cnt_fnd < len(text_qa_resp):
-                text_qa_response_batch.append(
-                    {
-                        "answer": text_qa_resp[cnt_fnd][0],
-                        "answer_sentence": text_qa_resp[cnt_fnd][3],
-                        "confidence": text_qa_resp[cnt_fnd][1],
-                    }
-                )
-            else:
-                text_qa_response_batch.append({"answer": "", "answer_sentence": "", "confidence": 0.0})
-    logger.info(f"Response: {resp.json()}")
+        kbqa_responses = get_qa_responses(questions_batch, "kbqa")
+    text_qa_responses = text_qa_future.result()
+    qa_responses = dict(zip(question_nums, zip(questions_batch, text_qa_responses, kbqa_responses)))
 
-    kbqa_response = dict()
-
-    for dialog, text_qa_response, is_factoid, fact_output in zip(
-        dialogs_batch, text_qa_response_batch, is_factoid_sents, fact_outputs
-    ):
+    for n in range(len(dialogs_batch)):
         attr = {}
-        curr_ann_uttr = dialog["human_utterances"][-1]
-        prev_ann_uttr = dialog["bot_utterances"][-1] if len(dialog["bot_utterances"]) else {}
-        tell_me_about_intent = curr_ann_uttr["annotations"].get("intent_catcher", {}).get("lets_chat_about", {}).get(
-            "detected", 0
-        ) == 1 or if_chat_about_particular_topic(curr_ann_uttr, prev_ann_uttr)
-
-        if "sentrewrite" in curr_ann_uttr["annotations"]:
-            curr_uttr_rewritten = curr_ann_uttr["annotations"]["sentrewrite"]["modified_sents"][-1]
-        else:
-            curr_uttr_rewritten = curr_ann_uttr["text"]
-        is_question = "?" in curr_uttr_rewritten
-        if is_factoid and (tell_me_about_intent or is_question):
-            logger.info("Question is classified as factoid. Querying KBQA and ODQA.")
-            print("Question is classified as factoid. Querying KBQA and ODQA...", flush=True)
-            logger.info(f"Using annotators output, kbqa_response {curr_ann_uttr['annotations'].get('kbqa', [])}")
-            if use_annotators_output:
-                kbqa_response = curr_ann_uttr["annotations"].get("kbqa", {})
-                logger.info(f"Using annotators output, kbqa_response {kbqa_response}")
-            else:
-                futures = []
-                executor = concurrent.futures.ThreadPoolExecutor()
-                for system in ["kbqa"]:
-                    futures.append(executor.submit(getQaResponse, last_phrase, system))
-                results = []
-                for future in concurrent.futures.as_completed(futures):
-                    results.append(future.result())
-                for result in results:
-                    kbqa_response = result
-
-            response, confidence = qa_choose(last_phrase, text_qa_response, kbqa_response)
+        if n in qa_responses:
+            logger.info("Question is classified as factoid.")
+            question, text_qa_response, kbqa_response = qa_responses[n]
+            response, confidence = qa_choose(question, text_qa_response, kbqa_response)
             if len(response) > 300:
                 response_cut = ""
                 cur_len = 0
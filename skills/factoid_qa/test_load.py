@@ -0,0 +1,74 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from prometheus_client import REGISTRY
+
+from qa_client import AdaptiveTimeout, QAClient
+
+N_CLIENTS = 4
+N_REQUESTS = 10
+BATCH_SIZE = 3
+# cpu time of text_qa per question, 4 concurrent batches take longer than the former 0.5s timeout
+CPU_TIME_PER_QUESTION = 0.05
+
+
+class TextQAHandler(BaseHTTPRequestHandler):
+    """CPU bound text_qa stub, its latency grows with the number of concurrent requests."""
+
+    def do_POST(self):
+        questions = json.loads(self.rfile.read(int(self.headers["Content-Length"])))["question_raw"]
+        end_time = time.thread_time() + CPU_TIME_PER_QUESTION * len(questions)
+        while time.thread_time() < end_time:
+            pass
+        body = json.dumps([[question, 0.9, 0, question] for question in questions]).encode()
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except ConnectionError:
+            # the client has stopped waiting for the answer
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+def run_load(service, url, timeout):
+    qa_client = QAClient(service, url, timeout)
+    answers = []
+
+    def send_requests():
+        for i in range(N_REQUESTS):
+            questions = [f"question {i} {j}?" for j in range(BATCH_SIZE)]
+            answers.append(qa_client.post({"question_raw": questions, "top_facts": [[]] * BATCH_SIZE}))
+
+    clients = [threading.Thread(target=send_requests) for _ in range(N_CLIENTS)]
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join()
+    n_timeouts = REGISTRY.get_sample_value("upstream_request_count_total", {"service": service, "result": "timeout"})
+    n_dropped = BATCH_SIZE * sum(answer is None for answer in answers)
+    print(f"{service}: timeout rate {(n_timeouts or 0) / len(answers):.2f}, dropped answers {n_dropped}")
+    return n_dropped
+
+
+def test_load():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), TextQAHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/model"
+
+    fixed_dropped = run_load("text_qa_fixed", url, AdaptiveTimeout(0.5, 0.5, 0.5))
+    adaptive_dropped = run_load("text_qa_adaptive", url, AdaptiveTimeout(0.5, 0.3, 1.5))
+    server.shutdown()
+    assert adaptive_dropped < fixed_dropped
+    print("Success")
+
+
+if __name__ == "__main__":
+    test_load()
@@ -1,5 +1,5 @@
 # %%
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 
 from utils.candidates import sample_candidates
@@ -35,8 +35,10 @@ def is_last_skill(skill_name, state):
     return skill_name in state.skill_history[-1:]
 
 
-def run_skills(history: List, state: Dict, agent_intents: Dict = {}):
-    state = State(get_db_index(), state)
+def run_skills(
+    history: List, state: Dict, agent_intents: Dict = {}, dialog_id: str = None, turn_index: Optional[int] = None
+):
+    state = State(get_db_index(), state, dialog_id, turn_index)
     state.add_human_message(history[-1])
     # step 0
     # get skill scores
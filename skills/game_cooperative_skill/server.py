@@ -90,9 +90,11 @@ def respond():
     st_time = time.time()
     dialogs_batch = request.json["dialogs"]
     rand_seed = request.json.get("rand_seed")
+    # without the indexes of the last human utterances in the whole dialogs the models replay the history
+    human_utter_indexes = request.json.get("human_utter_indexes", [None] * len(dialogs_batch))
 
     responses = []
-    for dialog in dialogs_batch:
+    for dialog, human_utter_index in zip(dialogs_batch, human_utter_indexes):
         prev_skill_outputs = get_skill_outputs_from_dialog(
             dialog["utterances"][-MEMORY_LENGTH:], "game_cooperative_skill", activated=True
         )
@@ -114,7 +116,7 @@ def respond():
             attr = {}
             if rand_seed:
                 random.seed(int(rand_seed))
-            response, state = skill([last_utter_text], state, agent_intents)
+            response, state = skill([last_utter_text], state, agent_intents, dialog.get("dialog_id"), human_utter_index)
 
             # logger.info(f"state = {state}")
             # logger.info(f"last_utter_text = {last_utter_text}")
@@ -296,7 +296,7 @@ def do_you_like_handler(previous_handler_state, skill_state, state, true_model_n
 
 def run_skill(state: State, modes: List = [skill_attrs.modes.intro]):
 
-    model_results = run_models(models, state.human_utterances)
+    model_results = run_models(models, state.human_utterances, state.dialog_id, state.turn_index)
     true_model_names = cmd_postprocessing(model_results, model_name_only=True)
     true_cmds = cmd_postprocessing(model_results, cmd_only=True)
 
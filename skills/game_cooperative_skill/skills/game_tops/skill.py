@@ -255,7 +255,7 @@ def intro_handler(state, skill_state, true_model_names, true_cmds):
 def run_skill(state: State, modes: List = [skill_attrs.modes.intro]):
 
     skill_state = state.get_skill_state(skill_attrs.skill_name)
-    model_results = run_models(models, state.human_utterances)
+    model_results = run_models(models, state.human_utterances, state.dialog_id, state.turn_index)
     true_model_names = cmd_postprocessing(model_results, model_name_only=True)
     true_cmds = cmd_postprocessing(model_results, cmd_only=True)
     text = "Sorry, have no idea what to say."
@@ -31,7 +31,7 @@ skill_attrs.modes.default = "default"
 
 def run_skill(state: State, modes: List = [skill_attrs.modes.default]):
     human_utterances = state.human_utterances
-    intents = run_models(models, human_utterances)
+    intents = run_models(models, human_utterances, state.dialog_id, state.turn_index)
     intents = cmd_postprocessing(intents)
     intents = {state.add_intent(model_name, intent) for model_name, intent in intents.items()}
     return state
@@ -1,3 +1,4 @@
 #!/bin/bash
 
 python test_server.py
+python test_programy_model.py
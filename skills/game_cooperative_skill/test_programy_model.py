@@ -0,0 +1,41 @@
+from utils.programy_model import run_models
+
+N_TURNS = 12
+# the skill keeps only the last human utterances in its state
+WINDOW = 3
+
+
+class StubModel:
+    """Programy bot stub which answers with the utterance and the number of questions asked by the user."""
+
+    def __init__(self):
+        self.questions = []
+
+    def ask_question(self, userid, uttr):
+        self.questions.append((userid, uttr))
+        return f"{uttr} {sum(asked_userid == userid for asked_userid, _ in self.questions)}"
+
+
+def test_run_models():
+    models = {"stub": StubModel()}
+    dialog = ["no", "yes"] + ["yes"] * (N_TURNS - 2)
+    for turn_index in range(N_TURNS):
+        n_questions = len(models["stub"].questions)
+        human_utterances = dialog[: turn_index + 1][-WINDOW:]
+        results = run_models(models, human_utterances, "dialog_id", turn_index)
+        # every turn is asked once in the same programy conversation, even when the reply is repeated
+        assert models["stub"].questions[n_questions:] == [(models["stub"].questions[0][0], dialog[turn_index])]
+        assert results == {"stub": f"{dialog[turn_index]} {turn_index + 1}"}, results
+        # the models are not asked again at the same turn
+        assert run_models(models, human_utterances, "dialog_id", turn_index) == results
+        assert len(models["stub"].questions) == n_questions + 1
+
+    # after a gap the window is replayed for a new user
+    n_questions = len(models["stub"].questions)
+    assert run_models(models, ["no", "yes", "yes"], "dialog_id", N_TURNS + 1) == {"stub": "yes 3"}
+    assert len(models["stub"].questions) == n_questions + WINDOW
+    print("Success")
+
+
+if __name__ == "__main__":
+    test_run_models()
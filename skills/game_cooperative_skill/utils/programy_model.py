@@ -12,18 +12,70 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+import threading
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 
 from utils.text_preprocessing import clean_text
 
+EXECUTOR = ThreadPoolExecutor(max_workers=8)
+MAX_INTENT_CONTEXTS = 1000
 
-def run_models(models, human_utterances):
-    userid = uuid.uuid4().hex
+# {(dialog_id, id(models)): (userid, turn index, asked human utterances, results of the last utterance)}
+intent_contexts = collections.OrderedDict()
+intent_contexts_lock = threading.Lock()
+
+
+def ask_models(models, userid, uttr):
+    # every model is a separate programy bot, so they are asked concurrently
+    futures = {model_name: EXECUTOR.submit(model.ask_question, userid, uttr) for model_name, model in models.items()}
+    results = {model_name: future.result() for model_name, future in futures.items()}
+    return {model_name: result for model_name, result in results.items() if result}
+
+
+def run_models(models, human_utterances, dialog_id=None, turn_index=None):
+    """Get model results for the last human utterance.
+
+    The programy conversation of the dialog is kept between the turns. When the turn index advances by one
+    and the state history is the continuation of the asked one, only the last utterance is asked. Without
+    `dialog_id` and `turn_index` or after a gap all the utterances are replayed for a new user.
+    """
+    if not dialog_id or turn_index is None:
+        return replay_models(models, human_utterances)
+    context_key = (dialog_id, id(models))
+    with intent_contexts_lock:
+        userid, prev_turn_index, asked_utterances, results = intent_contexts.pop(context_key, (None, None, [], {}))
+    prev_utterances = human_utterances[:-1]
+    if turn_index == prev_turn_index and asked_utterances == human_utterances:
+        # the models are asked again at the same turn
+        pass
+    elif (
+        prev_turn_index is not None
+        and turn_index == prev_turn_index + 1
+        and prev_utterances
+        and asked_utterances[-len(prev_utterances) :] == prev_utterances
+    ):
+        # the next turn of the same conversation
+        results = ask_models(models, userid, clean_text(human_utterances[-1]))
+        asked_utterances = asked_utterances + human_utterances[-1:]
+    else:
+        userid = uuid.uuid4().hex
+        results = replay_models(models, human_utterances, userid)
+        asked_utterances = list(human_utterances)
+    with intent_contexts_lock:
+        # only the last utterances are compared with the history of the next turn
+        intent_contexts[context_key] = (userid, turn_index, asked_utterances[-len(human_utterances) :], results)
+        while len(intent_contexts) > MAX_INTENT_CONTEXTS:
+            intent_contexts.popitem(last=False)
+    return results
+
+
+def replay_models(models, human_utterances, userid=None):
+    userid = userid or uuid.uuid4().hex
+    results = {}
     for uttr in human_utterances:
-        uttr = clean_text(uttr)
-        # print(uttr)
-        results = {model_name: model.ask_question(userid, uttr) for model_name, model in models.items()}
-        results = {model_name: result for model_name, result in results.items() if result}
+        results = ask_models(models, userid, clean_text(uttr))
     return results
 
 
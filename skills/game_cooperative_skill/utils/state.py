@@ -33,36 +33,44 @@ def get_game_by_hash(hash, games):
         return alt_game
 
 
-def serialize_games(data):
-    if isinstance(data, list):
-        return [serialize_games(i) for i in data]
-    elif isinstance(data, dict):
-        game_hash = get_game_hash(data)
-        if game_hash is not None:
-            return game_hash
-        else:
-            return {key: serialize_games(val) for key, val in data.items()}
-    else:
-        return data
-
-
-def deserialize_games(data, games):
-    if isinstance(data, list):
-        return [deserialize_games(i, games) for i in data]
-    elif isinstance(data, dict):
-        return {key: deserialize_games(val, games) for key, val in data.items()}
-    elif isinstance(data, str):
-        game = get_game_by_hash(data, games)
-        if game:
-            return game
-        else:
-            return data
-    else:
-        return data
+def to_game_refs(value):
+    # games are stored in the state by hashes at any depth, as the states stored before did
+    if isinstance(value, list):
+        return [to_game_refs(i) for i in value]
+    elif isinstance(value, dict):
+        return get_game_hash(value) or {key: to_game_refs(val) for key, val in value.items()}
+    return value
+
+
+def from_game_refs(value, games):
+    if isinstance(value, list):
+        return [from_game_refs(i, games) for i in value]
+    elif isinstance(value, dict):
+        return {key: from_game_refs(val, games) for key, val in value.items()}
+    elif isinstance(value, str):
+        return get_game_by_hash(value, games) or value
+    return value
 
 
 class State:
-    def __init__(self, games: Dict, state: Optional[Dict] = None):
+    """Skill state, games are kept as references by `get_game_hash` and resolved by `get_content`
+    and `get_skill_state`, so only the read and written values are walked, not the whole state.
+
+    `content_state` and `skill_states` are read-only copies with resolved games, the state is changed
+    by `add_content` and `update_skill_state`.
+    """
+
+    def __init__(
+        self,
+        games: Dict,
+        state: Optional[Dict] = None,
+        dialog_id: Optional[str] = None,
+        turn_index: Optional[int] = None,
+    ):
+        self.games = games
+        self.dialog_id = dialog_id
+        # number of human utterances in the dialog, programy conversations are continued by it
+        self.turn_index = turn_index
         if not state:
             self.state = {
                 "content_state": {},  # {content_type_str: [content_1_dict, content_2_dict, ...], ...}
@@ -74,12 +82,13 @@ class State:
                 "policy_state": {"current_scenario_skill": "", "interrupted_scenario_stack": [], "st2": {}},
             }
         else:
-            self.state = deserialize_games(state, games)
+            self.state = state
         self.state["hypotheses"] = []
         self.state["intents"] = {}
 
     def get_skill_state(self, skill_name: str):
-        return self.state["skill_states"].get(skill_name, {})
+        skill_state = self.state["skill_states"].get(skill_name, {})
+        return {key: from_game_refs(val, self.games) for key, val in skill_state.items()}
 
     def update_st2_policy(self, policy: Dict):
         self.state["policy_state"]["st2"].update(policy)
@@ -88,15 +97,17 @@ class State:
         self.state["policy_state"]["st2"] = {}
 
     def update_skill_state(self, skill_name: str, skill_state: Dict):
+        skill_state = {key: to_game_refs(val) for key, val in skill_state.items()}
         if skill_name in self.state["skill_states"]:
             self.state["skill_states"][skill_name].update(skill_state)
         else:
             self.state["skill_states"][skill_name] = skill_state
 
     def get_content(self, content_name: str, **kwargs):
-        return self.state["content_state"].get(content_name, [])
+        return from_game_refs(self.state["content_state"].get(content_name, []), self.games)
 
     def add_content(self, content_name: str, content: Dict, **kwargs):
+        content = to_game_refs(content)
         self.state["content_state"][content_name] = self.state["content_state"].get(content_name, []) + [content]
 
     def add_skill_scores(self, skill_name: str, scores: Dict, **kwargs):
@@ -140,14 +151,15 @@ class State:
             self.state["policy_state"]["interrupted_scenario_stack"].append(self.current_scenario_skill)
 
     def to_dict(self):
-        return dict(serialize_games(self.state))
+        return dict(self.state)
 
     def __repr__(self):
         return pprint.pformat(self.to_dict())
 
     @property
     def content_state(self):
-        return self.state["content_state"]
+        # read-only copy, see add_content
+        return {key: from_game_refs(val, self.games) for key, val in self.state["content_state"].items()}
 
     @property
     def skill_stats(self):
@@ -155,7 +167,8 @@ class State:
 
     @property
     def skill_states(self):
-        return self.state["skill_states"]
+        # read-only copy, see update_skill_state
+        return {skill_name: self.get_skill_state(skill_name) for skill_name in self.state["skill_states"]}
 
     @property
     def utterances(self):
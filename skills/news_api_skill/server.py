@@ -82,7 +82,7 @@ def remove_punct_and_articles(s, lowecase=True):
 def news_rejection(uttr):
     if re.search(COMPILE_NOT_WANT_TO_TALK_ABOUT_IT, uttr):
         return True
-    elif re.search(COMPILE_SWITCH_TOPIC, uttr):
+    elif COMPILE_SWITCH_TOPIC.search(uttr):
         return True
     elif "nothing" in uttr or "none" in uttr:
         return True
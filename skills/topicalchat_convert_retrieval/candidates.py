@@ -0,0 +1,72 @@
+"""Candidate responses of a topic with their ConveRT encodings.
+
+`preencode_responses.py` pickles `(encodings, responses)` of a topic. Unpickling copies the encodings into every
+gunicorn worker, so they are converted to `.npy` which the workers memory map and share through the page cache,
+and the responses are saved to a small `.json` index next to it:
+```
+python candidates.py /root/convert_data/topicalchat_*_convert_candidates.pkl
+```
+"""
+import argparse
+import glob
+import json
+import logging
+import os
+import pickle
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def get_paths(pickle_path):
+    base_path = os.path.splitext(pickle_path)[0]
+    return f"{base_path}.npy", f"{base_path}.json"
+
+
+def save_candidates(encodings_path, index_path, encodings, responses):
+    """Save encodings and responses, both files are replaced at once to be never read half-written by a worker."""
+    encodings = np.asarray(encodings)
+    tmp_encodings_path = f"{encodings_path}.{os.getpid()}.npy"
+    np.save(tmp_encodings_path, encodings)
+    tmp_index_path = f"{index_path}.{os.getpid()}"
+    with open(tmp_index_path, "w") as fl:
+        json.dump({"shape": encodings.shape, "dtype": str(encodings.dtype), "responses": list(responses)}, fl)
+    os.replace(tmp_encodings_path, encodings_path)
+    os.replace(tmp_index_path, index_path)
+
+
+def convert_pickle(pickle_path):
+    with open(pickle_path, "rb") as fl:
+        encodings, responses = pickle.load(fl)
+    save_candidates(*get_paths(pickle_path), encodings, responses)
+    logger.info(f"{pickle_path} is converted to memory mapped encodings")
+
+
+def read_candidates(encodings_path, index_path):
+    with open(index_path) as fl:
+        index = json.load(fl)
+    return np.load(encodings_path, mmap_mode="r"), index
+
+
+def load_candidates(pickle_path):
+    """Return (encodings, responses) of the pickle, encodings are memory mapped from `.npy` converted from it."""
+    paths = get_paths(pickle_path)
+    if all(os.path.exists(path) for path in paths):
+        encodings, index = read_candidates(*paths)
+        if list(encodings.shape) == index["shape"] and str(encodings.dtype) == index["dtype"]:
+            return encodings, index["responses"]
+        logger.warning(f"{paths[0]} does not match {paths[1]}, {pickle_path} is converted again")
+    convert_pickle(pickle_path)
+    encodings, index = read_candidates(*paths)
+    return encodings, index["responses"]
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Convert pickled candidates to memory mapped encodings")
+    parser.add_argument("pickle_paths", nargs="+", help="pickles of candidates, `*` is expanded as a glob")
+    args = parser.parse_args()
+    for path in args.pickle_paths:
+        for pickle_path in sorted(glob.glob(path)):
+            convert_pickle(pickle_path)
@@ -11,6 +11,8 @@ import tensorflow as tf
 import tensorflow_text
 import numpy as np
 
+from candidates import get_paths, save_candidates
+
 tensorflow_text.__name__
 
 logging.basicConfig(
@@ -81,3 +83,4 @@ key_encodings = np.concatenate(key_encodings)
 logger.info(f"Encoded {key_encodings.shape[0]} candidate responses.")
 
 pickle.dump((key_encodings, values), args.store_file_path.open("wb"))
+save_candidates(*get_paths(str(args.store_file_path)), key_encodings, values)
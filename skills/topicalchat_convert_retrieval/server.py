@@ -1,7 +1,6 @@
 import logging
 import os
 import random
-import pickle
 import time
 import json
 import pathlib
@@ -15,6 +14,8 @@ from flask import Flask, request, jsonify
 from flasgger import Swagger, swag_from
 import sentry_sdk
 
+from candidates import load_candidates
+
 tensorflow_text.__name__
 
 SENTRY_DSN = os.getenv("SENTRY_DSN")
@@ -53,7 +54,8 @@ random.seed(SEED)
 sess = tf.InteractiveSession(graph=tf.Graph())
 
 module = tfhub.Module(MODEL_PATH)
-dataset = {topic: pickle.load(open(DATABASE_PATH.replace("*", topic), "rb")) for topic in topics}
+# encodings are memory mapped, so the workers share one copy of them
+dataset = {topic: load_candidates(DATABASE_PATH.replace("*", topic)) for topic in topics}
 np_load_old = np.load
 
 if pathlib.Path(CONFIDENCE_PATH).is_file():
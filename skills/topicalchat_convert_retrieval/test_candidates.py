@@ -0,0 +1,59 @@
+import os
+import pickle
+import random
+import tempfile
+import time
+
+import numpy as np
+
+from candidates import get_paths, load_candidates
+
+RANDOM_SEED = 31415
+N_CANDIDATES = 20000
+ENCODING_DIM = 512
+N_CONTEXTS = 100
+
+
+def top_responses(context_encoding, response_encodings, responses):
+    scores = context_encoding.dot(response_encodings.T)
+    indices = np.argsort(scores)[::-1][:10]
+    return [(responses[ind], scores[ind]) for ind in indices]
+
+
+def test_candidates():
+    rng = np.random.RandomState(RANDOM_SEED)
+    random.seed(RANDOM_SEED)
+    encodings = rng.randn(N_CANDIDATES, ENCODING_DIM).astype(np.float32)
+    responses = tuple(f"response {i} {random.choice(['’', 'é', '!'])}" for i in range(N_CANDIDATES))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pickle_path = os.path.join(tmp_dir, "topicalchat_movie_convert_candidates.pkl")
+        with open(pickle_path, "wb") as fl:
+            pickle.dump((encodings, responses), fl)
+
+        start = time.perf_counter()
+        with open(pickle_path, "rb") as fl:
+            pickle_encodings, pickle_responses = pickle.load(fl)
+        pickle_time = time.perf_counter() - start
+        load_candidates(pickle_path)
+        encodings_mtime = os.path.getmtime(get_paths(pickle_path)[0])
+        start = time.perf_counter()
+        mmap_encodings, mmap_responses = load_candidates(pickle_path)
+        mmap_time = time.perf_counter() - start
+
+        # the converted files are reused
+        assert os.path.getmtime(get_paths(pickle_path)[0]) == encodings_mtime
+        assert isinstance(mmap_encodings, np.memmap)
+        assert mmap_encodings.dtype == pickle_encodings.dtype
+        assert np.array_equal(mmap_encodings, pickle_encodings)
+        assert mmap_responses == list(pickle_responses)
+        for context_encoding in rng.randn(N_CONTEXTS, ENCODING_DIM).astype(np.float32):
+            assert top_responses(context_encoding, mmap_encodings, mmap_responses) == top_responses(
+                context_encoding, pickle_encodings, pickle_responses
+            )
+        del mmap_encodings
+    print(f"{N_CANDIDATES} candidates: pickle load {pickle_time * 1000:.1f}ms, mmap load {mmap_time * 1000:.1f}ms")
+    print("Success")
+
+
+if __name__ == "__main__":
+    test_candidates()
@@ -2,6 +2,7 @@ import logging
 from copy import deepcopy
 from typing import Dict, List
 
+from common.entity_utils import ENTITY_SLOT_PREFIX
 from common.utils import get_entities
 import state_formatters.utils as utils
 
@@ -655,7 +656,8 @@ def dialog_breakdown_formatter(dialog: Dict) -> List[Dict]:
 
 def entity_storer_formatter(dialog: Dict) -> List[Dict]:
     human_utter_index = len(dialog["human_utterances"]) - 1
-    attributes = {"entities": dialog.get("human", {}).get("attributes", {}).get("entities", {})}
+    attributes = dialog.get("human", {}).get("attributes", {})
+    attributes = {k: v for k, v in attributes.items() if k == "entities" or k.startswith(ENTITY_SLOT_PREFIX)}
 
     dialog = utils.get_last_n_turns(dialog, bot_last_turns=1, human_last_turns=2)
     dialog = utils.replace_with_annotated_utterances(dialog, mode="clean_sent")
@@ -810,6 +812,8 @@ def hypotheses_list_for_dialog_breakdown(dialog: Dict) -> List[Dict]:
 
 
 def game_cooperative_skill_formatter(dialog: Dict):
+    # the index keeps growing when the dialog is longer than the last turns sent to the skill
+    human_utter_index = len(dialog["human_utterances"]) - 1
     dialog = utils.get_last_n_turns(dialog)
     dialog = utils.remove_clarification_turns_from_dialog(dialog)
     dialog = utils.replace_with_annotated_utterances(dialog, mode="punct_sent")
@@ -817,7 +821,7 @@ def game_cooperative_skill_formatter(dialog: Dict):
         "game_cooperative_skill": dialog["human"]["attributes"].get("game_cooperative_skill", {}),
         "used_links": dialog["human"]["attributes"].get("used_links", {}),
     }
-    return [{"dialogs": [dialog]}]
+    return [{"dialogs": [dialog], "human_utter_indexes": [human_utter_index]}]
 
 
 def speech_function_formatter(dialog: Dict):
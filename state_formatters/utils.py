@@ -3,6 +3,7 @@ import logging
 from copy import deepcopy
 import re
 
+from common.entity_utils import ENTITY_SLOT_PREFIX, get_raw_entities
 from common.universal_templates import if_chat_about_particular_topic
 from common.utils import get_intents, service_intents
 from common.grounding import BUT_PHRASE, REPEAT_PHRASE
@@ -41,7 +42,9 @@ def get_last_n_turns(
             if isinstance(value, dict) and "attributes" in value:
                 new_dialog[key] = {k: deepcopy(v) for k, v in value.items() if k != "attributes"}
                 new_dialog[key]["attributes"] = {
-                    k: deepcopy(v) for k, v in value["attributes"].items() if k not in excluded_attributes
+                    k: deepcopy(v)
+                    for k, v in value["attributes"].items()
+                    if k not in excluded_attributes and not k.startswith(ENTITY_SLOT_PREFIX)
                 }
             else:
                 new_dialog[key] = deepcopy(value)
@@ -228,7 +231,7 @@ def dff_formatter(
     used_links = human_attributes.get("used_links", {})
     age_group = human_attributes.get("age_group", "")
     disliked_skills = human_attributes.get("disliked_skills", {})
-    entities = human_attributes.get("entities", {})
+    entities = get_raw_entities(human_attributes)
 
     previous_human_utter_index = state.get("previous_human_utter_index", -1)
     checking_unclarified_n_turns = human_utter_index - previous_human_utter_index
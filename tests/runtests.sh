@@ -149,7 +149,7 @@ if [[ "$MODE" == "test_skills" || "$MODE" == "all" ]]; then
                      dff-gossip-skill dff-wiki-skill topic-recommendation dff-science-skill personal-info-skill \
                      user-persona-extractor small-talk-skill wiki-facts dff-art-skill dff-funfact-skill \
                      meta-script-skill spelling-preprocessing dff-gaming-skill \
-                     dff-music-skill dff-bot-persona-skill entity-detection midas-predictor; do
+                     dff-music-skill dff-bot-persona-skill entity-detection midas-predictor sentence-encoder spacy-annotator; do
 
         echo "Run tests for $container"
         dockercompose_cmd exec -T -u $(id -u) $container ./test.sh
@@ -0,0 +1,85 @@
+"""Import-time budget of the `common` package.
+
+Every service imports `common`, so its modules should not do any work on import besides definitions:
+no network or sentry initialization, no env asserts, big patterns are compiled on the first use
+(see `common/lazy_patterns.py`). Only the own time of `common` modules is counted, third-party packages
+are not, so the budget does not depend on the installed versions of `requests` or `sentry_sdk`.
+
+Run as a benchmark to print the own and cumulative import times of the modules:
+```
+python tests/test_import_time.py
+```
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+MODULES = [
+    "common.utils",
+    "common.universal_templates",
+    "common.emotion",
+    "common.gaming",
+    "common.inflect",
+    "common.skills_turn_on_topics_and_patterns",
+    "common.link",
+]
+# own import time of `common` modules in milliseconds
+COMMON_IMPORT_TIME_BUDGET = float(os.getenv("COMMON_IMPORT_TIME_BUDGET", 200))
+
+
+def measure_import_time(module):
+    """Import the module in a fresh interpreter and return its (own `common` time, cumulative time) in ms."""
+    env = {key: value for key, value in os.environ.items() if key not in ["WIKIDATA_URL", "ENTITY_LINKING_URL"]}
+    env["PYTHONPATH"] = str(ROOT)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=str(ROOT),
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    assert result.returncode == 0, result.stderr
+    common_time, cumulative_time = 0, 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        if name.strip().split(".")[0] == "common":
+            common_time += int(self_us)
+        if name.strip() == module:
+            cumulative_time = int(cumulative_us)
+    return common_time / 1000, cumulative_time / 1000
+
+
+def test_import_time_budget():
+    for module in MODULES:
+        common_time, _ = measure_import_time(module)
+        assert common_time < COMMON_IMPORT_TIME_BUDGET, f"{module}: {common_time:.1f}ms"
+
+
+def test_import_is_side_effect_free():
+    code = (
+        "import sentry_sdk, common.utils, common.gaming, common.inflect; "
+        "from common import lazy_patterns; "
+        "assert sentry_sdk.Hub.current.client is None, 'sentry is initialized on import'; "
+        "assert not common.gaming.GAMES_WITH_AT_LEAST_1M_COPIES_SOLD_COMPILED_PATTERN.is_compiled; "
+        "assert common.gaming.find_games_in_text('i play minecraft') == [['Minecraft']]; "
+        "assert lazy_patterns.compile_all() == len(lazy_patterns.REGISTRY)"
+    )
+    env = {key: value for key, value in os.environ.items() if key not in ["WIKIDATA_URL", "ENTITY_LINKING_URL"]}
+    env["PYTHONPATH"] = str(ROOT)
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=str(ROOT), env=env, stderr=subprocess.PIPE, universal_newlines=True
+    )
+    assert result.returncode == 0, result.stderr
+
+
+if __name__ == "__main__":
+    print(f"{'module':45} {'common, ms':>12} {'cumulative, ms':>15}")
+    for module in MODULES:
+        common_time, cumulative_time = measure_import_time(module)
+        print(f"{module:45} {common_time:12.1f} {cumulative_time:15.1f}")
+    print(f"budget: {COMMON_IMPORT_TIME_BUDGET}ms")